@@ -1,11 +1,16 @@
+import atexit
+import logging
 import os
 import pickle
+import tempfile
+import threading
 import warnings
 from abc import ABC
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from typing import Optional, cast, Any
 
 from base import AbstractSingleton
-from services import FileSystemService, NodeFileSystemService
+from services import FileSystemService, NodeFileSystemService, NetworkingService
 
 
 class AbstractPickableSingleton(AbstractSingleton):
@@ -13,6 +18,19 @@ class AbstractPickableSingleton(AbstractSingleton):
     _instance = None
     _fs_service: FileSystemService = NodeFileSystemService()
 
+    # Write-behind: when an interval (seconds) is set, saves only mark the instance dirty and a
+    # background flush persists it at most once per interval. None means every save writes directly.
+    # The flush takes its snapshot on the listen loop, where the instance is mutated, and only writes
+    # the files on the timer thread, so a snapshot is never taken halfway through a change.
+    _write_behind_interval: Optional[float] = None
+    _dirty: bool = False
+    _flush_timer: Optional[threading.Timer] = None
+    _persist_lock = threading.RLock()
+    # Seconds a timer flush waits for the listen loop to take its snapshot before trying again later
+    SNAPSHOT_TIMEOUT = 10
+    # Snapshots are numbered, so one taken earlier never overwrites a later one already written
+    _snapshots_taken: int = 0
+    _snapshot_written: int = 0
 
     @classmethod
     def get_instance(cls):
@@ -35,16 +53,116 @@ class AbstractPickableSingleton(AbstractSingleton):
         # No saved instance found: create a new one and set cls._instance
         return cls()
 
+    @classmethod
+    def enable_write_behind(cls, interval_ms: int) -> None:
+        """ Coalesce saves: persist at most every interval_ms milliseconds, and on exit. """
+        cls._write_behind_interval = interval_ms / 1000
+        atexit.register(cls.flush)
+
     @classmethod
     def _save(cls) -> None:
-        """Save the entire object to disk."""
-        instance = cls.get_instance()
-        # Ensure target directory exists
-        file_path = cls._fs_service.get_data_file_path(f"{cls.__name__.lower()}.pkl", create_if_missing=True)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as f:
-            pickle.dump(instance, cast(Any, f))
-        cls._fs_service.update_hash_for_file(file_path)
+        """Save the entire object to disk, or schedule it when write-behind is enabled."""
+        if cls._write_behind_interval is None:
+            cls._write_to_disk()
+            return
+        cls._schedule_flush()
+
+    @classmethod
+    def _schedule_flush(cls) -> None:
+        with cls._persist_lock:
+            cls._dirty = True
+            if cls._flush_timer is None:
+                cls._flush_timer = threading.Timer(cls._write_behind_interval, cls._flush_from_timer)
+                cls._flush_timer.daemon = True
+                cls._flush_timer.start()
+
+    @classmethod
+    def _flush_from_timer(cls) -> None:
+        with cls._persist_lock:
+            cls._flush_timer = None
+            if not cls._dirty:
+                return
+            cls._dirty = False
+
+        snapshot: Future = Future()
+
+        def take_snapshot() -> None:
+            try:
+                snapshot.set_result(cls._take_numbered_snapshot())
+            except BaseException as e:
+                snapshot.set_exception(e)
+
+        # Runs right away when the listen loop is not running
+        NetworkingService.get_instance().call_soon(take_snapshot)
+        try:
+            cls._write_numbered_snapshot(snapshot.result(timeout=cls.SNAPSHOT_TIMEOUT))
+        except FutureTimeoutError:
+            logging.warning("Write-behind flush of %s got no snapshot from the listen loop, retrying", cls.__name__)
+            cls._schedule_flush()
+        except Exception:
+            logging.exception("Write-behind flush of %s failed, retrying", cls.__name__)
+            cls._schedule_flush()
+
+    @classmethod
+    def flush(cls) -> None:
+        """ Persist pending write-behind changes right away. """
+        with cls._persist_lock:
+            if not cls._dirty:
+                return
+            cls._dirty = False
+            try:
+                cls._write_to_disk()
+            except Exception:
+                cls._dirty = True
+                raise
+
+    @classmethod
+    def _write_to_disk(cls) -> None:
+        """ Snapshot the instance and write it, both on the calling thread. """
+        with cls._persist_lock:
+            cls._write_numbered_snapshot(cls._take_numbered_snapshot())
+
+    @classmethod
+    def _take_numbered_snapshot(cls) -> tuple[int, Any]:
+        with cls._persist_lock:
+            cls._snapshots_taken += 1
+            return cls._snapshots_taken, cls._take_snapshot()
+
+    @classmethod
+    def _write_numbered_snapshot(cls, numbered_snapshot: tuple[int, Any]) -> None:
+        number, snapshot = numbered_snapshot
+        with cls._persist_lock:
+            if number < cls._snapshot_written:
+                return
+            cls._write_snapshot(snapshot)
+            cls._snapshot_written = number
+
+    @classmethod
+    def _take_snapshot(cls) -> Any:
+        """ Capture the state to persist; the rest of the write happens in _write_snapshot. """
+        return pickle.dumps(cls.get_instance())
+
+    @classmethod
+    def _write_snapshot(cls, data: Any) -> None:
+        """Atomically replace the file on disk with the pickled object."""
+        with cls._persist_lock:
+            # Ensure target directory exists
+            file_path = cls._fs_service.get_data_file_path(f"{cls.__name__.lower()}.pkl", create_if_missing=True)
+            dirpath = os.path.dirname(file_path)
+            os.makedirs(dirpath, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=dirpath, prefix=f".tmp_{cls.__name__.lower()}_", suffix=".pkl")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            cls._fs_service.update_hash_for_file(file_path)
 
     @classmethod
     def load(cls) -> Optional["AbstractPickableSingleton"]:
@@ -74,10 +192,15 @@ class AbstractPickableSingleton(AbstractSingleton):
             if raise_exception_if_no_instance:
                 raise Exception("Instance not initialized. Cannot destroy non-existent instance.")
             return
-        cls._save()
-        cls._instance = None
+        with cls._persist_lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            cls._dirty = False
+            cls._write_to_disk()
+            cls._instance = None
 
     @classmethod
     def force_save(cls):
         """ Force saving the current instance to disk. FOR DEBUGGING PURPOSES ONLY. """
-        cls._save()
+        cls._write_to_disk()
@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from base import AbstractSingleton
+from events import TransactionAddedFromNetworkEvent
+from models import Transaction
+from models.enum import TransactionType
+from services import NetworkingService
+
+_HEX_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass
+class _AdmissionBatch:
+    transactions: list[Transaction]
+    # One future per chunk of transactions, each resolving to a validity flag per transaction
+    signature_checks: list[Future]
+
+
+class AdmissionPipeline(AbstractSingleton):
+    """
+    Admits transactions received from the network to the pool in stages, so a flood of transactions
+    does not stall the networking listen loop:
+
+    1. Cheap stateless checks, on the listen loop: field formats, the hash recomputed from the content
+       and duplicates by hash. Junk is rejected here before any signature is verified.
+    2. Signature verification on a thread pool, in chunks.
+    3. Stateful checks (sender wallet and balance), back on the listen loop once the signatures of a
+       batch are done. Batches go through this stage in the order they arrived and the valid
+       transactions are added to the pool with one save.
+    """
+
+    # Transactions verified per thread pool task
+    SIGNATURE_CHUNK_SIZE = 32
+
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, thread_name_prefix="tx-admission")
+        # Batches waiting for their signature checks or their turn in stage 3, in arrival order
+        self._batches: deque[_AdmissionBatch] = deque()
+        # Hashes of transactions that passed stage 1 and are not yet added to the pool or rejected
+        self._in_flight: set[str] = set()
+        self._lock = threading.Lock()
+        # Held while batches go through stage 3, so they stay in order when there is no listen loop
+        self._admit_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "AdmissionPipeline":
+        # Only override for type hinting purposes
+        return super().get_instance()
+
+    @classmethod
+    def destroy_instance(cls, raise_exception_if_no_instance: bool = False) -> None:
+        if cls._instance is not None:
+            cls._instance._executor.shutdown(wait=False, cancel_futures=True)
+        super().destroy_instance(raise_exception_if_no_instance)
+
+    @property
+    def pending_count(self) -> int:
+        """ Number of transactions that passed stage 1 and are waiting for stage 2 or 3. """
+        with self._lock:
+            return len(self._in_flight)
+
+    def submit(self, transaction_payloads: list[Any]) -> None:
+        """ Screen transactions from the network and queue the survivors for signature verification. """
+        screened = [tx for tx in (self._screen(payload) for payload in transaction_payloads) if tx is not None]
+
+        from blockchain import Pool
+        pool = Pool.get_instance()
+        with self._lock:
+            transactions = []
+            for tx in screened:
+                if tx.hash in self._in_flight or pool.has_transaction(tx):
+                    logging.debug("Ignoring duplicate transaction %s from network", tx.hash)
+                    continue
+                self._in_flight.add(tx.hash)
+                transactions.append(tx)
+            if not transactions:
+                return
+            batch = _AdmissionBatch(transactions, [
+                self._executor.submit(self._verify_signatures, transactions[start:start + self.SIGNATURE_CHUNK_SIZE])
+                for start in range(0, len(transactions), self.SIGNATURE_CHUNK_SIZE)
+            ])
+            self._batches.append(batch)
+
+        for signature_check in batch.signature_checks:
+            signature_check.add_done_callback(lambda _: NetworkingService.get_instance().call_soon(self._admit_ready_batches))
+
+    # -----------------
+    # Stage 1
+    # -----------------
+    @classmethod
+    def _screen(cls, payload: Any) -> Optional[Transaction]:
+        try:
+            tx = Transaction.from_dict(payload)
+            reason = cls._format_error(tx)
+        except (KeyError, TypeError, ValueError, ArithmeticError, AttributeError):
+            logging.debug("Rejecting malformed transaction from network")
+            return None
+        if reason is not None:
+            logging.debug("Rejecting transaction %s from network: %s", tx.hash, reason)
+            return None
+        return tx
+
+    @staticmethod
+    def _format_error(tx: Transaction) -> Optional[str]:
+        """ Reason the transaction is malformed, or None. Only looks at the transaction itself. """
+        if not isinstance(tx.hash, str) or not _HEX_DIGEST.fullmatch(tx.hash):
+            return "hash is not a SHA-256 hex digest."
+        if not isinstance(tx.receiver_address, str) or not _HEX_DIGEST.fullmatch(tx.receiver_address):
+            return "receiver address is not a SHA-256 hex digest."
+        if tx.amount <= Decimal("0") or tx.fee < Decimal("0"):
+            return "amount must be positive and fee cannot be negative."
+        datetime.fromisoformat(tx.timestamp)
+
+        if tx.kind == TransactionType.TRANSFER:
+            if not tx.sender_public_key or not tx.sender_signature:
+                return "sender public key or signature is missing."
+            if tx.sender_address != hashlib.sha256(tx.sender_public_key.encode("utf-8")).hexdigest():
+                return "sender address does not belong to the sender public key."
+        elif tx.sender_address is not None:
+            return "reward transactions cannot have a sender."
+
+        if not tx.has_valid_hash():
+            return "hash does not match the transaction content."
+        return None
+
+    # -----------------
+    # Stage 2
+    # -----------------
+    @staticmethod
+    def _verify_signatures(transactions: list[Transaction]) -> list[bool]:
+        return [AdmissionPipeline._has_valid_signature(tx) for tx in transactions]
+
+    @staticmethod
+    def _has_valid_signature(tx: Transaction) -> bool:
+        # One bad transaction must not fail the future, and with it the rest of its chunk
+        try:
+            return tx.kind != TransactionType.TRANSFER or tx.has_valid_signature()
+        except Exception as e:
+            logging.debug("Signature check of transaction %s from network failed: %s", tx.hash, e)
+            return False
+
+    # -----------------
+    # Stage 3
+    # -----------------
+    def _admit_ready_batches(self) -> None:
+        """ Admit the batches at the front of the queue whose signatures are all checked. """
+        with self._admit_lock:
+            while True:
+                with self._lock:
+                    if not self._batches or not all(check.done() for check in self._batches[0].signature_checks):
+                        return
+                    batch = self._batches.popleft()
+                try:
+                    self._admit(batch)
+                except Exception:
+                    logging.exception("Failed to admit transactions received from network")
+                finally:
+                    with self._lock:
+                        self._in_flight.difference_update(tx.hash for tx in batch.transactions)
+
+    def _admit(self, batch: _AdmissionBatch) -> None:
+        signed = []
+        for start, signature_check in zip(range(0, len(batch.transactions), self.SIGNATURE_CHUNK_SIZE), batch.signature_checks):
+            chunk = batch.transactions[start:start + self.SIGNATURE_CHUNK_SIZE]
+            try:
+                valid_flags = signature_check.result()
+            except Exception:
+                logging.exception("Failed to verify transaction signatures")
+                continue
+            for tx, valid in zip(chunk, valid_flags):
+                if valid:
+                    signed.append(tx)
+                else:
+                    logging.debug("Rejecting transaction %s from network: invalid signature.", tx.hash)
+        if not signed:
+            return
+
+        from blockchain import Pool
+        pool = Pool.get_instance()
+        added = pool.add_transactions(signed, raise_exception=False, broadcast_to_network=False, check_signature=False)
+        logging.debug("Admitted %d of %d transactions from network", len(added), len(batch.transactions))
+        if not added:
+            return
+        pool._call_subscribers(None)
+        TransactionAddedFromNetworkEvent.dispatch()
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import pickle
+import struct
+from typing import Optional
+
+from models import Block
+from models.constants import FilesAndDirectories
+from services import FileSystemService
+
+
+class BlockStore:
+    """
+    Append-only, log-structured storage for accepted blocks.
+
+    Blocks are pickled one by one and appended to segment files that roll over once they reach
+    SEGMENT_SIZE bytes. A fixed-width index file maps each block number to its segment, offset,
+    length and hash, so saving a new block only writes that block and one index entry.
+    """
+
+    SEGMENT_SIZE = 4 * 1024 * 1024
+    # segment number, offset, length, block hash
+    _INDEX_ENTRY = struct.Struct(">IQI64s")
+
+    def __init__(self, fs_service: FileSystemService):
+        self._fs_service = fs_service
+        self._entries: list[tuple[int, int, int, str]] = []
+        # Size and modification time of the index file the entries were read from (or last written)
+        self._index_stat: Optional[tuple[int, int]] = None
+
+    # -----------------
+    # Paths
+    # -----------------
+    def _get_index_path(self) -> str:
+        return os.path.join(self._fs_service.get_data_root(create_if_missing=True), FilesAndDirectories.BLOCK_INDEX_FILE_NAME)
+
+    def _get_segment_path(self, segment: int) -> str:
+        return os.path.join(self._fs_service.get_data_root(create_if_missing=True), self.get_segment_file_name(segment))
+
+    @classmethod
+    def get_segment_file_name(cls, segment: int) -> str:
+        return FilesAndDirectories.BLOCK_SEGMENT_FILE_NAME_FORMAT.format(segment)
+
+    # -----------------
+    # Index
+    # -----------------
+    def _get_index_stat(self) -> tuple[int, int]:
+        index_path = self._get_index_path()
+        if not os.path.exists(index_path):
+            return 0, 0
+        stat = os.stat(index_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_index(self) -> None:
+        """
+        (Re)load the index from disk if it changed underneath us, e.g. when the data root moved or the
+        file was rewritten with the same size. A trailing partial entry (an interrupted write) is ignored.
+        """
+        index_stat = self._get_index_stat()
+        if index_stat == self._index_stat:
+            return
+        entries = []
+        if index_stat[0]:
+            with open(self._get_index_path(), "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % self._INDEX_ENTRY.size
+            for segment, offset, length, block_hash in self._INDEX_ENTRY.iter_unpack(data[:usable]):
+                entries.append((segment, offset, length, block_hash.rstrip(b"\0").decode("ascii")))
+        self._entries = entries
+        self._index_stat = index_stat
+
+    def count(self) -> int:
+        self._load_index()
+        return len(self._entries)
+
+    # -----------------
+    # Reading
+    # -----------------
+    def read_all(self) -> list[Block]:
+        """ Read all stored blocks in chain order. """
+        self._load_index()
+        blocks = []
+        open_segment: Optional[int] = None
+        handle = None
+        try:
+            for segment, offset, length, _ in self._entries:
+                if segment != open_segment:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(self._get_segment_path(segment), "rb")
+                    open_segment = segment
+                handle.seek(offset)
+                blocks.append(pickle.loads(handle.read(length)))
+        finally:
+            if handle is not None:
+                handle.close()
+        return blocks
+
+    def compute_checkpoint_hashes(self, count: int) -> Optional[dict[str, str]]:
+        """
+        Hashes that pin the stored bytes of the first `count` blocks, or None if fewer are stored.
+
+        Only the index entries up to them and the segment the last one ends in are read. Earlier
+        segments are never written again once the store rolls over, so their hash store entries
+        (checked against the files at startup) stand in for their contents.
+        """
+        self._load_index()
+        if count <= 0 or count > len(self._entries):
+            return None
+        tail_segment, offset, length, _ = self._entries[count - 1]
+
+        hashes = {}
+        store = self._fs_service.load_hash_store()
+        for segment in range(tail_segment):
+            file_hash = store.get(self.get_segment_file_name(segment), {}).get("hash")
+            if file_hash is None:
+                return None
+            hashes[self.get_segment_file_name(segment)] = file_hash
+        with open(self._get_segment_path(tail_segment), "rb") as f:
+            hashes[self.get_segment_file_name(tail_segment)] = hashlib.sha256(f.read(offset + length)).hexdigest()
+        with open(self._get_index_path(), "rb") as f:
+            hashes[FilesAndDirectories.BLOCK_INDEX_FILE_NAME] = hashlib.sha256(f.read(count * self._INDEX_ENTRY.size)).hexdigest()
+        return hashes
+
+    # -----------------
+    # Writing
+    # -----------------
+    def sync(self, chain: list[Block]) -> None:
+        """
+        Make the store mirror the given chain, appending new blocks and truncating replaced ones.
+
+        Only the tail is compared: accepted blocks link to their previous hash, so once the last stored
+        block still in the chain matches, every block before it does too. Replaced blocks are found by
+        walking back from there, which costs the depth of the replacement rather than the chain length.
+        """
+        self._load_index()
+
+        # Number of leading stored blocks that are still part of the chain (normally all of them)
+        keep = min(len(self._entries), len(chain))
+        while keep > 0 and self._entries[keep - 1][3] != (chain[keep - 1].calculated_hash or ""):
+            keep -= 1
+        if keep < len(self._entries):
+            self._truncate(keep)
+
+        if len(self._entries) < len(chain):
+            self._append(chain[len(self._entries):])
+
+    def _append(self, blocks: list[Block]) -> None:
+        touched_segments = set()
+        segment, offset = self._get_write_position()
+        index_position = len(self._entries) * self._INDEX_ENTRY.size
+        index_records = []
+        handle = None
+        try:
+            for block in blocks:
+                record = pickle.dumps(block)
+                if offset > 0 and offset + len(record) > self.SEGMENT_SIZE:
+                    segment, offset = segment + 1, 0
+                if segment not in touched_segments:
+                    if handle is not None:
+                        handle.close()
+                    handle = self._open_at(self._get_segment_path(segment), offset)
+                    touched_segments.add(segment)
+                handle.write(record)
+                entry = (segment, offset, len(record), block.calculated_hash or "")
+                index_records.append(self._INDEX_ENTRY.pack(entry[0], entry[1], entry[2], entry[3].encode("ascii")))
+                self._entries.append(entry)
+                offset += len(record)
+        finally:
+            if handle is not None:
+                handle.close()
+
+        with self._open_at(self._get_index_path(), index_position) as f:
+            f.write(b"".join(index_records))
+        self._index_stat = self._get_index_stat()
+
+        # Only the segments written to (bounded by SEGMENT_SIZE) and the index are re-hashed
+        for touched_segment in sorted(touched_segments):
+            self._fs_service.update_hash_for_file(self.get_segment_file_name(touched_segment))
+        self._fs_service.update_hash_for_file(FilesAndDirectories.BLOCK_INDEX_FILE_NAME)
+
+    @staticmethod
+    def _open_at(path: str, position: int):
+        """
+        Open a file for writing at the position the index says it ends at. Anything after it, such as
+        a record partially written before a crash, is cut off so offsets keep matching the index.
+        """
+        f = open(path, "r+b" if os.path.exists(path) else "wb")
+        f.seek(position)
+        f.truncate()
+        return f
+
+    def _get_write_position(self) -> tuple[int, int]:
+        if not self._entries:
+            return 0, 0
+        segment, offset, length, _ = self._entries[-1]
+        return segment, offset + length
+
+    def _truncate(self, count: int) -> None:
+        """ Drop every stored block from block number `count` onwards. """
+        if count < len(self._entries):
+            segment, offset, _, _ = self._entries[count]
+        else:
+            segment, offset = self._get_write_position()
+        self._entries = self._entries[:count]
+
+        with open(self._get_index_path(), "r+b") as f:
+            f.truncate(count * self._INDEX_ENTRY.size)
+        self._index_stat = self._get_index_stat()
+
+        segment_path = self._get_segment_path(segment)
+        if os.path.exists(segment_path):
+            with open(segment_path, "r+b") as f:
+                f.truncate(offset)
+
+        store = self._fs_service.load_hash_store()
+        later_segment = segment + 1
+        while os.path.exists(self._get_segment_path(later_segment)):
+            os.remove(self._get_segment_path(later_segment))
+            store.pop(self.get_segment_file_name(later_segment), None)
+            later_segment += 1
+        self._fs_service.save_hash_store(store)
+
+        if os.path.exists(segment_path):
+            self._fs_service.update_hash_for_file(self.get_segment_file_name(segment))
+        self._fs_service.update_hash_for_file(FilesAndDirectories.BLOCK_INDEX_FILE_NAME)
@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import threading
+import uuid
+from typing import Any, Optional
+
+from base import AbstractSingleton
+from blockchain.parallel_miner import ParallelMiner
+from models import Block
+from services import NetworkingService
+
+
+class MiningCoordinator:
+    """
+    Shares the proof-of-work of one block with peer nodes.
+
+    The block template is published once; peers then request nonce ranges, which are handed out
+    from a single counter so they never overlap (the local miner takes its ranges from the same
+    counter). The first solution that verifies against the template wins.
+    """
+
+    RANGE_SIZE = 1_000_000
+
+    # The coordinator of the job this node is currently mining, which peer messages are routed to
+    _active: Optional["MiningCoordinator"] = None
+
+    def __init__(self, block: Block, stop_event: Optional[threading.Event] = None, networking: Optional[NetworkingService] = None):
+        self.job_id = uuid.uuid4().hex
+        self.block = block
+        self.solution: Optional[tuple[int, str]] = None
+        self.solved_by: Optional[str] = None
+        # Set once a solution is known, so local mining can stop
+        self.stop_event = stop_event or threading.Event()
+        self.assigned_ranges: list[tuple[str, int, int]] = []
+        self._networking = networking
+        self._next_nonce = block.nonce
+        self._lock = threading.Lock()
+        self._prefix, self._suffix = block.split_canonical_around_nonce()
+
+    @property
+    def networking(self) -> NetworkingService:
+        return self._networking or NetworkingService.get_instance()
+
+    def start(self) -> None:
+        MiningCoordinator._active = self
+        self.networking.broadcast_mining_template(self.job_id, self.block.to_dict())
+
+    def stop(self) -> None:
+        if MiningCoordinator._active is self:
+            MiningCoordinator._active = None
+        self.networking.broadcast_mining_done(self.job_id)
+
+    def take_range(self, node_id: str) -> tuple[int, int]:
+        """ Reserve the next unassigned nonce range, returned as (first nonce, count). """
+        with self._lock:
+            start = self._next_nonce
+            self._next_nonce += self.RANGE_SIZE
+            self.assigned_ranges.append((node_id, start, self.RANGE_SIZE))
+        return start, self.RANGE_SIZE
+
+    def submit_solution(self, nonce: int, block_hash: str, node_id: str) -> bool:
+        """ Accept a solution if it really solves the template; returns whether it was accepted. """
+        if not isinstance(nonce, int) or nonce < 0:
+            return False
+        recomputed = hashlib.sha256(self._prefix + b"%d" % nonce + self._suffix).hexdigest()
+        if recomputed != block_hash or not Block._meets_difficulty(block_hash, self.block.difficulty or 0):
+            logging.warning(f"Ignoring invalid solution for mining job {self.job_id} from {node_id}")
+            return False
+        with self._lock:
+            if self.solution is None:
+                self.solution = (nonce, block_hash)
+                self.solved_by = node_id
+        self.stop_event.set()
+        return True
+
+    def handle_range_request(self, payload: dict[str, Any]) -> None:
+        if payload.get("job_id") != self.job_id or self.solution is not None:
+            return
+        node_id = payload.get("node_id")
+        if not node_id:
+            return
+        start, count = self.take_range(node_id)
+        self.networking.assign_mining_range(self.job_id, node_id, start, count)
+
+    def handle_solution(self, payload: dict[str, Any]) -> None:
+        if payload.get("job_id") != self.job_id:
+            return
+        self.submit_solution(payload.get("nonce"), payload.get("block_hash"), payload.get("node_id", "unknown"))
+
+    @classmethod
+    def route_range_request(cls, payload: dict[str, Any]) -> None:
+        if cls._active is not None:
+            cls._active.handle_range_request(payload)
+
+    @classmethod
+    def route_solution(cls, payload: dict[str, Any]) -> None:
+        if cls._active is not None:
+            cls._active.handle_solution(payload)
+
+
+class CooperativeMiningWorker(AbstractSingleton):
+    """
+    Mines nonce ranges of block templates published by peers and reports solutions back.
+    Only one peer job is worked on at a time; a newer template replaces the current one.
+    """
+
+    # Set from the node's command line
+    enabled: bool = False
+
+    def __init__(self, networking: Optional[NetworkingService] = None, workers: Optional[int] = None):
+        super().__init__()
+        self.node_id = uuid.uuid4().hex
+        self._networking = networking
+        self._miner = ParallelMiner(workers)
+        self._job_id: Optional[str] = None
+        self._template: Optional[dict[str, Any]] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def destroy_instance(cls, raise_exception_if_no_instance: bool = False) -> None:
+        if cls._instance is not None:
+            cls._instance._stop_event.set()
+            cls._instance._miner.close()
+        super().destroy_instance(raise_exception_if_no_instance)
+
+    @property
+    def networking(self) -> NetworkingService:
+        return self._networking or NetworkingService.get_instance()
+
+    @property
+    def attempts(self) -> int:
+        return self._miner.attempts
+
+    def handle_template(self, payload: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._stop_event.set()
+            self._job_id = payload.get("job_id")
+            self._template = payload.get("block_data")
+            self._stop_event = threading.Event()
+        logging.info(f"Helping with mining job {self._job_id}")
+        self.networking.request_mining_range(self._job_id, self.node_id)
+
+    def handle_range_assign(self, payload: dict[str, Any]) -> None:
+        if payload.get("node_id") != self.node_id:
+            return
+        with self._lock:
+            if payload.get("job_id") != self._job_id or self._template is None:
+                return
+            job_id, template, stop_event = self._job_id, self._template, self._stop_event
+        threading.Thread(
+            target=self._mine_range,
+            args=(job_id, template, int(payload["nonce_start"]), int(payload["nonce_count"]), stop_event),
+            name=f"cooperative-mining-{job_id[:8]}",
+            daemon=True,
+        ).start()
+
+    def handle_done(self, payload: dict[str, Any]) -> None:
+        with self._lock:
+            if payload.get("job_id") != self._job_id:
+                return
+            self._stop_event.set()
+            self._job_id = None
+            self._template = None
+
+    def _mine_range(self, job_id: str, template: dict[str, Any], nonce_start: int, nonce_count: int, stop_event: threading.Event) -> None:
+        block = Block.from_dict(template)
+        block.nonce = nonce_start
+        try:
+            solved = self._miner.mine(block, stop_event, nonce_count=nonce_count)
+        except Exception:
+            logging.exception(f"Mining range of job {job_id} failed")
+            return
+        if solved:
+            self.networking.broadcast_mining_solution(job_id, self.node_id, block.nonce, block.calculated_hash)
+        elif not stop_event.is_set():
+            # Range exhausted without a solution, ask for the next one
+            self.networking.request_mining_range(job_id, self.node_id)
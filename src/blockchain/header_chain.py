@@ -0,0 +1,202 @@
+import logging
+from typing import Optional
+
+from blockchain.abstract_pickable_singleton import AbstractPickableSingleton
+from events import MerkleProofReceivedFromNetworkEvent
+from exceptions.mining import InvalidBlockException
+from models import BlockHeader, Transaction
+from models.dto import MerkleProof
+from services import DifficultyService, NetworkingService
+
+
+class HeaderChain(AbstractPickableSingleton):
+    """
+    The accepted chain as block headers only, kept by light nodes instead of the Ledger.
+
+    Headers are synced from full nodes in batches and checked for their hash, linkage and
+    proof-of-work against the difficulty retargeted from the headers before them. Transactions
+    of watched addresses (the logged-in user's) are confirmed with Merkle proofs served by full
+    nodes, checked against the merkle_root of the stored header, so blocks are never downloaded.
+    """
+
+    # Headers asked for per sync request, full nodes cap their answer at the same size
+    SYNC_BATCH_SIZE = 500
+
+    # Accepted chain ordered from genesis (index == block number)
+    _headers: list[BlockHeader]
+    # Hash - Height pairs, kept in sync with _headers
+    _number_by_hash: dict[str, int]
+    # Transaction hashes and addresses to confirm transactions of, and the verified proofs of those confirmed so far
+    _watched_transactions: set[str]
+    _watched_addresses: set[str]
+    _confirmed_transactions: dict[str, MerkleProof]
+
+    def __init__(self):
+        self._headers = []
+        self._number_by_hash = {}
+        self._watched_transactions = set()
+        self._watched_addresses = set()
+        self._confirmed_transactions = {}
+        super().__init__()
+
+    @classmethod
+    def get_instance(cls) -> "HeaderChain":
+        # Only override for type hinting purposes
+        return super().get_instance()
+
+    # -----------------
+    # Basic getters
+    # -----------------
+    def get_latest_header(self) -> Optional[BlockHeader]:
+        return self._headers[-1] if self._headers else None
+
+    def get_header(self, hash: str) -> Optional[BlockHeader]:
+        number = self._number_by_hash.get(hash)
+        return self._headers[number] if number is not None else None
+
+    def get_header_by_number(self, number: int) -> Optional[BlockHeader]:
+        if 0 <= number < len(self._headers):
+            return self._headers[number]
+        return None
+
+    @property
+    def height(self) -> int:
+        return len(self._headers) - 1
+
+    # -----------------
+    # Headers
+    # -----------------
+    def add_header(self, header: BlockHeader) -> None:
+        """
+        Put a header on top of the chain. Like the Ledger, only the tip is extended: a header at or below
+        the current height is rejected, so a single cheap header cannot cut the chain back. Only the genesis
+        header can be replaced, while nothing was built on it yet.
+        """
+        if header.number == 0:
+            if len(self._headers) > 1:
+                raise InvalidBlockException("Cannot replace the genesis header of a longer chain.")
+            previous_header = None
+            expected_difficulty = None
+        else:
+            if header.number != len(self._headers):
+                raise InvalidBlockException(f"Header #{header.number} does not extend the chain at height {self.height}.")
+            previous_header = self.get_header_by_number(header.number - 1)
+            window_start = max(0, header.number - DifficultyService.cfg.window_size - 1)
+            expected_difficulty = DifficultyService.next_difficulty(self._headers[window_start:header.number])
+        valid, reasons = header.validate(previous_header, expected_difficulty)
+        if not valid:
+            raise InvalidBlockException("Invalid block header: " + "; ".join(reasons))
+
+        for stale_header in self._headers[header.number:]:
+            self._number_by_hash.pop(stale_header.calculated_hash, None)
+            self._unconfirm_block(stale_header)
+        del self._headers[header.number:]
+        self._headers.append(header)
+        self._number_by_hash[header.calculated_hash] = header.number
+        self._save()
+
+    def _unconfirm_block(self, header: BlockHeader) -> None:
+        for tx_hash, proof in list(self._confirmed_transactions.items()):
+            if proof.block_hash == header.calculated_hash:
+                del self._confirmed_transactions[tx_hash]
+
+    def request_sync(self) -> None:
+        """ Ask full nodes for the headers after our latest one (from genesis when we have none). """
+        latest_header = self.get_latest_header()
+        after_number = latest_header.number if latest_header is not None and latest_header.number != 0 else -1
+        NetworkingService.get_instance().request_headers(after_number, self.SYNC_BATCH_SIZE)
+
+    def handle_network_headers(self, response_data: dict) -> None:
+        """ Add a batch of headers from a full node, and ask for more while the batches are full. """
+        added = 0
+        previous_number = self.height
+        headers = response_data.get('headers', [])
+        for header_data in headers:
+            try:
+                header = BlockHeader.from_dict(header_data)
+            except (KeyError, TypeError):
+                logging.warning("Ignoring malformed block header from network")
+                return
+            if self.get_header(header.calculated_hash) is not None:
+                continue
+            try:
+                self.add_header(header)
+            except InvalidBlockException as e:
+                logging.warning("Ignoring block header #%s from network: %s", header.number, e)
+                break
+            previous_number = min(previous_number, header.number - 1)
+            added += 1
+
+        if added:
+            self._request_watched_proofs(after_number=previous_number)
+            if len(headers) >= self.SYNC_BATCH_SIZE:
+                self.request_sync()
+
+    # -----------------
+    # Transactions
+    # -----------------
+    def watch_transaction(self, tx_hash: str) -> None:
+        """ Track a transaction until a full node proves it is part of an accepted block. """
+        self._watched_transactions.add(tx_hash)
+        self._save()
+        if tx_hash not in self._confirmed_transactions:
+            NetworkingService.get_instance().request_merkle_proof(tx_hash)
+
+    def watch_address(self, address: str) -> None:
+        """ Track every transaction sent or received by the address, including those already in the chain. """
+        self._watched_addresses.add(address)
+        self._save()
+        NetworkingService.get_instance().request_address_proofs(address, after_number=-1)
+
+    def _request_watched_proofs(self, after_number: int) -> None:
+        """ Ask again for unconfirmed transactions, and for address transactions in the headers after after_number. """
+        for tx_hash in self._watched_transactions - self._confirmed_transactions.keys():
+            NetworkingService.get_instance().request_merkle_proof(tx_hash)
+        for address in self._watched_addresses:
+            NetworkingService.get_instance().request_address_proofs(address, after_number=after_number)
+
+    def _is_watched(self, proof: MerkleProof, transaction_data: Optional[dict]) -> bool:
+        """ Whether the proof is for a watched transaction, or for the given transaction of a watched address. """
+        if proof.tx_hash in self._watched_transactions:
+            return True
+        if not self._watched_addresses or not isinstance(transaction_data, dict):
+            return False
+        try:
+            transaction = Transaction.from_dict(transaction_data)
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            return False
+        # The hash is recomputed, so the addresses read from the transaction are the ones the proof covers
+        if transaction.hash != proof.tx_hash or not transaction.has_valid_hash():
+            return False
+        return bool({transaction.sender_address, transaction.receiver_address} & self._watched_addresses)
+
+    def handle_merkle_proof_response(self, response_data: dict) -> None:
+        """ Confirm a watched transaction if its proof holds against the header of its block. """
+        try:
+            proof = MerkleProof.from_dict(response_data["proof"])
+        except (KeyError, TypeError, ValueError):
+            logging.warning("Ignoring malformed Merkle proof from network")
+            return
+        if not self._is_watched(proof, response_data.get("transaction")):
+            return
+        confirmed_proof = self._confirmed_transactions.get(proof.tx_hash)
+        if confirmed_proof is not None and confirmed_proof.block_hash == proof.block_hash:
+            return
+        header = self.get_header(proof.block_hash)
+        if header is None:
+            # The header has not been synced yet, the proof is requested again after the next batch
+            logging.debug(f"Ignoring Merkle proof for unknown block {proof.block_hash}")
+            return
+        if not header.verify_merkle_proof(proof):
+            logging.warning(f"Ignoring invalid Merkle proof for transaction {proof.tx_hash}")
+            return
+        self._confirmed_transactions[proof.tx_hash] = proof
+        self._save()
+        MerkleProofReceivedFromNetworkEvent.dispatch(proof)
+
+    def get_confirmations(self, tx_hash: str) -> int:
+        """ Number of blocks on top of (and including) the one holding the transaction, 0 if unconfirmed. """
+        proof = self._confirmed_transactions.get(tx_hash)
+        if proof is None:
+            return 0
+        return self.height - proof.block_number + 1
@@ -1,28 +1,74 @@
+import json
 import logging
+import os
+import pickle
+import tempfile
+from decimal import Decimal
 from typing import Optional
 
 from textual import log
 
 from base.subscribable import Subscribable
 from blockchain.abstract_pickable_singleton import AbstractPickableSingleton
-from events import BlockAddedFromNetworkEvent, ValidationAddedFromNetworkEvent, GenesisBlockAddedFromNetworkEvent
+from blockchain.block_store import BlockStore
+from blockchain.mining_job import MiningJob
+from blockchain.parallel_chain_validator import ParallelChainValidator
+from events import BlockAddedFromNetworkEvent, ValidationAddedFromNetworkEvent, GenesisBlockAddedFromNetworkEvent, \
+    MerkleProofReceivedFromNetworkEvent, AddressesTouchedByBlockEvent
 from models import Block
 from models.block import BlockStatus, ValidationFlag
+from models.constants import FilesAndDirectories
+from models.dto import MerkleProof
 from exceptions.mining import InvalidBlockException
 from models.enum import TransactionType
-from services import NetworkingService
+from services import NetworkingService, DifficultyService
 
 
 class Ledger(AbstractPickableSingleton, Subscribable):
+    # Accepted blocks are persisted here; the pickled ledger only holds pending state
+    _block_store: BlockStore = BlockStore(AbstractPickableSingleton._fs_service)
+    # Attributes derived from the block store, left out of the pickled ledger
+    _STORED_ATTRIBUTES = ("_blocks", "_latest_block", "_chain", "_hash_by_number", "_tx_locations_by_address", "_tx_location_by_hash", "_balances")
+    # Derived from the transactions of every accepted block; snapshotted so loading only indexes the blocks after the snapshot
+    _SNAPSHOT_ATTRIBUTES = ("_tx_locations_by_address", "_tx_location_by_hash", "_balances")
+    # Accepted blocks between index snapshots, each snapshot rewrites the indexes of the whole chain
+    INDEX_SNAPSHOT_INTERVAL = 100
+    # Height of the latest index snapshot written or loaded, -1 for none
+    _index_snapshot_height: int = -1
+    # Validating at least this many blocks at once goes through the ParallelChainValidator
+    PARALLEL_VALIDATION_THRESHOLD = 64
+    # Most headers served in answer to a single header sync request
+    HEADER_SYNC_BATCH_SIZE = 500
+    # How far a new block's timestamp may run ahead of our clock; the difficulty retargets from timestamps
+    MAX_FUTURE_BLOCK_SECONDS = 120
+
     # Hash - Block pairs
     _blocks: dict[str, "Block"]
     _latest_block: Optional[Block]
     _pending_blocks: dict[str, Block]
+    # Height - Hash pairs, kept in sync with _blocks
+    _hash_by_number: dict[int, str]
+    # Accepted chain ordered from genesis (index == block number)
+    _chain: list[Block]
+    # Address - [(block number, transaction position)] pairs for accepted blocks
+    _tx_locations_by_address: dict[str, list[tuple[int, int]]]
+    # Transaction hash - (block number, transaction position) pairs for accepted blocks
+    _tx_location_by_hash: dict[str, tuple[int, int]]
+    # Address - confirmed balance pairs for accepted blocks
+    _balances: dict[str, Decimal]
+    # Bumped whenever the accepted chain changes, so dependants can tell when cached results are stale
+    _generation: int = 0
 
     def __init__(self):
         self._blocks = {}
         self._latest_block = None
         self._pending_blocks = {}
+        self._hash_by_number = {}
+        self._chain = []
+        self._tx_locations_by_address = {}
+        self._tx_location_by_hash = {}
+        self._balances = {}
+        self._generation = 0
         super().__init__()
         self._initialize()
 
@@ -30,10 +76,173 @@ class Ledger(AbstractPickableSingleton, Subscribable):
         """ Initialize the ledger with the genesis block if empty."""
         if not self._blocks:
             genesis_block = Block.create_genesis_block()
-            self._blocks[genesis_block.calculated_hash] = genesis_block
-            self._latest_block = genesis_block
+            self._append_to_chain(genesis_block)
             self._save()
 
+    # -----------------
+    # Chain indexes
+    # -----------------
+    def _append_to_chain(self, block: Block) -> list[Block]:
+        """ Add a block on top of the chain and keep the height indexes in sync. Returns the blocks it replaced. """
+        # A block always extends the chain, anything at or above its height is stale
+        stale_blocks = self._chain[block.number:]
+        for stale_block in stale_blocks:
+            self._unindex_transactions(stale_block)
+            self._apply_balances(stale_block, reverse=True)
+            self._hash_by_number.pop(stale_block.number, None)
+            self._blocks.pop(stale_block.calculated_hash, None)
+        del self._chain[block.number:]
+        self._blocks[block.calculated_hash] = block
+        self._latest_block = block
+        self._chain.append(block)
+        self._hash_by_number[block.number] = block.calculated_hash
+        self._index_transactions(block)
+        self._apply_balances(block)
+        if stale_blocks:
+            self._rebuild_difficulty()
+        else:
+            DifficultyService.record_block(block, self._chain[-2] if len(self._chain) > 1 else None)
+        self._generation += 1
+        return stale_blocks
+
+    def _rebuild_difficulty(self) -> None:
+        """ Derive the difficulty state from the tail of the chain, O(window_size). """
+        DifficultyService.rebuild_from_blocks(self._chain[-(DifficultyService.cfg.window_size + 1):])
+
+    def _apply_balances(self, block: Block, reverse: bool = False) -> None:
+        """ Apply (or revert) the balance changes of an accepted block to the account state table. """
+        if block.status != BlockStatus.ACCEPTED:
+            return
+        sign = -1 if reverse else 1
+        for tx in block.transactions:
+            if tx.receiver_address is not None:
+                self._balances[tx.receiver_address] = self._balances.get(tx.receiver_address, Decimal("0.0")) + sign * tx.amount
+            if tx.sender_address is not None:
+                self._balances[tx.sender_address] = self._balances.get(tx.sender_address, Decimal("0.0")) - sign * (tx.amount + tx.fee)
+
+    def _index_transactions(self, block: Block) -> None:
+        """ Record the position of every transaction in the block under its sender and receiver address. """
+        for position, tx in enumerate(block.transactions):
+            location = (block.number, position)
+            self._tx_location_by_hash[tx.hash] = location
+            for address in {tx.sender_address, tx.receiver_address}:
+                if address is None:
+                    continue
+                self._tx_locations_by_address.setdefault(address, []).append(location)
+
+    def _unindex_transactions(self, block: Block) -> None:
+        for tx in block.transactions:
+            if self._tx_location_by_hash.get(tx.hash, (None,))[0] == block.number:
+                del self._tx_location_by_hash[tx.hash]
+            for address in {tx.sender_address, tx.receiver_address}:
+                locations = self._tx_locations_by_address.get(address)
+                if not locations:
+                    continue
+                locations[:] = [location for location in locations if location[0] != block.number]
+
+    def _reset_chain(self) -> None:
+        """ Drop all blocks and indexes, used when the genesis block is replaced. """
+        self._blocks = {}
+        self._latest_block = None
+        self._hash_by_number = {}
+        self._chain = []
+        self._tx_locations_by_address = {}
+        self._tx_location_by_hash = {}
+        self._balances = {}
+        DifficultyService.reset()
+        self._generation += 1
+
+    def _restore_chain(self, blocks: list[Block]) -> None:
+        """ Restore the accepted chain read from the block store. """
+        self._blocks = {block.calculated_hash: block for block in blocks}
+        self._latest_block = blocks[-1]
+        self._rebuild_indexes()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for attribute in self._STORED_ATTRIBUTES:
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # Ledgers pickled before the block store existed still carry their blocks
+        self.__dict__.update({"_blocks": {}, "_latest_block": None, "_chain": [], "_hash_by_number": {},
+                              "_tx_locations_by_address": {}, "_tx_location_by_hash": {}, "_balances": {}})
+        self.__dict__.update(state)
+
+    def _rebuild_indexes(self) -> None:
+        """ Rebuild the height and address indexes and the account state table by walking back from the latest block once. """
+        chain = []
+        current_block = self._latest_block
+        while current_block is not None:
+            chain.append(current_block)
+            if current_block.previous_hash is None:
+                break
+            current_block = self._blocks.get(current_block.previous_hash)
+        chain.reverse()
+        self._chain = chain
+        self._hash_by_number = {block.number: block.calculated_hash for block in chain}
+        indexed_count = self._load_index_snapshot()
+        if indexed_count == 0:
+            self._tx_locations_by_address = {}
+            self._tx_location_by_hash = {}
+            self._balances = {}
+        for block in chain[indexed_count:]:
+            self._index_transactions(block)
+            self._apply_balances(block)
+        self._rebuild_difficulty()
+
+    # -----------------
+    # Index snapshot
+    # -----------------
+    def _get_index_snapshot_path(self) -> str:
+        return os.path.join(self._fs_service.get_data_root(create_if_missing=True), FilesAndDirectories.LEDGER_INDEX_SNAPSHOT_FILE_NAME)
+
+    def _load_index_snapshot(self) -> int:
+        """
+        Restore the transaction indexes and balances from the snapshot if its block is still in the chain
+        (and so every block before it). Returns the number of blocks the snapshot covers, 0 if it is unusable.
+        """
+        path = self._get_index_snapshot_path()
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+            height = snapshot["height"]
+            block_hash = snapshot["block_hash"]
+            indexes = {attribute: snapshot[attribute] for attribute in self._SNAPSHOT_ATTRIBUTES}
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable ledger index snapshot: {e}")
+            return 0
+
+        if not isinstance(height, int) or height < 0 or height >= len(self._chain) or self._chain[height].calculated_hash != block_hash:
+            return 0
+        self.__dict__.update(indexes)
+        Ledger._index_snapshot_height = height
+        return height + 1
+
+    def _take_index_snapshot(self) -> tuple[int, bytes]:
+        """ The pickled indexes and balances with the height they cover, written by _write_index_snapshot. """
+        latest_block = self._chain[-1]
+        snapshot = {"height": latest_block.number, "block_hash": latest_block.calculated_hash}
+        snapshot.update({attribute: getattr(self, attribute) for attribute in self._SNAPSHOT_ATTRIBUTES})
+        return latest_block.number, pickle.dumps(snapshot)
+
+    def _write_index_snapshot(self, height: int, data: bytes) -> None:
+        path = self._get_index_snapshot_path()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_ledger_indexes_", suffix=".pkl")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._fs_service.update_hash_for_file(FilesAndDirectories.LEDGER_INDEX_SNAPSHOT_FILE_NAME)
+        Ledger._index_snapshot_height = height
+
     # -----------------
     # Basic getters
     # -----------------
@@ -45,42 +254,37 @@ class Ledger(AbstractPickableSingleton, Subscribable):
     def get_block(self, hash: str) -> Optional[Block]:
         return self._blocks.get(hash, None)
 
+    def get_block_hash_by_number(self, number: int) -> Optional[str]:
+        return self._hash_by_number.get(number, None)
+
     def get_block_by_number(self, number: int, include_pending: bool = False) -> Optional[Block]:
-        blocks = self._blocks.values()
+        block_hash = self._hash_by_number.get(number)
+        if block_hash is not None:
+            return self._blocks.get(block_hash)
 
         if include_pending:
-            blocks = list(blocks) + list(self._pending_blocks.values())
-
-        for block in blocks:
-            if block.number == number:
-                return block
+            for block in self._pending_blocks.values():
+                if block.number == number:
+                    return block
         return None
 
     def get_n_blocks(self, n: int) -> list[Block]:
+        """ Get the latest n blocks, newest first. """
         if n <= 0:
             return []
-        current_block = self._latest_block
-        blocks = []
-        for _ in range(n):
-            if current_block is None:
-                break
-            blocks.append(current_block)
-            if current_block.previous_hash is None:
-                break
-            current_block = self._blocks[current_block.previous_hash]
-        return blocks
+        return list(reversed(self._chain[-n:]))
 
     def get_all_blocks(self) -> list[Block]:
         return list(self._blocks.values())
 
     # Helper to get the chain in order (genesis -> latest)
     def _get_chain_ordered(self) -> list[Block]:
-        return list(reversed(self.get_n_blocks(self.block_count)))
+        return list(self._chain)
 
     # -----------------
     # Chain integrity validation
     # -----------------
-    def validate_chain(self) -> tuple[bool, list[str]]:
+    def validate_chain(self, use_checkpoint: bool = False) -> tuple[bool, list[str]]:
         """
         Validate the entire chain from genesis to latest.
         Checks:
@@ -88,6 +292,8 @@ class Ledger(AbstractPickableSingleton, Subscribable):
           - Non-genesis blocks are ACCEPTED
           - 3-minute spacing between consecutive blocks
           - Merkle root, hash, difficulty and tx validity via Block.validate
+        With use_checkpoint, blocks up to a still-matching validation checkpoint are skipped.
+        A successful run moves the checkpoint to the latest block.
         Returns (is_valid, errors)
         """
         errors: list[str] = []
@@ -98,7 +304,20 @@ class Ledger(AbstractPickableSingleton, Subscribable):
 
         from datetime import datetime
         previous: Optional[Block] = None
-        for idx, block in enumerate(chain):
+        start = 0
+        if use_checkpoint:
+            checkpoint_height = self.get_validation_checkpoint_height()
+            if checkpoint_height is not None:
+                previous = chain[checkpoint_height]
+                start = checkpoint_height + 1
+
+        to_validate = chain[start:]
+        # Structural and signature checks are independent per block, so long runs are spread over all cores
+        validations: Optional[list] = None
+        if len(to_validate) >= self.PARALLEL_VALIDATION_THRESHOLD and (os.cpu_count() or 1) > 1:
+            validations = ParallelChainValidator().validate(to_validate, previous)
+
+        for position, block in enumerate(to_validate):
             # Status rules
             if block.number == 0:
                 if block.status != BlockStatus.GENESIS:
@@ -116,15 +335,68 @@ class Ledger(AbstractPickableSingleton, Subscribable):
                     errors.append(f"Blocks #{previous.number} -> #{block.number} are less than 3 minutes apart.")
 
             # Structural + transaction validation
-            validation = block.validate(previous)
+            validation = validations[position] if validations is not None else block.validate(previous)
             if not validation.valid:
                 joined = "; ".join(validation.reasons)
                 errors.append(f"Block #{block.number} failed validation: {joined}")
 
             previous = block
 
+        if not errors:
+            self._save_validation_checkpoint(chain[-1])
         return (len(errors) == 0, errors)
 
+    # -----------------
+    # Validation checkpoint
+    # -----------------
+    def _get_validation_checkpoint_path(self) -> str:
+        return os.path.join(self._fs_service.get_data_root(create_if_missing=True), FilesAndDirectories.VALIDATION_CHECKPOINT_FILE_NAME)
+
+    def get_validation_checkpoint_height(self) -> Optional[int]:
+        """
+        Height up to which the chain was previously validated, or None if there is no usable checkpoint.
+        The checkpoint only counts if its block is still in the chain and the stored bytes of every
+        block up to it are unchanged (see BlockStore.compute_checkpoint_hashes, only the tail is re-read).
+        """
+        path = self._get_validation_checkpoint_path()
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            height = int(checkpoint["height"])
+            block_hash = checkpoint["block_hash"]
+            store_hashes = checkpoint["store_hashes"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable validation checkpoint: {e}")
+            return None
+
+        if height < 0 or height >= len(self._chain) or self._chain[height].calculated_hash != block_hash:
+            return None
+        if self._block_store.compute_checkpoint_hashes(height + 1) != store_hashes:
+            logging.warning("Stored blocks changed since the validation checkpoint, falling back to full validation.")
+            return None
+        return height
+
+    def _save_validation_checkpoint(self, block: Block) -> None:
+        with self._persist_lock:
+            # The store may lag behind the chain when saves are coalesced
+            self._block_store.sync(list(self._chain))
+            store_hashes = self._block_store.compute_checkpoint_hashes(block.number + 1)
+        if store_hashes is None:
+            return
+
+        path = self._get_validation_checkpoint_path()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_checkpoint_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"height": block.number, "block_hash": block.calculated_hash, "store_hashes": store_hashes}, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
     # -----------------
     # Pending blocks & consensus
     # -----------------
@@ -154,6 +426,16 @@ class Ledger(AbstractPickableSingleton, Subscribable):
             if delta < 180:
                 raise InvalidBlockException("At least 3 minutes must pass between consecutive blocks.")
 
+        if block.number != 0:
+            from datetime import datetime, timezone
+            ahead = (datetime.fromisoformat(block.timestamp) - datetime.now(timezone.utc)).total_seconds()
+            if ahead > self.MAX_FUTURE_BLOCK_SECONDS:
+                raise InvalidBlockException("Block timestamp is too far in the future.")
+
+        # The target is the one retargeted from the accepted chain, the one a block claims is not taken on trust
+        if block.difficulty != DifficultyService.current_difficulty:
+            raise InvalidBlockException("Block difficulty does not match the difficulty retargeted from the chain.")
+
         # Structural + transaction validation
         validation = block.validate(previous)
         if not validation.valid:
@@ -168,6 +450,7 @@ class Ledger(AbstractPickableSingleton, Subscribable):
 
         block.status = BlockStatus.PENDING
         self._pending_blocks[block.calculated_hash] = block
+        Pool.get_instance().track_pending_block(block)
         self._save()
 
     def handle_network_block(self, request_data: dict) -> None:
@@ -192,11 +475,11 @@ class Ledger(AbstractPickableSingleton, Subscribable):
             local_genesis = self.get_block_by_number(0)
             if local_genesis is None or local_genesis.calculated_hash != block.calculated_hash:
                 logging.info("Replacing local genesis block with network genesis block.")
-                self._blocks = {}
+                self._reset_chain()
                 block.status = BlockStatus.GENESIS
-                self._blocks[block.calculated_hash] = block
-                self._latest_block = block
+                self._append_to_chain(block)
                 self._save()
+                MiningJob.cancel_active("The network replaced the genesis block.")
 
                 GenesisBlockAddedFromNetworkEvent.dispatch()
 
@@ -212,6 +495,9 @@ class Ledger(AbstractPickableSingleton, Subscribable):
             logging.exception("Failed to add block received from network: %s", e)
             return
 
+        # Only a block we accepted as pending makes whatever we are mining obsolete; invalid ones must not stop us
+        MiningJob.cancel_active("A competing block arrived from the network.")
+
         # TODO: Unify duplicate logic with add_validation_flag
         valid_count = sum(1 for vf in block.validators if vf.valid)
         invalid_count = sum(1 for vf in block.validators if not vf.valid)
@@ -319,6 +605,16 @@ class Ledger(AbstractPickableSingleton, Subscribable):
             block_payload=block.to_dict()
         )
 
+    def handle_header_sync_request(self, request_data: dict) -> None:
+        """ Serve the headers of accepted blocks after the given number, for light nodes. """
+        after_number = request_data['after_number']
+        max_count = min(request_data.get('max', self.HEADER_SYNC_BATCH_SIZE), self.HEADER_SYNC_BATCH_SIZE)
+        blocks = self._chain[max(after_number + 1, 0):max(after_number + 1, 0) + max_count]
+        if not blocks:
+            logging.debug(f"No headers to send after block number {after_number}.")
+            return
+        NetworkingService.get_instance().send_headers([block.get_header().to_dict() for block in blocks])
+
     def handle_validation_sync_request(self, request_data: dict):
         """ Handle a validation sync request from the network. Broadcast all validations for pending block. """
         logging.debug("Received validation sync request")
@@ -333,21 +629,63 @@ class Ledger(AbstractPickableSingleton, Subscribable):
                 block_hash=pending_block.calculated_hash
             )
 
+    def handle_merkle_proof_request(self, request_data: dict) -> None:
+        """ Answer a proof request from the network if the transaction is in an accepted block. """
+        proof = self.get_merkle_proof(request_data.get("tx_hash"))
+        if proof is None:
+            logging.debug("No accepted transaction found for Merkle proof request.")
+            return
+        NetworkingService.get_instance().send_merkle_proof(proof.to_dict())
+
+    def handle_address_proofs_request(self, request_data: dict) -> None:
+        """
+        Answer with a proof for every accepted transaction of the address in blocks after after_number.
+        The transaction is sent along, so a light node can check it involves the address it watches.
+        """
+        after_number = request_data.get("after_number", -1)
+        if not isinstance(after_number, int):
+            logging.warning("Ignoring malformed address proofs request from network")
+            return
+        for block, tx in self.get_confirmed_transactions_for_address(request_data.get("address")):
+            if block.number <= after_number:
+                continue
+            proof = block.get_merkle_proof(tx.hash)
+            if proof is not None:
+                NetworkingService.get_instance().send_merkle_proof(proof.to_dict(), tx.to_dict())
+
+    def handle_merkle_proof_response(self, response_data: dict) -> None:
+        """ Check a proof received from the network against the local header of its block. """
+        try:
+            proof = MerkleProof.from_dict(response_data["proof"])
+        except (KeyError, TypeError, ValueError):
+            logging.warning("Ignoring malformed Merkle proof from network")
+            return
+        block = self.get_block(proof.block_hash)
+        if block is None or block.number != proof.block_number or block.status == BlockStatus.PENDING:
+            logging.debug(f"Ignoring Merkle proof for unknown block {proof.block_hash}")
+            return
+        if not block.verify_merkle_proof(proof):
+            logging.warning(f"Ignoring invalid Merkle proof for transaction {proof.tx_hash}")
+            return
+        MerkleProofReceivedFromNetworkEvent.dispatch(proof)
+
     def _finalize_accept(self, block: Block) -> None:
         block.status = BlockStatus.ACCEPTED
         # Move block into chain
-        self._blocks[block.calculated_hash] = block
-        self._latest_block = block
+        stale_blocks = self._append_to_chain(block)
         # Remove from pending
         self._pending_blocks.pop(block.calculated_hash, None)
         # Remove included transactions from pool
         from blockchain import Pool
+        Pool.get_instance().untrack_pending_block(block)
         Pool.get_instance().remove_transactions(block.transactions)
+        self._publish_touched_addresses([block, *stale_blocks])
 
     def _finalize_reject(self, block: Block) -> None:
         block.status = BlockStatus.REJECTED
         from blockchain import Pool
         pool = Pool.get_instance()
+        pool.untrack_pending_block(block)
         # Return valid transactions to pool; flag invalid ones
         for tx in block.transactions:
 
@@ -360,6 +698,20 @@ class Ledger(AbstractPickableSingleton, Subscribable):
             pool.add_transaction(tx, raise_exception=False)
         # Remove from pending (not added to chain)
         self._pending_blocks.pop(block.calculated_hash, None)
+        self._publish_touched_addresses([block])
+
+    @staticmethod
+    def _publish_touched_addresses(blocks: list[Block]) -> None:
+        """ Let dependants (the pool) know whose balances may have changed with the blocks being finalized. """
+        addresses = {
+            address
+            for block in blocks
+            for tx in block.transactions
+            for address in (tx.sender_address, tx.receiver_address)
+            if address is not None
+        }
+        if addresses:
+            AddressesTouchedByBlockEvent.dispatch(addresses)
 
     # -----------------
     # Add accepted block directly (used only internally / genesis)
@@ -370,16 +722,16 @@ class Ledger(AbstractPickableSingleton, Subscribable):
             block.status = BlockStatus.ACCEPTED
         if block.status not in (BlockStatus.ACCEPTED, BlockStatus.GENESIS):
             raise InvalidBlockException("Only accepted or genesis blocks can be added to the ledger.")
-        self._blocks[block.calculated_hash] = block
-        self._latest_block = block
+        self._append_to_chain(block)
         self._save()
         from blockchain import Pool
         Pool.get_instance().remove_transactions(block.transactions)
 
     @classmethod
-    def mine_new_block(cls) -> Block:
-        """ Mines a new block using the currently logged-in user as miner and the transactions marked for inclusion in the pool.
-            Automatically adds the block for pending and clear te necessary pool transactions.
+    def start_mining_job(cls) -> MiningJob:
+        """
+        Mines a new block using the currently logged-in user as miner and the transactions marked for inclusion in the pool.
+        Mining runs on a background thread; the cancellable job is returned right away and submits the solved block as pending.
         """
         from blockchain import Pool
         from services.user_service import UserService
@@ -390,24 +742,50 @@ class Ledger(AbstractPickableSingleton, Subscribable):
         if logged_in_user is None:
             raise InvalidBlockException("No logged-in user to mine the block.")
 
-        log("Mining new block...")
-
-        block = Block.mine_with_transactions(logged_in_user, marked_transactions)
-
-        log("Block mined with nonce %d and hash %s" % (block.nonce, block.calculated_hash))
-
-        Ledger.get_instance().submit_block(block)
-
-        return block
+        log("Starting mining job...")
+        return MiningJob(logged_in_user, marked_transactions).start()
 
     @classmethod
     def _save(cls) -> None:
         super()._save()
         cls._call_subscribers(None)
 
+    @classmethod
+    def _take_snapshot(cls) -> tuple[list[Block], Optional[tuple[int, bytes]], bytes]:
+        """ The accepted chain, the indexes when a new index snapshot is due, and the (small) pickled pending state. """
+        ledger = cls.get_instance()
+        chain = list(ledger._chain)
+        index_snapshot = None
+        if chain and abs(len(chain) - 1 - cls._index_snapshot_height) >= cls.INDEX_SNAPSHOT_INTERVAL:
+            index_snapshot = ledger._take_index_snapshot()
+        return chain, index_snapshot, super()._take_snapshot()
+
+    @classmethod
+    def _write_snapshot(cls, snapshot: tuple[list[Block], Optional[tuple[int, bytes]], bytes]) -> None:
+        """ Append newly accepted blocks to the block store, then write the index snapshot and the pending state. """
+        chain, index_snapshot, data = snapshot
+        with cls._persist_lock:
+            cls._block_store.sync(chain)
+            if index_snapshot is not None:
+                cls.get_instance()._write_index_snapshot(*index_snapshot)
+            super()._write_snapshot(data)
+
     @classmethod
     def load(cls) -> Optional["AbstractPickableSingleton"]:
-        return super().load()
+        loaded = super().load()
+        if loaded is not None:
+            stored_blocks = cls._block_store.read_all()
+            if stored_blocks:
+                loaded._restore_chain(stored_blocks)
+            else:
+                # Ledgers pickled before the block store existed carry their blocks inline
+                loaded._rebuild_indexes()
+            if not loaded._chain:
+                return None
+            from blockchain import Pool
+            if Pool._instance is not None:
+                Pool._instance.track_pending_block(loaded.get_pending_block())
+        return loaded
 
     @classmethod
     def get_instance(cls) -> "Ledger":
@@ -415,17 +793,37 @@ class Ledger(AbstractPickableSingleton, Subscribable):
         """ Get the singleton instance of the Ledger."""
         return super().get_instance()
 
+    @property
+    def generation(self) -> int:
+        return self._generation
+
     @property
     def block_count(self):
         return len(self._blocks)
 
+    def get_balance(self, address: str) -> Decimal:
+        """ Get the confirmed balance of the given address from the account state table."""
+        return self._balances.get(address, Decimal("0.0"))
+
+    def get_confirmed_transactions_for_address(self, address: str) -> list[tuple[Block, "Transaction"]]:
+        """ Get (block, transaction) pairs from the accepted chain involving the given address, in chain order."""
+        pairs = []
+        for number, position in self._tx_locations_by_address.get(address, []):
+            block = self.get_block_by_number(number)
+            pairs.append((block, block.transactions[position]))
+        return pairs
+
+    def get_merkle_proof(self, tx_hash: str) -> Optional[MerkleProof]:
+        """ Inclusion proof for a transaction in an accepted block, None if it is not in the chain. """
+        location = self._tx_location_by_hash.get(tx_hash)
+        if location is None:
+            return None
+        block = self.get_block_by_number(location[0])
+        return block.get_merkle_proof(tx_hash) if block is not None else None
+
     def get_transactions_for_address(self, address: str) -> list["Transaction"]:
         """ Get all transactions in the ledger involving the given address."""
-        transactions = []
-        for block in self._blocks.values():
-            for tx in block.transactions:
-                if tx.sender_address == address or tx.receiver_address == address:
-                    transactions.append(tx)
+        transactions = [tx for _, tx in self.get_confirmed_transactions_for_address(address)]
         pending_block = self.get_pending_block()
         if pending_block is not None:
             for tx in pending_block.transactions:
@@ -0,0 +1,162 @@
+import logging
+import threading
+from time import perf_counter
+from typing import Optional
+
+from blockchain.parallel_miner import ParallelMiner
+from models import Block, Transaction, User
+from models.dto import MiningProgress
+from models.enum import MiningJobState
+from services import DifficultyService, NetworkingService
+
+
+class MiningJob:
+    """
+    Proof-of-work for one block, run on a background thread so callers can follow its progress and
+    cancel it. A solved block is submitted to the ledger as pending, on the listen loop that also
+    handles blocks and validation flags from the network, so the Ledger is never changed from two
+    threads at once. The job only finishes once the submission ran.
+
+    Only one job is active at a time. The active job is cancelled when a competing block arrives
+    from the network or when the transactions marked for the block change.
+    """
+
+    _active: Optional["MiningJob"] = None
+    _active_lock = threading.Lock()
+    # When set (from the node's command line), peers are invited to mine nonce ranges of the block
+    cooperative: bool = False
+
+    def __init__(self, miner: User, transactions: list[Transaction], workers: Optional[int] = None):
+        # Builds and validates the block right away, so invalid input raises in the caller's thread
+        self.block = Block.create_block_template(miner, transactions)
+        self.state = MiningJobState.PENDING
+        self.cancel_reason: Optional[str] = None
+        self.error: Optional[Exception] = None
+        # The node's long-lived miner, unless a worker count is given for this job only
+        self._owns_miner = workers is not None
+        self._miner = ParallelMiner(workers) if self._owns_miner else ParallelMiner.get_shared()
+        self._attempts_before = self._miner.attempts
+        self._search_started_at: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._done_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    @classmethod
+    def get_active(cls) -> Optional["MiningJob"]:
+        return cls._active
+
+    @classmethod
+    def cancel_active(cls, reason: str) -> None:
+        """ Cancel the running job, if any. """
+        job = cls._active
+        if job is not None:
+            job.cancel(reason)
+
+    def start(self) -> "MiningJob":
+        with MiningJob._active_lock:
+            previous = MiningJob._active
+            MiningJob._active = self
+        if previous is not None:
+            previous.cancel("Superseded by a new mining job.")
+
+        self.state = MiningJobState.RUNNING
+        self._started_at = perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f"mining-block-{self.block.number}", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self, reason: str = "Cancelled by the user.") -> None:
+        # The stop event alone does not tell, a MiningCoordinator also sets it once a peer solved the block
+        if self.state not in (MiningJobState.PENDING, MiningJobState.RUNNING) or self.cancel_reason is not None:
+            return
+        logging.info(f"Cancelling mining of block #{self.block.number}: {reason}")
+        self.cancel_reason = reason
+        self._stop_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """ Block until the job finished; returns False on timeout. """
+        return self._done_event.wait(timeout)
+
+    @property
+    def is_finished(self) -> bool:
+        return self._done_event.is_set()
+
+    def get_progress(self) -> MiningProgress:
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or perf_counter()) - self._started_at
+        attempts = self._miner.attempts - self._attempts_before
+        rate = attempts / elapsed if elapsed > 0 else 0.0
+        expected = DifficultyService.expected_attempts(self.block.difficulty or 0) / rate if rate > 0 else None
+        return MiningProgress(
+            state=self.state,
+            attempts=attempts,
+            elapsed_seconds=elapsed,
+            attempts_per_second=rate,
+            expected_seconds_to_solution=expected,
+        )
+
+    def _mine_cooperatively(self) -> bool:
+        """ Mine ranges handed out by a MiningCoordinator, while peers work on other ranges of the same block. """
+        from blockchain.cooperative_mining import MiningCoordinator
+        coordinator = MiningCoordinator(self.block, stop_event=self._stop_event)
+        coordinator.start()
+        try:
+            while not self._stop_event.is_set():
+                self.block.nonce, count = coordinator.take_range("local")
+                if self._miner.mine(self.block, self._stop_event, nonce_count=count):
+                    return True
+            if coordinator.solution is None:
+                return False
+            self.block.nonce, self.block.calculated_hash = coordinator.solution
+            logging.info(f"Block #{self.block.number} was solved by peer {coordinator.solved_by}")
+            return True
+        finally:
+            coordinator.stop()
+
+    def _run(self) -> None:
+        try:
+            self._miner.start()
+            self._search_started_at = perf_counter()
+            solved = self._mine_cooperatively() if self.cooperative else self._miner.mine(self.block, self._stop_event)
+        except Exception as e:
+            logging.exception("Mining block #%d failed: %s", self.block.number, e)
+            self._finish(MiningJobState.FAILED, e)
+            return
+        finally:
+            if self._owns_miner:
+                self._miner.close()
+
+        if not solved:
+            self._finish(MiningJobState.CANCELLED)
+            return
+
+        # Recorded in the block for display; the difficulty retargets from the hashed timestamps
+        self.block.mined_duration = perf_counter() - self._search_started_at
+        NetworkingService.get_instance().call_soon(self._submit)
+
+    def _submit(self) -> None:
+        try:
+            # A competing block may have arrived while the solved block waited for the listen loop
+            if self.cancel_reason is not None:
+                self._finish(MiningJobState.CANCELLED)
+                return
+
+            from blockchain import Ledger
+            Ledger.get_instance().submit_block(self.block)
+            self._finish(MiningJobState.SOLVED)
+        except Exception as e:
+            logging.exception("Submitting block #%d failed: %s", self.block.number, e)
+            self._finish(MiningJobState.FAILED, e)
+
+    def _finish(self, state: MiningJobState, error: Optional[Exception] = None) -> None:
+        self.state = state
+        self.error = error
+        self._finished_at = perf_counter()
+        with MiningJob._active_lock:
+            if MiningJob._active is self:
+                MiningJob._active = None
+        self._done_event.set()
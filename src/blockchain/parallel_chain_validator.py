@@ -0,0 +1,70 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from models import Block
+from models.block import BlockValidationResult
+from models.enum import TransactionType
+
+
+def _check_block_range(blocks: list[Block], previous: Optional[Block]) -> list[tuple[list[str], set[str]]]:
+    """
+    Stateless checks for a contiguous range of blocks, run in a worker process.
+    Returns per block the structural reasons (linkage, transaction hashes, Merkle root, hash, difficulty) and the
+    hashes of transfers whose signature does not verify.
+    """
+    results = []
+    for block in blocks:
+        _, reasons = block.validate_structure(previous)
+        invalid_signatures = {
+            tx.hash for tx in block.transactions
+            if tx.kind == TransactionType.TRANSFER and tx.sender_public_key and tx.sender_signature and not tx.has_valid_signature()
+        }
+        results.append((reasons, invalid_signatures))
+        previous = block
+    return results
+
+
+class ParallelChainValidator:
+    """
+    Validates a run of blocks by fanning the CPU-bound, stateless checks out over worker processes.
+
+    Block ranges are checked in parallel, after which the stateful transaction rules (wallet lookup
+    and balance) are applied in a single ordered pass in this process. The results match what
+    Block.validate would return for each block.
+    """
+
+    # Smallest range handed to a worker, so process overhead stays small relative to the work
+    MIN_BLOCKS_PER_TASK = 16
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _split_ranges(self, blocks: list[Block], previous: Optional[Block]) -> list[tuple[list[Block], Optional[Block]]]:
+        # A few ranges per worker keeps them busy when some ranges hold heavier blocks
+        size = max(self.MIN_BLOCKS_PER_TASK, math.ceil(len(blocks) / (self.max_workers * 4)))
+        return [
+            (blocks[start:start + size], blocks[start - 1] if start > 0 else previous)
+            for start in range(0, len(blocks), size)
+        ]
+
+    def validate(self, blocks: list[Block], previous: Optional[Block]) -> list[BlockValidationResult]:
+        """ Validate consecutive blocks, where previous is the block before blocks[0] (None for genesis). """
+        ranges = self._split_ranges(blocks, previous)
+        # Spawn rather than fork: the node runs networking and UI threads that must not be forked
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(ranges)), mp_context=context) as executor:
+            futures = [executor.submit(_check_block_range, range_blocks, range_previous) for range_blocks, range_previous in ranges]
+            checked = [result for future in futures for result in future.result()]
+
+        results = []
+        for block, (structure_reasons, invalid_signatures) in zip(blocks, checked):
+            tx_ok, tx_reasons, invalid_txs = block.validate_transactions(invalid_signatures=invalid_signatures)
+            results.append(BlockValidationResult(
+                valid=not structure_reasons and tx_ok,
+                reasons=structure_reasons + tx_reasons,
+                invalid_transactions=invalid_txs,
+            ))
+        return results
@@ -0,0 +1,206 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import threading
+from typing import Optional
+
+from exceptions.mining import InvalidBlockException
+from models import Block
+
+
+def _search_nonces(block: Block, first_nonce: int, stride: int, stop_event=None, attempts=None, slot: int = 0, end: Optional[int] = None) -> Optional[tuple[int, str]]:
+    """
+    Try nonces first_nonce, first_nonce + stride, ... (below end, if given) until one meets the block's
+    difficulty. Returns (nonce, hash), or None once stop_event is set or the range is exhausted.
+    Tried nonces are counted in attempts[slot].
+
+    Everything but the nonce is canonicalized once; each attempt copies a SHA-256 state primed with
+    the part before the nonce and compares the raw digest against the target. The resulting hash is
+    identical to Block.compute_hash.
+    """
+    difficulty = block.difficulty or 0
+    if difficulty < 0:
+        raise InvalidBlockException("Difficulty must be a non-negative integer.")
+    target = Block.difficulty_target_bytes(difficulty)
+    prefix, suffix = block.split_canonical_around_nonce()
+    prefix_state = hashlib.sha256(prefix)
+
+    nonce = first_nonce
+    while stop_event is None or not stop_event.is_set():
+        batch = ParallelMiner.STOP_CHECK_INTERVAL
+        if end is not None:
+            batch = min(batch, -(-(end - nonce) // stride))
+            if batch <= 0:
+                return None
+        # Only look at the (cross-process) stop event every so often, it is comparatively slow
+        for tried in range(1, batch + 1):
+            state = prefix_state.copy()
+            state.update(b"%d" % nonce)
+            state.update(suffix)
+            digest = state.digest()
+            if target is None or digest <= target:
+                if attempts is not None:
+                    attempts[slot] += tried
+                return nonce, digest.hex()
+            nonce += stride
+        if attempts is not None:
+            attempts[slot] += batch
+    return None
+
+
+def _mining_worker(tasks, stop_event, results, attempts, slot: int) -> None:
+    """ Worker process: search the nonces of each task, reporting a solution or None, until a None task arrives. """
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        block, first_nonce, stride, end = task
+        solution = _search_nonces(block, first_nonce, stride, stop_event, attempts, slot, end)
+        if solution is not None:
+            stop_event.set()
+        results.put(solution)
+
+
+class ParallelMiner:
+    """
+    Proof-of-work search spread over worker processes.
+
+    The nonce space is partitioned by striding: worker i of n tries nonces i, i + n, i + 2n, ...
+    The first worker to find a solution stops the others, and the winning nonce and hash are
+    written back to the block. With a single worker the search runs in the calling process.
+
+    Worker processes are started on the first search (or by start()) and kept for the following
+    ones, so mining many nonce ranges pays the process start-up once. close() stops them.
+    The node mines every block with the same miner, see get_shared.
+    """
+
+    # Used as the --mining-workers default: half the cores, at most 4, so the node's other threads keep a core
+    DEFAULT_WORKERS = min(4, max(1, (os.cpu_count() or 1) // 2))
+    # Number of worker processes used when none is given, set from the node's command line
+    workers: int = 1
+    STOP_CHECK_INTERVAL = 2000
+
+    _shared: Optional["ParallelMiner"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or self.workers)
+        self._attempts = [0]
+        self._earlier_attempts = 0
+        self._processes: list = []
+        self._task_queues: list = []
+        self._stop_event = None
+        self._results = None
+        # One search at a time, in this process or the workers, and it guards the attempt counters
+        self._lock = threading.RLock()
+
+    @classmethod
+    def get_shared(cls) -> "ParallelMiner":
+        """ The long-lived miner for blocks of this node, with the configured number of workers. """
+        with cls._shared_lock:
+            if cls._shared is not None and cls._shared.workers != max(1, cls.workers):
+                cls._shared.close()
+                cls._shared = None
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def close_shared(cls) -> None:
+        with cls._shared_lock:
+            if cls._shared is not None:
+                cls._shared.close()
+                cls._shared = None
+
+    @property
+    def attempts(self) -> int:
+        """ Nonces tried so far by all workers, over every search of this miner. """
+        return self._earlier_attempts + sum(self._attempts)
+
+    def mine(self, block: Block, stop_event: Optional[threading.Event] = None, nonce_count: Optional[int] = None) -> bool:
+        """
+        Find a nonce for the block starting from block.nonce, and set nonce and calculated_hash on it.
+        With nonce_count only the nonces block.nonce up to block.nonce + nonce_count are tried.
+        Returns False, leaving the block untouched, if stop_event was set or the range held no solution.
+        """
+        end = None if nonce_count is None else block.nonce + nonce_count
+        with self._lock:
+            if self.workers == 1:
+                self._earlier_attempts += sum(self._attempts)
+                self._attempts = [0]
+                solution = _search_nonces(block, block.nonce, 1, stop_event, self._attempts, 0, end)
+            else:
+                solution = self._search_in_processes(block, stop_event, end)
+        if solution is None:
+            return False
+        block.nonce, block.calculated_hash = solution
+        return True
+
+    def start(self) -> None:
+        """ Start the worker processes ahead of a search, so timing the search leaves out the start-up. """
+        with self._lock:
+            if self.workers > 1 and not self._processes:
+                self._start_processes()
+
+    def close(self) -> None:
+        """ Stop the worker processes; a later search starts new ones. """
+        with self._lock:
+            if not self._processes:
+                return
+            self._stop_event.set()
+            for tasks in self._task_queues:
+                tasks.put(None)
+            for process in self._processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self._processes = []
+            self._task_queues = []
+
+    def _start_processes(self) -> None:
+        # Spawn rather than fork: the node runs networking and UI threads that must not be forked
+        context = multiprocessing.get_context("spawn")
+        self._stop_event = context.Event()
+        self._results = context.Queue()
+        self._task_queues = [context.Queue() for _ in range(self.workers)]
+        self._earlier_attempts += sum(self._attempts)
+        self._attempts = context.Array("Q", self.workers, lock=False)
+        self._processes = [
+            context.Process(
+                target=_mining_worker,
+                args=(self._task_queues[index], self._stop_event, self._results, self._attempts, index),
+                daemon=True,
+            )
+            for index in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def _search_in_processes(self, block: Block, external_stop_event: Optional[threading.Event], end: Optional[int]) -> Optional[tuple[int, str]]:
+        if not self._processes:
+            self._start_processes()
+        # Every worker reported on the previous search, so none of them is still looking at the event
+        self._stop_event.clear()
+        for index, tasks in enumerate(self._task_queues):
+            tasks.put((block, block.nonce + index, self.workers, end))
+
+        solution = None
+        waiting_for = self.workers
+        try:
+            while waiting_for:
+                try:
+                    result = self._results.get(timeout=0.2)
+                except queue.Empty:
+                    if external_stop_event is not None and external_stop_event.is_set():
+                        self._stop_event.set()
+                    if not all(process.is_alive() for process in self._processes):
+                        raise RuntimeError("A mining worker exited during the search.")
+                    continue
+                waiting_for -= 1
+                if result is not None and solution is None:
+                    solution = result
+        except BaseException:
+            self.close()
+            raise
+        return solution
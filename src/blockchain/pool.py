@@ -1,25 +1,252 @@
+from bisect import bisect_left, insort
 from typing import Optional
 from datetime import datetime
+from decimal import Decimal
 
 from textual import log
 
 from base.subscribable import Subscribable
 from blockchain.abstract_pickable_singleton import AbstractPickableSingleton
-from events import TransactionAddedFromNetworkEvent
+from blockchain.mining_job import MiningJob
 from exceptions.mining import InvalidBlockException
+from exceptions.transaction import InvalidTransactionException, InsufficientBalanceException, PoolLimitExceededException
 from models import Transaction, Block
 from models.enum.transaction_type import TransactionType
 from services import NetworkingService
 import logging
 
 class Pool(AbstractPickableSingleton, Subscribable):
-    _transactions: list[Transaction]
-    _transactions_marked_for_block: list[Transaction]
+    # Limits on the pool, set from the node's command line. 0 disables a limit
+    max_transactions: int = 5000
+    max_bytes: int = 4 * 1024 * 1024
+    # Room for a full payout batch from one sender (see PayoutImportService)
+    max_transactions_per_sender: int = 1000
+
+    # Hash - Transaction pairs, in insertion order
+    _transactions: dict[str, Transaction]
+    # Hash - Transaction pairs, in marking order
+    _transactions_marked_for_block: dict[str, Transaction]
+    # Sorted (timestamp, hash) and (fee, timestamp, hash) keys for fairness selection
+    _age_index: list[tuple[str, str]]
+    _fee_index: list[tuple[Decimal, str, str]]
+    # Sender address - hashes of its pool transactions
+    _hashes_by_sender: dict[str, set[str]]
+    # Sum of _size_of over the pool transactions
+    _total_bytes: int = 0
+    # Address - running totals of valid pool transactions and the pending block
+    _reserved_by_address: dict[str, Decimal]
+    _incoming_by_address: dict[str, Decimal]
+    _tracked_pending_block_hash: Optional[str]
+    # Bumped whenever transactions enter or leave the pool
+    _generation: int = 0
+    # Fairness selection memoized against (pool generation, ledger generation, max timestamp)
+    _required_cache: Optional[tuple[tuple[int, int, Optional[str]], Optional[list[str]]]]
+    # Hash - (ledger generation, valid) pairs
+    _validity_cache: dict[str, tuple[int, bool]]
 
     def __init__(self):
-        self._transactions = []
-        self._transactions_marked_for_block = []
+        self._transactions = {}
+        self._transactions_marked_for_block = {}
+        self._age_index = []
+        self._fee_index = []
+        self._hashes_by_sender = {}
+        self._total_bytes = 0
+        self._reserved_by_address = {}
+        self._incoming_by_address = {}
+        self._tracked_pending_block_hash = None
+        self._generation = 0
+        self._reset_caches()
         super().__init__()
+        from blockchain.ledger import Ledger
+        if Ledger._instance is not None:
+            self.track_pending_block(Ledger._instance.get_pending_block())
+
+    # -----------------
+    # Indexes
+    # -----------------
+    @staticmethod
+    def _age_key(transaction: Transaction) -> tuple[str, str]:
+        return transaction.timestamp, transaction.hash
+
+    @staticmethod
+    def _fee_key(transaction: Transaction) -> tuple[Decimal, str, str]:
+        return transaction.fee, transaction.timestamp, transaction.hash
+
+    @staticmethod
+    def _size_of(transaction: Transaction) -> int:
+        """ Approximate size of a transaction in bytes, counted against max_bytes. """
+        return (
+            len(transaction.canonicalize()) + len(transaction.hash)
+            + len(transaction.sender_public_key or "") + len(transaction.sender_signature or "")
+        )
+
+    def _insert_transaction(self, transaction: Transaction) -> None:
+        """ Store a transaction and add it to the ordered indexes and aggregates, replacing one with the same hash. """
+        self._pop_transaction(transaction.hash)
+        self._transactions[transaction.hash] = transaction
+        insort(self._age_index, self._age_key(transaction))
+        insort(self._fee_index, self._fee_key(transaction))
+        if transaction.sender_address is not None:
+            self._hashes_by_sender.setdefault(transaction.sender_address, set()).add(transaction.hash)
+        self._total_bytes += self._size_of(transaction)
+        self._aggregate_transaction(transaction)
+        self._generation += 1
+
+    def _pop_transaction(self, transaction_hash: str) -> Optional[Transaction]:
+        """ Remove a transaction from the pool and all indexes. Returns None if it was not in the pool. """
+        transaction = self._transactions.pop(transaction_hash, None)
+        if transaction is None:
+            return None
+        for index, key in ((self._age_index, self._age_key(transaction)), (self._fee_index, self._fee_key(transaction))):
+            position = bisect_left(index, key)
+            if position < len(index) and index[position] == key:
+                del index[position]
+        sender_hashes = self._hashes_by_sender.get(transaction.sender_address)
+        if sender_hashes is not None:
+            sender_hashes.discard(transaction_hash)
+            if not sender_hashes:
+                del self._hashes_by_sender[transaction.sender_address]
+        self._total_bytes -= self._size_of(transaction)
+        self._aggregate_transaction(transaction, reverse=True)
+        self._validity_cache.pop(transaction_hash, None)
+        self._generation += 1
+        return transaction
+
+    def _rebuild_indexes(self) -> None:
+        # Pools pickled before the indexes existed stored plain lists
+        transactions = self._transactions.values() if isinstance(self._transactions, dict) else self._transactions
+        self._transactions = {tx.hash: tx for tx in transactions}
+        self._age_index = sorted(self._age_key(tx) for tx in self._transactions.values())
+        self._fee_index = sorted(self._fee_key(tx) for tx in self._transactions.values())
+        self._hashes_by_sender = {}
+        for tx in self._transactions.values():
+            if tx.sender_address is not None:
+                self._hashes_by_sender.setdefault(tx.sender_address, set()).add(tx.hash)
+        self._total_bytes = sum(self._size_of(tx) for tx in self._transactions.values())
+
+    def _reset_caches(self) -> None:
+        self._required_cache = None
+        self._validity_cache = {}
+
+    def _is_valid_cached(self, transaction: Transaction, ledger_generation: int) -> Optional[bool]:
+        """
+        Validate a pool transaction, reusing the previous result while the ledger is unchanged.
+        Returns None when the sender is not registered locally. That is not cached, as the user can be
+        registered (or synced from another node) without the ledger changing.
+        """
+        cached = self._validity_cache.get(transaction.hash)
+        if cached is not None and cached[0] == ledger_generation:
+            return cached[1]
+        try:
+            valid = transaction.validate(raise_exception=False)
+        except ValueError as e:
+            logging.debug("Cannot validate transaction %s: %s", transaction.hash, e)
+            return None
+        self._validity_cache[transaction.hash] = (ledger_generation, valid)
+        return valid
+
+    # -----------------
+    # Limits
+    # -----------------
+    def _check_sender_limit(self, transaction: Transaction, queued: int = 0) -> None:
+        """ Raise if the sender already has max_transactions_per_sender in the pool (plus queued ones about to be added). """
+        if not self.max_transactions_per_sender or transaction.sender_address is None or transaction.hash in self._transactions:
+            return
+        if len(self._hashes_by_sender.get(transaction.sender_address, ())) + queued >= self.max_transactions_per_sender:
+            raise PoolLimitExceededException(f"Sender already has {self.max_transactions_per_sender} transactions in the pool. Transaction {transaction.hash}")
+
+    def _is_over_limits(self) -> bool:
+        return bool(
+            (self.max_transactions and len(self._transactions) > self.max_transactions)
+            or (self.max_bytes and self._total_bytes > self.max_bytes)
+        )
+
+    def _eviction_candidate(self, protected: set[str]) -> Optional[str]:
+        """ Hash of the lowest-fee transfer, the youngest among equal fees, that is not protected. """
+        position = 0
+        while position < len(self._fee_index):
+            fee = self._fee_index[position][0]
+            end = position
+            while end < len(self._fee_index) and self._fee_index[end][0] == fee:
+                end += 1
+            for _, _, tx_hash in reversed(self._fee_index[position:end]):
+                if tx_hash not in protected and self._transactions[tx_hash].kind == TransactionType.TRANSFER:
+                    return tx_hash
+            position = end
+        return None
+
+    def _evict_over_limits(self) -> list[Transaction]:
+        """
+        Evict transactions until the pool is within max_transactions and max_bytes. Transactions the
+        fairness rules require, those marked for the block and reward transactions are never evicted.
+        """
+        if not self._is_over_limits():
+            return []
+        protected = {tx.hash for tx in self.get_required_transactions() or []} | self._transactions_marked_for_block.keys()
+        evicted = []
+        while self._is_over_limits():
+            tx_hash = self._eviction_candidate(protected)
+            if tx_hash is None:
+                break
+            evicted.append(self._pop_transaction(tx_hash))
+        if evicted:
+            logging.info("Evicted %d transactions from the full pool", len(evicted))
+        return evicted
+
+    @property
+    def generation(self) -> int:
+        return self.get_instance()._generation
+
+    def has_transaction(self, transaction: Transaction) -> bool:
+        return transaction.hash in self.get_instance()._transactions
+
+    def is_marked_for_block(self, transaction: Transaction) -> bool:
+        return transaction.hash in self.get_instance()._transactions_marked_for_block
+
+    # -----------------
+    # Balance aggregates
+    # -----------------
+    def _aggregate_transaction(self, transaction: Transaction, reverse: bool = False) -> None:
+        """ Add (or subtract) a transaction to the per-address reserved and incoming totals. """
+        if transaction.is_invalid:
+            return
+        sign = -1 if reverse else 1
+        if transaction.sender_address is not None:
+            reserved = self._reserved_by_address.get(transaction.sender_address, Decimal("0.0")) + sign * (transaction.amount + transaction.fee)
+            self._reserved_by_address[transaction.sender_address] = reserved
+        incoming = self._incoming_by_address.get(transaction.receiver_address, Decimal("0.0")) + sign * transaction.amount
+        self._incoming_by_address[transaction.receiver_address] = incoming
+
+    def _rebuild_aggregates(self) -> None:
+        self._reserved_by_address = {}
+        self._incoming_by_address = {}
+        self._tracked_pending_block_hash = None
+        for tx in self._transactions.values():
+            self._aggregate_transaction(tx)
+
+    def track_pending_block(self, block: Optional[Block]) -> None:
+        """ Count the transactions of the ledger's pending block towards the aggregates. """
+        if block is None or self._tracked_pending_block_hash == block.calculated_hash:
+            return
+        for tx in block.transactions:
+            self._aggregate_transaction(tx)
+        self._tracked_pending_block_hash = block.calculated_hash
+
+    def untrack_pending_block(self, block: Block) -> None:
+        """ Stop counting a pending block once it has been accepted or rejected. """
+        if self._tracked_pending_block_hash != block.calculated_hash:
+            return
+        for tx in block.transactions:
+            self._aggregate_transaction(tx, reverse=True)
+        self._tracked_pending_block_hash = None
+
+    def get_reserved_balance(self, address: str) -> Decimal:
+        """ Get the amount (as a negative number) the address has locked in the pool and the pending block. """
+        return -self.get_instance()._reserved_by_address.get(address, Decimal("0.0"))
+
+    def get_incoming_balance(self, address: str) -> Decimal:
+        """ Get the amount the address receives from the pool and the pending block. """
+        return self.get_instance()._incoming_by_address.get(address, Decimal("0.0"))
 
     @classmethod
     def _save(cls) -> None:
@@ -28,79 +255,190 @@ class Pool(AbstractPickableSingleton, Subscribable):
         cls._call_subscribers(None)
 
     def mark_transaction_for_block(self, transaction: Transaction) -> None:
-        if transaction in self.get_instance()._transactions_marked_for_block:
+        if transaction.hash in self.get_instance()._transactions_marked_for_block:
             return
-        self.get_instance()._transactions_marked_for_block.append(transaction)
+        self.get_instance()._transactions_marked_for_block[transaction.hash] = transaction
+        MiningJob.cancel_active("The transactions marked for the block changed.")
         self._save()
 
     def unmark_transaction_for_block(self, transaction: Transaction) -> None:
-        self.get_instance()._transactions_marked_for_block.remove(transaction)
+        del self.get_instance()._transactions_marked_for_block[transaction.hash]
+        MiningJob.cancel_active("The transactions marked for the block changed.")
         self._save()
 
     def get_transactions_marked_for_block(self) -> list[Transaction]:
-        return self.get_instance()._transactions_marked_for_block
+        return list(self.get_instance()._transactions_marked_for_block.values())
 
     def unmark_all_transaction(self):
-        self.get_instance()._transactions_marked_for_block = []
+        self.get_instance()._transactions_marked_for_block = {}
+        MiningJob.cancel_active("The transactions marked for the block changed.")
         self._save()
 
     def add_transaction(self, transaction: Transaction, raise_exception: bool = True, broadcast_to_network: bool = True) -> None:
         transaction.validate(raise_exception)
-        self.get_instance()._transactions.append(transaction)
+        pool = self.get_instance()
+        try:
+            pool._check_sender_limit(transaction)
+        except PoolLimitExceededException:
+            if raise_exception:
+                raise
+            logging.debug("Not adding transaction %s: sender limit reached", transaction.hash)
+            return
+        pool._insert_transaction(transaction)
+        evicted = pool._evict_over_limits()
         self._save()
 
+        if any(tx.hash == transaction.hash for tx in evicted):
+            if raise_exception:
+                raise PoolLimitExceededException(f"The pool is full and the fee is too low to replace another transaction. Transaction {transaction.hash}")
+            return
+
         if broadcast_to_network:
             NetworkingService.get_instance().broadcast_new_transaction(
                 transaction_payload=transaction.to_dict()
             )
 
+    def add_transactions(self, transactions: list[Transaction], raise_exception: bool = True, broadcast_to_network: bool = True, check_signature: bool = True) -> list[Transaction]:
+        """
+        Add a batch of transactions with a single save and a single network message.
+        Transfers are checked against a running balance per sender, starting from what the sender can
+        spend besides the pool and pending block, so the batch as a whole cannot overspend.
+        With raise_exception nothing is added if any transaction is invalid, otherwise invalid ones are
+        skipped. check_signature=False is for transactions whose signatures were verified already.
+        Transactions that the pool limits evict right away are not returned nor broadcast.
+        Returns the transactions that were added.
+        """
+        pool = self.get_instance()
+        available_by_sender: dict[str, Decimal] = {}
+        queued_by_sender: dict[str, int] = {}
+        accepted: list[Transaction] = []
+        batch_hashes: set[str] = set()
+        for tx in transactions:
+            if tx.hash in pool._transactions or tx.hash in batch_hashes:
+                continue
+            try:
+                tx.validate(raise_exception=True, check_signature=check_signature)
+                pool._check_sender_limit(tx, queued_by_sender.get(tx.sender_address, 0))
+                if tx.kind == TransactionType.TRANSFER:
+                    if tx.sender_address not in available_by_sender:
+                        from blockchain.ledger import Ledger
+                        available_by_sender[tx.sender_address] = (
+                            Ledger.get_instance().get_balance(tx.sender_address) + self.get_reserved_balance(tx.sender_address)
+                        )
+                    if available_by_sender[tx.sender_address] < tx.amount + tx.fee:
+                        raise InsufficientBalanceException(f"Insufficient balance for this transaction within the batch. Transaction {tx.hash}")
+                    available_by_sender[tx.sender_address] -= tx.amount + tx.fee
+            except (InvalidTransactionException, InsufficientBalanceException, ValueError):
+                if raise_exception:
+                    raise
+                logging.debug("Skipping invalid transaction %s of batch", tx.hash)
+                continue
+            accepted.append(tx)
+            batch_hashes.add(tx.hash)
+            if tx.sender_address is not None:
+                queued_by_sender[tx.sender_address] = queued_by_sender.get(tx.sender_address, 0) + 1
+
+        if not accepted:
+            return accepted
+        for tx in accepted:
+            pool._insert_transaction(tx)
+        evicted_hashes = {tx.hash for tx in pool._evict_over_limits()}
+        accepted = [tx for tx in accepted if tx.hash not in evicted_hashes]
+        self._save()
+
+        if broadcast_to_network and accepted:
+            NetworkingService.get_instance().broadcast_new_transactions(
+                transaction_payloads=[tx.to_dict() for tx in accepted]
+            )
+        return accepted
+
     def remove_transaction(self, transaction: Transaction) -> None:
-        self.get_instance()._transactions.remove(transaction)
+        if self.get_instance()._pop_transaction(transaction.hash) is None:
+            raise ValueError(f"Transaction {transaction.hash} is not in the pool.")
         self._save()
 
     def remove_transactions(self, transactions: list[Transaction], include_marked_for_block: bool = False) -> None:
-        self.get_instance()._transactions = [tx for tx in self.get_instance()._transactions if tx not in transactions]
-        if include_marked_for_block:
-            self.get_instance()._transactions_marked_for_block = [
-                tx for tx in self.get_instance()._transactions_marked_for_block if tx not in transactions
-            ]
+        pool = self.get_instance()
+        for tx in transactions:
+            pool._pop_transaction(tx.hash)
+            if include_marked_for_block:
+                pool._transactions_marked_for_block.pop(tx.hash, None)
         self._save()
 
     def get_transactions(self) -> list[Transaction]:
-        return self.get_instance()._transactions
+        return list(self.get_instance()._transactions.values())
 
     def get_transaction_without_marked_for_block(self) -> list[Transaction]:
-        return [tx for tx in self.get_instance()._transactions if tx not in self.get_instance()._transactions_marked_for_block]
+        marked = self.get_instance()._transactions_marked_for_block
+        return [tx for tx in self.get_instance()._transactions.values() if tx.hash not in marked]
 
     def get_required_transactions(self, max_timestamp: Optional[str] = None) -> Optional[list[Transaction]]:
         """
         Get all transactions from pool that need to be included as part of the fairness protocol.
+        The selection is memoized until the pool or ledger generation changes.
         """
 
-        if len(self.get_instance()._transactions) < 5:
-            return None
-
-        # Only consider normal transfer transactions for fairness selection
-        all_transactions = [
-            tx for tx in self.get_instance()._transactions
-            if tx.kind != TransactionType.MINING_REWARD and tx.validate(raise_exception=False)
-        ]
-
-        if max_timestamp is not None:
-            dt_max = datetime.fromisoformat(max_timestamp)
-            all_transactions = [
-                tx for tx in all_transactions
-                if datetime.fromisoformat(tx.timestamp) < dt_max
-            ]
-
-        if len(all_transactions) < 4:
+        pool = self.get_instance()
+        from blockchain.ledger import Ledger
+        ledger_generation = Ledger.get_instance().generation
+        cache_key = (pool._generation, ledger_generation, max_timestamp)
+        if pool._required_cache is not None and pool._required_cache[0] == cache_key:
+            required_hashes = pool._required_cache[1]
+        else:
+            required_hashes, cacheable = pool._select_required_hashes(ledger_generation, max_timestamp)
+            pool._required_cache = (cache_key, required_hashes) if cacheable else None
+
+        if required_hashes is None:
             return None
+        return [pool._transactions[tx_hash] for tx_hash in required_hashes]
 
-        oldest_tx = sorted(all_transactions, key=lambda t: t.timestamp)[:2]
-        remaining = [tx for tx in all_transactions if tx not in oldest_tx]
-        lowest_fee_tx = sorted(remaining, key=lambda t: (t.fee, t.timestamp))[:2]
-
-        return oldest_tx + lowest_fee_tx
+    def _select_required_hashes(self, ledger_generation: int, max_timestamp: Optional[str]) -> tuple[Optional[list[str]], bool]:
+        """
+        Returns the selected hashes, and whether the selection may be memoized. It may not when a
+        transaction of a sender that is not registered locally was passed over, as it can become a
+        candidate once the user is known.
+        """
+        if len(self._transactions) < 5:
+            return None, True
+
+        dt_max = datetime.fromisoformat(max_timestamp) if max_timestamp is not None else None
+        cacheable = True
+
+        # Only consider normal transfer transactions for fairness selection. Candidates are checked lazily
+        # while walking the ordered indexes, so only the transactions that end up selected get validated.
+        def is_candidate(transaction_hash: str) -> bool:
+            nonlocal cacheable
+            tx = self._transactions[transaction_hash]
+            if (
+                tx.kind == TransactionType.MINING_REWARD
+                or tx.is_invalid
+                or (dt_max is not None and datetime.fromisoformat(tx.timestamp) >= dt_max)
+            ):
+                return False
+            valid = self._is_valid_cached(tx, ledger_generation)
+            if valid is None:
+                cacheable = False
+            return bool(valid)
+
+        oldest_hashes = []
+        for _, tx_hash in self._age_index:
+            if len(oldest_hashes) == 2:
+                break
+            if is_candidate(tx_hash):
+                oldest_hashes.append(tx_hash)
+
+        lowest_fee_hashes = []
+        for _, _, tx_hash in self._fee_index:
+            if len(lowest_fee_hashes) == 2:
+                break
+            if tx_hash not in oldest_hashes and is_candidate(tx_hash):
+                lowest_fee_hashes.append(tx_hash)
+
+        # Fewer than four candidates in total
+        if len(oldest_hashes) < 2 or len(lowest_fee_hashes) < 2:
+            return None, cacheable
+
+        return oldest_hashes + lowest_fee_hashes, cacheable
 
     def validate_transaction_in_block_for_fairness(self, block: Block) -> None:
         """
@@ -115,37 +453,80 @@ class Pool(AbstractPickableSingleton, Subscribable):
         if required_transactions is None:
             raise InvalidBlockException("Not enough transactions in pool to validate fairness.")
 
+        block_tx_hashes = {tx.hash for tx in block.transactions}
         for req_tx in required_transactions:
-            if req_tx not in block.transactions:
+            if req_tx.hash not in block_tx_hashes:
                 raise InvalidBlockException("Not all required transactions are included in the block for fairness.")
 
         non_miner_txs = [tx for tx in block.transactions if tx.sender_address != block.miner_address or tx.kind != TransactionType.TRANSFER]
         if len(non_miner_txs) == 0:
-            pool_non_miner_txs = [tx for tx in self.get_instance()._transactions if tx.sender_address != block.miner_address]
-            if len(pool_non_miner_txs) > 0:
+            if any(tx.sender_address != block.miner_address for tx in self.get_instance()._transactions.values()):
                 raise InvalidBlockException("Block must include at least one transaction not created by the miner.")
 
     def remove_marked_transaction_from_pool(self):
         """ Removed the transactions marked for block from the pool and unmark them. """
-        marked_txs = self.get_instance()._transactions_marked_for_block
+        marked_txs = self.get_transactions_marked_for_block()
         self.remove_transactions(marked_txs)
         self.unmark_all_transaction()
 
     def get_invalid_transactions_for_sender_address(self, sender_address: str) -> list[Transaction]:
         """ Get all transactions from pool for the given sender address that are invalid. """
         invalid_txs = []
-        for tx in self.get_instance()._transactions:
+        for tx in self.get_instance()._transactions.values():
             if tx.sender_address == sender_address and tx.is_invalid:
                 invalid_txs.append(tx)
         return invalid_txs
 
     def mark_transaction_as_invalid(self, transaction: Transaction) -> None:
         """ Mark a transaction in the pool as invalid. """
-        for tx in self.get_instance()._transactions:
-            if tx == transaction:
-                tx.is_invalid = True
+        pool = self.get_instance()
+        tx = pool._transactions.get(transaction.hash)
+        if tx is not None and not tx.is_invalid:
+            pool._aggregate_transaction(tx, reverse=True)
+            tx.is_invalid = True
+            pool._generation += 1
         self._save()
 
+    def revalidate_senders(self, addresses: set[str]) -> list[Transaction]:
+        """
+        Re-check the pool transactions sent from the given addresses, and mark the ones that are no
+        longer valid so they are neither selected for fairness nor trip up mining. Transactions marked
+        before that pass again (e.g. after the block that spent the balance was rejected) are unmarked.
+        Returns the transactions marked invalid.
+        """
+        pool = self.get_instance()
+        from blockchain.ledger import Ledger
+        ledger_generation = Ledger.get_instance().generation
+        invalidated = []
+        restored = []
+        for address in addresses:
+            for tx_hash in list(pool._hashes_by_sender.get(address, ())):
+                tx = pool._transactions[tx_hash]
+                valid = pool._is_valid_cached(tx, ledger_generation)
+                # The sender is not known locally, nothing to check it against
+                if valid is None or valid == (not tx.is_invalid):
+                    continue
+                if valid:
+                    tx.is_invalid = False
+                    pool._aggregate_transaction(tx)
+                    restored.append(tx)
+                else:
+                    pool._aggregate_transaction(tx, reverse=True)
+                    tx.is_invalid = True
+                    invalidated.append(tx)
+
+        if invalidated or restored:
+            logging.debug("Marked %d pool transactions as invalid and %d as valid again after balance changes",
+                          len(invalidated), len(restored))
+            pool._generation += 1
+            self._save()
+        return invalidated
+
+    @classmethod
+    def handle_addresses_touched_by_block(cls, addresses: set[str]) -> None:
+        """ Subscriber of AddressesTouchedByBlockEvent. """
+        cls.get_instance().revalidate_senders(addresses)
+
     def cancel_transaction(self, transaction: Transaction) -> None:
         """ Cancel a transaction in the pool. """
         self.remove_transaction(transaction)
@@ -157,24 +538,23 @@ class Pool(AbstractPickableSingleton, Subscribable):
         transaction_data = request_data['transaction']
         log(f"Received new transaction from network: {request_data}")
         logging.debug("Received network transaction payload: %s", {k: transaction_data.get(k) for k in (list(transaction_data.keys())[:10])} if isinstance(transaction_data, dict) else transaction_data)
-        transaction = Transaction.from_dict(transaction_data)
-        for tx in self.get_instance()._transactions:
-            if tx.hash == transaction.hash:
-                logging.debug("Transaction already exists in pool, ignoring.")
-                return
-        try:
-            self.add_transaction(transaction, raise_exception=True, broadcast_to_network=False)
-        except Exception as e:
-            # Log invalid transactions from the network for observability but don't re-raise
-            logging.exception("Failed to add transaction received from network: %s", e)
+        from blockchain.admission_pipeline import AdmissionPipeline
+        AdmissionPipeline.get_instance().submit([transaction_data])
+
+    def handle_network_transactions(self, request_data: dict) -> None:
+        """ Handle a batch of transactions received from the network. """
+        transactions_data = request_data.get('transactions')
+        if not isinstance(transactions_data, list):
+            logging.warning("Ignoring malformed transaction batch from network")
             return
-        self._call_subscribers(None)
-        TransactionAddedFromNetworkEvent.dispatch()
+        logging.debug("Received batch of %d transactions from network", len(transactions_data))
+        from blockchain.admission_pipeline import AdmissionPipeline
+        AdmissionPipeline.get_instance().submit(transactions_data)
 
     def handle_network_pool_sync_request(self, request_data: dict) -> None:
         """ Handle a new transaction received from the network. """
         logging.debug("Received transaction pool sync request from network: %s", request_data)
-        for tx in self.get_instance()._transactions:
+        for tx in self.get_instance()._transactions.values():
             logging.debug("Sending transaction to requester: %s", {k: tx.to_dict().get(k) for k in (list(tx.to_dict().keys())[:10])} if isinstance(tx.to_dict(), dict) else tx.to_dict())
             NetworkingService.get_instance().broadcast_new_transaction(
                 transaction_payload=tx.to_dict()
@@ -185,7 +565,13 @@ class Pool(AbstractPickableSingleton, Subscribable):
         loaded = super().load()
         if loaded is not None:
             # Reset marked for block list on load
-            loaded._transactions_marked_for_block = []
+            loaded._transactions_marked_for_block = {}
+            loaded._rebuild_indexes()
+            loaded._rebuild_aggregates()
+            loaded._reset_caches()
+            from blockchain.ledger import Ledger
+            if Ledger._instance is not None:
+                loaded.track_pending_block(Ledger._instance.get_pending_block())
         return loaded
 
     @classmethod
@@ -196,4 +582,4 @@ class Pool(AbstractPickableSingleton, Subscribable):
 
     def get_transactions_for_address(self, address: str) -> list["Transaction"]:
         """ Get all transactions from pool for the given address (as sender or receiver). """
-        return [tx for tx in self.get_instance()._transactions if tx.sender_address == address or tx.receiver_address == address]
+        return [tx for tx in self.get_instance()._transactions.values() if tx.sender_address == address or tx.receiver_address == address]
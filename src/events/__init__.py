@@ -2,4 +2,6 @@ from .login_validation_completed_event import LoginValidationCompletedEvent
 from .block_added_from_network_event import BlockAddedFromNetworkEvent
 from .validation_added_from_network_event import ValidationAddedFromNetworkEvent
 from .transaction_added_from_network_event import TransactionAddedFromNetworkEvent
-from .genesis_block_added_from_network_event import GenesisBlockAddedFromNetworkEvent
\ No newline at end of file
+from .genesis_block_added_from_network_event import GenesisBlockAddedFromNetworkEvent
+from .merkle_proof_received_from_network_event import MerkleProofReceivedFromNetworkEvent
+from .addresses_touched_by_block_event import AddressesTouchedByBlockEvent
\ No newline at end of file
@@ -0,0 +1,7 @@
+from base.subscribable import Subscribable
+
+
+class AddressesTouchedByBlockEvent(Subscribable):
+    @classmethod
+    def dispatch(cls, addresses: set[str]):
+        cls._call_subscribers(addresses)
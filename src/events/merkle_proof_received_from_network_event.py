@@ -0,0 +1,7 @@
+from base.subscribable import Subscribable
+
+
+class MerkleProofReceivedFromNetworkEvent(Subscribable):
+    @classmethod
+    def dispatch(cls, proof):
+        cls._call_subscribers(proof)
@@ -1,2 +1,3 @@
 from .invalid_transaction_exception import InvalidTransactionException
-from .insufficient_balance_exception import InsufficientBalanceException
\ No newline at end of file
+from .insufficient_balance_exception import InsufficientBalanceException
+from .pool_limit_exceeded_exception import PoolLimitExceededException
\ No newline at end of file
@@ -0,0 +1,5 @@
+from .invalid_transaction_exception import InvalidTransactionException
+
+
+class PoolLimitExceededException(InvalidTransactionException):
+    """Exception raised when a transaction does not fit within the pool limits."""
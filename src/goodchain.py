@@ -12,13 +12,113 @@ def parse_args():
         choices=[1, 2],
     )
 
+    parser.add_argument(
+        "--write-behind-ms",
+        type=int,
+        default=250,
+        help="Coalesce ledger and pool saves to at most one write per interval (0 writes on every change)",
+    )
+
+    parser.add_argument(
+        "--mining-workers",
+        type=int,
+        default=None,
+        help="Number of processes used for proof-of-work mining (default: half the cores, at most 4)",
+    )
+
+    parser.add_argument(
+        "--pool-max-transactions",
+        type=int,
+        default=5000,
+        help="Most transactions kept in the pool; the lowest-fee ones are evicted beyond it (0 disables the limit)",
+    )
+
+    parser.add_argument(
+        "--pool-max-bytes",
+        type=int,
+        default=4 * 1024 * 1024,
+        help="Most bytes of transactions kept in the pool; the lowest-fee ones are evicted beyond it (0 disables the limit)",
+    )
+
+    parser.add_argument(
+        "--pool-max-per-sender",
+        type=int,
+        default=1000,
+        help="Most transactions a single sender may have in the pool, including payout batches (0 disables the limit)",
+    )
+
+    parser.add_argument(
+        "--cooperative-mining",
+        action="store_true",
+        help="Share proof-of-work with peer nodes: publish nonce ranges of our blocks and mine ranges of theirs",
+    )
+
+    parser.add_argument(
+        "--full-validate",
+        action="store_true",
+        help="Validate the whole chain at startup instead of only the blocks after the last validation checkpoint",
+    )
+
+    parser.add_argument(
+        "--light",
+        action="store_true",
+        help="Run as a light node: sync block headers only, checking their hashes and proof-of-work, "
+             "and confirm transactions with Merkle proofs from full nodes",
+    )
+
+    parser.add_argument(
+        "--user",
+        metavar="USERNAME",
+        help="In light mode, log in as this user (the password is prompted for) and log to the console when "
+             "transactions sent or received by the user are confirmed",
+    )
+
     return parser.parse_args()
 
+def login_light_client_user(username: str):
+    """ Log in on the console, light nodes have no UI. The user's transactions are the ones watched. """
+    from getpass import getpass
+    from exceptions.user.invalid_credentials_exception import InvalidCredentialsException
+    from services.user_service import UserService
+
+    try:
+        UserService().login(username, getpass(f"Password for {username}: "))
+    except InvalidCredentialsException as e:
+        raise SystemExit(f"Login failed: {e}")
+    return UserService.logged_in_user
+
+def run_light_client(watched_addresses: list[str]) -> None:
+    import asyncio
+    from blockchain.header_chain import HeaderChain
+    from events import MerkleProofReceivedFromNetworkEvent
+    from services import NetworkingService
+
+    header_chain = HeaderChain.get_instance()
+    MerkleProofReceivedFromNetworkEvent.subscribe(lambda proof: logging.info(
+        f"Transaction {proof.tx_hash} confirmed in block #{proof.block_number} "
+        f"({header_chain.get_confirmations(proof.tx_hash)} confirmations)"
+    ))
+
+    async def main():
+        listener = asyncio.create_task(NetworkingService.get_instance().listen())
+        header_chain.request_sync()
+        for address in watched_addresses:
+            header_chain.watch_address(address)
+        await listener
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        NetworkingService.get_instance().stop()
+        HeaderChain.flush()
+
 if __name__ == "__main__":
     args = parse_args()
 
     logging.basicConfig(
-        filename=f"goodchain_node_{args.node}.log",
+        filename=f"goodchain_light_node_{args.node}.log" if args.light else f"goodchain_node_{args.node}.log",
         level=logging.DEBUG,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
@@ -27,9 +127,45 @@ if __name__ == "__main__":
 
     logging.info(f"Starting Goodchain node {args.node}...")
 
-    NodeFileSystemService.set_node_data_directory_by_number(args.node)
-    InitializationService.initialize_application(args.node)
+    NodeFileSystemService.set_node_data_directory_by_number(args.node, light=args.light)
+    InitializationService.initialize_application(args.node, light=args.light)
+
+    if args.light:
+        # There is no UI in light mode, confirmations are followed on the console
+        console = logging.StreamHandler()
+        console.setLevel(logging.INFO)
+        console.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logging.getLogger().addHandler(console)
+
+        from blockchain.header_chain import HeaderChain
+        if args.write_behind_ms > 0:
+            HeaderChain.enable_write_behind(args.write_behind_ms)
+        user = login_light_client_user(args.user) if args.user else None
+        run_light_client([user.address] if user is not None else [])
+        raise SystemExit(0)
+
+    from blockchain import Ledger, Pool
+    if args.write_behind_ms > 0:
+        Ledger.enable_write_behind(args.write_behind_ms)
+        Pool.enable_write_behind(args.write_behind_ms)
+    Pool.max_transactions = args.pool_max_transactions
+    Pool.max_bytes = args.pool_max_bytes
+    Pool.max_transactions_per_sender = args.pool_max_per_sender
+
+    from blockchain.parallel_miner import ParallelMiner
+    ParallelMiner.workers = args.mining_workers or ParallelMiner.DEFAULT_WORKERS
+    if args.cooperative_mining:
+        from blockchain.cooperative_mining import CooperativeMiningWorker
+        from blockchain.mining_job import MiningJob
+        CooperativeMiningWorker.enabled = True
+        MiningJob.cooperative = True
 
     from ui import GoodchainApp
+    from ui.screens.startup import LedgerValidationScreen
+    LedgerValidationScreen.full_validate = args.full_validate
     app = GoodchainApp()
-    app.run()
\ No newline at end of file
+    app.run()
+
+    ParallelMiner.close_shared()
+    Ledger.flush()
+    Pool.flush()
@@ -1,5 +1,6 @@
 from .user import User
-from .block import Block, ValidationFlag
+from .merkle_tree import MerkleTree
+from .block import Block, BlockHeader, ValidationFlag
 from .transaction import Transaction
 from .wallet import Wallet
 from .abstract_hashable_model import AbstractHashableModel
\ No newline at end of file
@@ -11,12 +11,30 @@ from exceptions.mining import InvalidBlockException
 from exceptions.transaction import InvalidTransactionException, InsufficientBalanceException
 from .user import User
 from .transaction import Transaction
+from .merkle_tree import MerkleTree
+from .dto import MerkleProof
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# Blocks from this version on are hashed over their header fields only. Version 1 blocks (genesis and
+# chains stored before) also hash their full transaction list and keep doing so, see Block.canonicalize.
+HEADER_HASH_VERSION = 2
+
+
+def _canonical_header_parts(header: "Block | BlockHeader") -> tuple[str, str]:
+    """
+    Canonical form of the header fields before and after the nonce. From HEADER_HASH_VERSION on the block
+    hash covers only these, the transactions are committed to through the Merkle root, so a header alone
+    can be rehashed.
+    """
+    prefix = f"{header.number}|{header.previous_hash}|{header.timestamp}|"
+    suffix = f"|{header.miner_address}|{header.version}|{header.merkle_root}|{header.difficulty}"
+    return prefix, suffix
+
+
 class BlockStatus(Enum):
     GENESIS = "genesis"
     PENDING = "pending"
@@ -52,6 +70,101 @@ class BlockValidationResult:
     invalid_transactions: List[Transaction]
 
 
+@dataclass
+class BlockHeader:
+    """ The fields of a block without its transactions, enough to follow the chain on a light node. """
+
+    number: int
+    previous_hash: Optional[str]
+    timestamp: str
+    nonce: int
+    miner_address: Optional[str]
+    version: int
+    merkle_root: Optional[str]
+    difficulty: Optional[int]
+    calculated_hash: Optional[str]
+    mined_duration: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.__dict__.copy()
+
+    def compute_hash(self) -> Optional[str]:
+        """ None for a version 1 header of a block with transactions, its hash covers the transactions too. """
+        prefix, suffix = _canonical_header_parts(self)
+        if self.version < HEADER_HASH_VERSION:
+            if self.merkle_root is not None:
+                return None
+            suffix = f"{suffix}|TRANSACTIONS|"
+        from services import CryptographyService
+        return CryptographyService().sha256_hash(f"{prefix}{self.nonce}{suffix}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BlockHeader":
+        return cls(
+            number=data['number'],
+            previous_hash=data.get('previous_hash'),
+            timestamp=data['timestamp'],
+            nonce=data['nonce'],
+            miner_address=data.get('miner_address'),
+            version=data['version'],
+            merkle_root=data.get('merkle_root'),
+            difficulty=data.get('difficulty'),
+            calculated_hash=data.get('calculated_hash'),
+            mined_duration=data.get('mined_duration'),
+        )
+
+    def validate(self, previous_header: Optional["BlockHeader"], expected_difficulty: Optional[int] = None) -> tuple[bool, List[str]]:
+        """
+        Check the hash against the header fields, linkage to the previous header and proof-of-work.
+        Non-genesis headers need a real target: expected_difficulty is the one retargeted from the
+        headers before this one (see DifficultyService.next_difficulty).
+        The hash of a version 1 header with transactions cannot be recomputed, it is trusted as served.
+        Versions never go down, so such headers can only come before the first header-hashed block.
+        """
+        reasons: List[str] = []
+        if not isinstance(self.calculated_hash, str) or len(self.calculated_hash) != 64:
+            reasons.append("Header hash must be a SHA-256 hex digest.")
+            return False, reasons
+        if not isinstance(self.version, int):
+            reasons.append("Version must be an integer.")
+            return False, reasons
+        computed_hash = self.compute_hash()
+        if computed_hash is not None and computed_hash != self.calculated_hash:
+            reasons.append("Header hash does not match the header fields.")
+            return False, reasons
+
+        if self.number == 0:
+            if self.previous_hash is not None:
+                reasons.append("Genesis block previous_hash must be None.")
+            return not reasons, reasons
+
+        if previous_header is None:
+            reasons.append("Previous header not found.")
+        else:
+            if self.number != previous_header.number + 1:
+                reasons.append("Block number must follow the previous header.")
+            if self.previous_hash != previous_header.calculated_hash:
+                reasons.append("Previous hash does not match the previous header.")
+            if self.version < previous_header.version:
+                reasons.append("Version cannot be lower than the previous header's.")
+        if self.nonce < 0:
+            reasons.append("Nonce must be non-negative.")
+        if not isinstance(self.difficulty, int) or self.difficulty <= 0:
+            reasons.append("Difficulty must be a positive integer.")
+        elif expected_difficulty is not None and self.difficulty != expected_difficulty:
+            reasons.append("Difficulty does not match the difficulty retargeted from the chain.")
+        else:
+            try:
+                if not Block._meets_difficulty(self.calculated_hash, self.difficulty):
+                    reasons.append("Block hash does not meet difficulty target.")
+            except ValueError:
+                reasons.append("Header hash must be a SHA-256 hex digest.")
+        return not reasons, reasons
+
+    def verify_merkle_proof(self, proof: MerkleProof) -> bool:
+        return proof.block_hash == self.calculated_hash and proof.block_number == self.number and proof.verify(self.merkle_root)
+
+
 @dataclass
 class Block:
     """In-memory blockchain block structure.
@@ -72,6 +185,8 @@ class Block:
     validators: List[ValidationFlag] = field(default_factory=list)
     status: BlockStatus | None = None
     mined_duration: Optional[float] = None  # seconds; populated when PoW is implemented
+    # Merkle tree over the transactions, built on demand by get_merkle_tree and never stored
+    _merkle_tree: Optional[MerkleTree] = field(default=None, init=False, repr=False, compare=False)
 
     # Custom __init__ retained (dataclass will not auto-generate one)
     def __init__(
@@ -93,15 +208,13 @@ class Block:
         self.version = version
         self.difficulty = difficulty
         self.transactions = transactions
+        self._merkle_tree = None
         self.validators = []
         self.status = BlockStatus.PENDING
         self.mined_duration = None
 
         # Compute merkle root from transaction hashes
-        tx_hashes = [tx.to_hash() for tx in transactions]
-        from services import CryptographyService
-        crypto_service = CryptographyService()
-        self.merkle_root = crypto_service.find_merkle_root_for_list(tx_hashes)
+        self.merkle_root = self.compute_merkle_root()
 
         self.calculated_hash = calculated_hash  # may be recomputed after full initialization
 
@@ -154,6 +267,28 @@ class Block:
         miner: User,
         transactions: list[Transaction]
     ) -> "Block":
+        block = cls.create_block_template(miner, transactions)
+
+        # Proof-of-Work: find nonce so that hash meets difficulty target
+        from time import perf_counter
+        from blockchain.parallel_miner import ParallelMiner
+        parallel_miner = ParallelMiner.get_shared()
+        parallel_miner.start()
+        start = perf_counter()
+        parallel_miner.mine(block)
+        # Only the nonce search is timed, recorded in the block for display
+        block.mined_duration = perf_counter() - start
+
+        # Do not alter ledger/pool here; return the mined block for caller to handle
+        return block
+
+    @classmethod
+    def create_block_template(
+        cls,
+        miner: User,
+        transactions: list[Transaction]
+    ) -> "Block":
+        """ Validate the transactions and build the next block, including the mining reward, ready for proof-of-work. """
         # Validate all transactions first (user transactions only)
         for tx in transactions:
             try:
@@ -185,37 +320,18 @@ class Block:
         block = cls(
             number=previous_block.number + 1,
             miner_address=miner.address,
-            version=1,
+            version=HEADER_HASH_VERSION,
             difficulty=current_difficulty,
             previous_hash=previous_block.calculated_hash,
             nonce=0,
-            transactions=transactions
+            transactions=list(transactions)
         )
 
         # Append mining reward transaction before PoW
         reward_tx = Transaction.create_mining_reward(miner.address, transactions)
-        block.transactions = [*transactions, reward_tx]
-        # Recompute merkle root after including reward
-        from services import CryptographyService
-        crypto_service = CryptographyService()
-        block.merkle_root = crypto_service.find_merkle_root_for_list([tx.to_hash() for tx in block.transactions])
-
-        # Proof-of-Work: find nonce so that hash meets difficulty target
-        from time import perf_counter
-        start = perf_counter()
-        while True:
-            candidate_hash = block.compute_hash()
-            if cls._meets_difficulty(candidate_hash, block.difficulty or 0):
-                block.calculated_hash = candidate_hash
-                break
-            block.nonce += 1
-        duration = perf_counter() - start
-        block.mined_duration = duration
-
-        # Update difficulty stats for future blocks
-        DifficultyService.update_time_to_mine(duration)
-
-        # Do not alter ledger/pool here; return the mined block for caller to handle
+        block.transactions.append(reward_tx)
+        # Recompute merkle root after including reward, only the reward's path is hashed
+        block.merkle_root = block.compute_merkle_root()
         return block
 
     @classmethod
@@ -237,15 +353,91 @@ class Block:
     # Canonical / Hash
     # -----------------
     def canonicalize(self) -> str:
-        transactions = map(lambda tx: tx.canonicalize_with_signature_and_hash(), self.transactions)
-        canonicalized_transactions = ":".join(transactions)
-        return f"{self.number}|{self.previous_hash}|{self.timestamp}|{self.nonce}|{self.miner_address}|{self.version}|{self.merkle_root}|{self.difficulty}|TRANSACTIONS|{canonicalized_transactions}"
+        prefix, suffix = self._canonical_parts_around_nonce()
+        return f"{prefix}{self.nonce}{suffix}"
+
+    def _canonical_parts_around_nonce(self) -> tuple[str, str]:
+        prefix, suffix = _canonical_header_parts(self)
+        if self.version < HEADER_HASH_VERSION:
+            transactions = map(lambda tx: tx.canonicalize_with_signature_and_hash(), self.transactions)
+            suffix = f"{suffix}|TRANSACTIONS|{':'.join(transactions)}"
+        return prefix, suffix
+
+    def split_canonical_around_nonce(self) -> tuple[bytes, bytes]:
+        """ The encoded canonical form before and after the nonce, the only part that changes while mining. """
+        prefix, suffix = self._canonical_parts_around_nonce()
+        return prefix.encode("ascii"), suffix.encode("ascii")
+
+    @staticmethod
+    def difficulty_target_bytes(difficulty: int) -> Optional[bytes]:
+        """ Difficulty as a 32-byte big-endian target to compare raw digests against, None if every hash meets it. """
+        if difficulty == 0 or difficulty >= 2 ** 256:
+            return None
+        return difficulty.to_bytes(32, "big")
 
     def compute_hash(self) -> str:
         from services import CryptographyService
         crypto_service = CryptographyService()
         return crypto_service.sha256_hash(self.canonicalize())
 
+    # -----------------
+    # Merkle tree
+    # -----------------
+    def get_merkle_tree(self) -> MerkleTree:
+        """ Merkle tree over the current transactions, kept on the block and only re-hashed where they changed. """
+        tx_hashes = [tx.to_hash() for tx in self.transactions]
+        if self._merkle_tree is None:
+            self._merkle_tree = MerkleTree(tx_hashes)
+        else:
+            self._merkle_tree.sync(tx_hashes)
+        return self._merkle_tree
+
+    def compute_merkle_root(self) -> Optional[str]:
+        try:
+            return self.get_merkle_tree().root
+        except ValueError:
+            # Transaction hashes that are not hex digests (e.g. from a malformed peer block)
+            self._merkle_tree = None
+            from services import CryptographyService
+            crypto_service = CryptographyService()
+            return crypto_service.find_merkle_root_for_list([tx.to_hash() for tx in self.transactions])
+
+    def get_header(self) -> BlockHeader:
+        return BlockHeader(
+            number=self.number,
+            previous_hash=self.previous_hash,
+            timestamp=self.timestamp,
+            nonce=self.nonce,
+            miner_address=self.miner_address,
+            version=self.version,
+            merkle_root=self.merkle_root,
+            difficulty=self.difficulty,
+            calculated_hash=self.calculated_hash,
+            mined_duration=self.mined_duration,
+        )
+
+    def get_merkle_proof(self, tx_hash: str) -> Optional[MerkleProof]:
+        """ Inclusion proof for the transaction with the given hash, None if it is not in this block. """
+        try:
+            tree = self.get_merkle_tree()
+        except ValueError:
+            return None
+        index = tree.index_of(tx_hash)
+        if index is None:
+            return None
+        return MerkleProof(tx_hash=tx_hash, block_number=self.number, block_hash=self.calculated_hash, branch=tree.get_branch(index))
+
+    def verify_merkle_proof(self, proof: MerkleProof) -> bool:
+        """ Check a proof against this block's header, the transactions themselves are not needed. """
+        return proof.block_hash == self.calculated_hash and proof.verify(self.merkle_root)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The cached tree is rebuilt on demand, it is not worth storing with every block. Loaded
+        # blocks fall back to the field's class default of None.
+        state = self.__dict__.copy()
+        state.pop('_merkle_tree', None)
+        return state
+
     # -----------------
     # Validation helpers (Phase 1/2)
     # -----------------
@@ -267,6 +459,8 @@ class Block:
                     reasons.append("previous_hash does not match previous block hash.")
                 if self.number != previous_block.number + 1:
                     reasons.append("Block number not sequential.")
+                if self.version < previous_block.version:
+                    reasons.append("Block version cannot be lower than the previous block version.")
             # Transaction rules (non-genesis): 5-10 user transfers + exactly 1 mining reward
             try:
                 from models.enum import TransactionType
@@ -301,10 +495,13 @@ class Block:
             if self.difficulty is None or self.difficulty < 0:
                 reasons.append("Difficulty must be a non-negative integer.")
 
+        # Transaction hash integrity: the Merkle root (and through it the block hash) is built from the
+        # hashes the transactions claim, so each must match the transaction's content
+        if any(not tx.has_valid_hash() for tx in self.transactions):
+            reasons.append("Transaction hash does not match its content.")
+
         # Merkle root integrity
-        from services import CryptographyService
-        crypto_service = CryptographyService()
-        recomputed_merkle = crypto_service.find_merkle_root_for_list([tx.to_hash() for tx in self.transactions])
+        recomputed_merkle = self.compute_merkle_root()
         if recomputed_merkle != self.merkle_root:
             reasons.append("Merkle root mismatch.")
 
@@ -320,11 +517,18 @@ class Block:
 
         return (len(reasons) == 0, reasons)
 
-    def validate_transactions(self) -> tuple[bool, List[str], List[Transaction]]:
+    def validate_transactions(self, invalid_signatures: Optional[set[str]] = None) -> tuple[bool, List[str], List[Transaction]]:
+        """ When invalid_signatures (transaction hashes) is given, signatures were already verified elsewhere. """
         reasons: List[str] = []
         invalid: List[Transaction] = []
         for tx in self.transactions:
-            if not tx.validate(raise_exception=False):
+            if not tx.has_valid_hash():
+                valid = False
+            elif invalid_signatures is None:
+                valid = tx.validate(raise_exception=False)
+            else:
+                valid = tx.validate(raise_exception=False, check_signature=False) and tx.hash not in invalid_signatures
+            if not valid:
                 invalid.append(tx)
         if invalid:
             reasons.append(f"{len(invalid)} invalid transactions found.")
@@ -369,6 +573,7 @@ class Block:
 
     def to_dict(self) -> Dict[str, Any]:
         data = self.__dict__.copy()
+        data.pop('_merkle_tree', None)
         data['validators'] = [vf.__dict__ for vf in self.validators]
         if isinstance(self.status, BlockStatus):
             data['status'] = self.status.value
@@ -7,4 +7,9 @@ class FilesAndDirectories:
     DATABASE_SCRIPTS_DIR_NAME = "database_scripts"
     USERS_DB_FILE_NAME = "users.sqlite3"
     POOL_FILE_NAME = "pool.pkl"
-    LEDGER_FILE_NAME = "ledger.pkl"
\ No newline at end of file
+    LEDGER_FILE_NAME = "ledger.pkl"
+    HEADER_CHAIN_FILE_NAME = "headerchain.pkl"
+    BLOCK_INDEX_FILE_NAME = "blocks.idx"
+    BLOCK_SEGMENT_FILE_NAME_FORMAT = "blocks_{:05d}.seg"
+    VALIDATION_CHECKPOINT_FILE_NAME = "validation_checkpoint.json"
+    LEDGER_INDEX_SNAPSHOT_FILE_NAME = "ledger_indexes.pkl"
@@ -1 +1,3 @@
-from .ui_alert import UIAlert
\ No newline at end of file
+from .ui_alert import UIAlert
+from .mining_progress import MiningProgress
+from .merkle_proof import MerkleProof
\ No newline at end of file
@@ -0,0 +1,35 @@
+from typing import Any, Optional
+
+from models.merkle_tree import MerkleTree
+
+
+class MerkleProof:
+    """ Proof that a transaction is part of a block, checked against the block's Merkle root. """
+
+    def __init__(self, tx_hash: str, block_number: int, block_hash: str, branch: list[tuple[str, str]]):
+        self.tx_hash = tx_hash
+        self.block_number = block_number
+        self.block_hash = block_hash
+        # (sibling hash, side) pairs from the transaction up to the top of the tree
+        self.branch = branch
+
+    def verify(self, merkle_root: Optional[str]) -> bool:
+        """ Whether the proof holds for the given root, which should come from a trusted block header. """
+        return MerkleTree.verify_branch(self.tx_hash, self.branch, merkle_root)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "tx_hash": self.tx_hash,
+            "block_number": self.block_number,
+            "block_hash": self.block_hash,
+            "branch": [[sibling_hash, side] for sibling_hash, side in self.branch],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MerkleProof":
+        return cls(
+            tx_hash=data["tx_hash"],
+            block_number=data["block_number"],
+            block_hash=data["block_hash"],
+            branch=[(sibling_hash, side) for sibling_hash, side in data.get("branch", [])],
+        )
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from models.enum import MiningJobState
+
+
+class MiningProgress:
+
+    def __init__(self, state: MiningJobState, attempts: int, elapsed_seconds: float, attempts_per_second: float, expected_seconds_to_solution: Optional[float]):
+        self.state = state
+        self.attempts = attempts
+        self.elapsed_seconds = elapsed_seconds
+        self.attempts_per_second = attempts_per_second
+        # Expected time until a solution at the current rate, None until a rate is known
+        self.expected_seconds_to_solution = expected_seconds_to_solution
@@ -1,2 +1,3 @@
 from .transaction_type import  TransactionType
-from .alert_type import AlertType
\ No newline at end of file
+from .alert_type import AlertType
+from .mining_job_state import MiningJobState
\ No newline at end of file
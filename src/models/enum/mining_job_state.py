@@ -0,0 +1,8 @@
+from enum import Enum
+
+class MiningJobState(Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SOLVED = 'solved'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional
+
+
+class MerkleTree:
+    """
+    Merkle tree over transaction hashes that keeps every level, so appending or replacing a leaf
+    only re-hashes the path from that leaf to the top (O(log n)) instead of the whole tree.
+
+    Nodes are held as raw 32-byte digests. The roots are identical to
+    CryptographyService.find_merkle_root_for_list: a parent is the SHA-256 of the hex strings of
+    its two children concatenated, an odd level pairs its last node with itself, and the root is
+    the SHA-256 of the hex string of the top node (for a single leaf: of the leaf itself).
+    """
+
+    def __init__(self, leaf_hashes: Iterable[str] = ()):
+        self._leaf_hashes: list[str] = []
+        self._levels: list[list[bytes]] = [[]]
+        for leaf_hash in leaf_hashes:
+            self._leaf_hashes.append(leaf_hash)
+            self._levels[0].append(self._to_digest(leaf_hash))
+        self._build()
+
+    @staticmethod
+    def _to_digest(leaf_hash: str) -> bytes:
+        digest = bytes.fromhex(leaf_hash)
+        # Nodes are combined through their lowercase hex form, which must give back the leaf
+        if digest.hex() != leaf_hash:
+            raise ValueError(f"Merkle leaves must be lowercase hex digests, got {leaf_hash!r}.")
+        return digest
+
+    @staticmethod
+    def _combine(left: bytes, right: bytes) -> bytes:
+        return hashlib.sha256((left.hex() + right.hex()).encode()).digest()
+
+    def _parent(self, level: list[bytes], index: int) -> bytes:
+        """ Parent of the pair that level[index] belongs to. """
+        left = index - index % 2
+        right = left + 1 if left + 1 < len(level) else left
+        return self._combine(level[left], level[right])
+
+    def _build(self) -> None:
+        del self._levels[1:]
+        level = self._levels[0]
+        while len(level) > 1:
+            level = [self._parent(level, index) for index in range(0, len(level), 2)]
+            self._levels.append(level)
+
+    def _rehash_path(self, index: int) -> None:
+        """ Recompute the ancestors of leaf `index`, adding a level when the tree grew taller. """
+        depth = 0
+        while len(self._levels[depth]) > 1:
+            level = self._levels[depth]
+            if depth + 1 == len(self._levels):
+                self._levels.append([])
+            parents = self._levels[depth + 1]
+            parent_index = index // 2
+            parent = self._parent(level, index)
+            if parent_index < len(parents):
+                parents[parent_index] = parent
+            else:
+                parents.append(parent)
+            index = parent_index
+            depth += 1
+
+    def __len__(self) -> int:
+        return len(self._leaf_hashes)
+
+    @property
+    def leaf_hashes(self) -> list[str]:
+        return list(self._leaf_hashes)
+
+    @property
+    def levels(self) -> list[list[bytes]]:
+        """ Every level of the tree, leaves first and the top node last. """
+        return self._levels
+
+    @property
+    def root(self) -> Optional[str]:
+        if not self._leaf_hashes:
+            return None
+        return hashlib.sha256(self._levels[-1][0].hex().encode()).hexdigest()
+
+    def index_of(self, leaf_hash: str) -> Optional[int]:
+        try:
+            return self._leaf_hashes.index(leaf_hash)
+        except ValueError:
+            return None
+
+    def get_branch(self, index: int) -> list[tuple[str, str]]:
+        """
+        Inclusion proof for leaf `index`: the sibling of each node on its path to the top, as
+        (sibling hash, side the sibling is on), with side "left" or "right".
+        """
+        if not 0 <= index < len(self._leaf_hashes):
+            raise IndexError(f"Merkle leaf index {index} out of range.")
+        branch = []
+        for level in self._levels[:-1]:
+            sibling = index ^ 1
+            if sibling >= len(level):
+                # Last node of an odd level is paired with itself
+                sibling = index
+            branch.append((level[sibling].hex(), "left" if sibling < index else "right"))
+            index //= 2
+        return branch
+
+    @classmethod
+    def compute_root_from_branch(cls, leaf_hash: str, branch: list[tuple[str, str]]) -> str:
+        """ Root implied by a leaf and its branch, raises ValueError for malformed input. """
+        node = cls._to_digest(leaf_hash)
+        for sibling_hash, side in branch:
+            sibling = cls._to_digest(sibling_hash)
+            if side == "left":
+                node = cls._combine(sibling, node)
+            elif side == "right":
+                node = cls._combine(node, sibling)
+            else:
+                raise ValueError(f"Unknown Merkle branch side {side!r}.")
+        return hashlib.sha256(node.hex().encode()).hexdigest()
+
+    @classmethod
+    def verify_branch(cls, leaf_hash: str, branch: list[tuple[str, str]], merkle_root: Optional[str]) -> bool:
+        if merkle_root is None:
+            return False
+        try:
+            return cls.compute_root_from_branch(leaf_hash, branch) == merkle_root
+        except (ValueError, TypeError):
+            return False
+
+    def append(self, leaf_hash: str) -> None:
+        self._levels[0].append(self._to_digest(leaf_hash))
+        self._leaf_hashes.append(leaf_hash)
+        self._rehash_path(len(self._leaf_hashes) - 1)
+
+    def update(self, index: int, leaf_hash: str) -> None:
+        if not 0 <= index < len(self._leaf_hashes):
+            raise IndexError(f"Merkle leaf index {index} out of range.")
+        self._levels[0][index] = self._to_digest(leaf_hash)
+        self._leaf_hashes[index] = leaf_hash
+        self._rehash_path(index)
+
+    def sync(self, leaf_hashes: list[str]) -> None:
+        """
+        Bring the tree in line with the given leaves, re-hashing only what changed: new leaves at
+        the end are appended and changed leaves updated. A shrunken list rebuilds the tree.
+        """
+        if len(leaf_hashes) < len(self._leaf_hashes):
+            self.__init__(leaf_hashes)
+            return
+        for index, leaf_hash in enumerate(leaf_hashes):
+            if index >= len(self._leaf_hashes):
+                self.append(leaf_hash)
+            elif self._leaf_hashes[index] != leaf_hash:
+                self.update(index, leaf_hash)
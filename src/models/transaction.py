@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from decimal import Decimal, ROUND_DOWN
 
@@ -44,7 +44,13 @@ class Transaction(AbstractHashableModel):
             sender_address: Optional[str] = None,
             sender_public_key: Optional[str] = None,
             sender_signature: Optional[str] = None,
+            transaction_hash: Optional[str] = None,
+            timestamp: Optional[str] = None,
     ):
+        """
+        transaction_hash is only given when deserializing; it is taken as is, see has_valid_hash.
+        timestamp defaults to now.
+        """
         from services import CryptographyService
         cryptography_service = CryptographyService()
         self.cryptography_service = cryptography_service
@@ -56,11 +62,11 @@ class Transaction(AbstractHashableModel):
         self.sender_address = sender_address
         self.sender_public_key = sender_public_key
         self.sender_signature = sender_signature
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = timestamp or datetime.now(timezone.utc).isoformat()
         self.is_invalid = False
 
         # Important that other fields are set before id generation
-        self._hash = self.cryptography_service.sha256_hash(self.canonicalize())
+        self._hash = transaction_hash or self.cryptography_service.sha256_hash(self.canonicalize())
 
     def to_hash(self) -> str:
         return self._hash
@@ -117,6 +123,33 @@ class Transaction(AbstractHashableModel):
 
         return transaction
 
+    @classmethod
+    def create_many(
+            cls,
+            sender: User,
+            transfers: list[tuple[str, Decimal, Decimal]],
+    ) -> list[Transaction]:
+        """
+        Create and sign a transfer for every (receiver address, amount, fee), parsing the sender's key once.
+        The timestamps are a microsecond apart, so identical transfers are still distinct transactions.
+        """
+        created_at = datetime.now(timezone.utc)
+        transactions = [
+            Transaction(
+                sender_address=sender.address,
+                sender_public_key=sender.public_key,
+                receiver_address=receiver_address,
+                amount=amount,
+                fee=fee,
+                timestamp=(created_at + timedelta(microseconds=offset)).isoformat(),
+            )
+            for offset, (receiver_address, amount, fee) in enumerate(transfers)
+        ]
+        signatures = sender.sign_many([transaction.canonicalize().encode() for transaction in transactions])
+        for transaction, signature in zip(transactions, signatures):
+            transaction.sender_signature = signature
+        return transactions
+
     @classmethod
     def create_mining_reward(
             cls,
@@ -161,11 +194,12 @@ class Transaction(AbstractHashableModel):
             raise ValueError("Sender signature is not set.")
         return f"{self.canonicalize()}|{self.sender_signature}|{self.hash}"
 
-    def validate(self, raise_exception: bool = True, include_reserved_balance: bool = False) -> bool:
-        """ Validates the transaction content and signature. Raises exception if invalid. """
+    def validate(self, raise_exception: bool = True, include_reserved_balance: bool = False, check_signature: bool = True) -> bool:
+        """ Validates the transaction content and signature. Raises exception if invalid.
+            check_signature=False skips only the signature verification, for callers that verified it separately. """
         match self.kind:
             case TransactionType.TRANSFER:
-                return self._validate_transfer(raise_exception, include_reserved_balance)
+                return self._validate_transfer(raise_exception, include_reserved_balance, check_signature)
             case TransactionType.MINING_REWARD:
                 return self._validate_mining_reward()
             case TransactionType.SIGNUP_REWARD:
@@ -173,7 +207,7 @@ class Transaction(AbstractHashableModel):
             case _:
                 raise ValueError(f"Unknown transaction type: {self.kind}")
 
-    def _validate_transfer(self, raise_exception: bool = True, include_reserved_balance: bool = False) -> bool:
+    def _validate_transfer(self, raise_exception: bool = True, include_reserved_balance: bool = False, check_signature: bool = True) -> bool:
         # TODO Mark transaction as invalid when necessary
 
         sender_wallet = Wallet.from_address(self.sender_address) if self.sender_address else None
@@ -208,19 +242,25 @@ class Transaction(AbstractHashableModel):
                 raise InvalidTransactionException(f"Transaction signature is missing. Transaction {self.hash}")
             return False
 
-        valid = self.cryptography_service.validate_signature(
-            message=self.canonicalize(),
-            signature_b64=signature,
-            public_key_pem=senders_public_key
-        )
-
-        if not valid:
+        if check_signature and not self.has_valid_signature():
             if raise_exception:
                 raise InvalidTransactionException(f"Invalid transaction signature. Transaction {self.hash}")
             return False
 
         return True
 
+    def has_valid_hash(self) -> bool:
+        """ Check the hash against the transaction content, for transactions deserialized with a given hash. """
+        return self.cryptography_service.sha256_hash(self.canonicalize()) == self._hash
+
+    def has_valid_signature(self) -> bool:
+        """ Verify the sender's signature over the transaction content. Does not touch any ledger state. """
+        return self.cryptography_service.validate_signature(
+            message=self.canonicalize(),
+            signature_b64=self.sender_signature,
+            public_key_pem=self.sender_public_key
+        )
+
     def _validate_mining_reward(self) -> bool:
         """Mining reward must be system-generated: no sender, zero fee, amount >= 50 and no signature requirement."""
         from decimal import Decimal
@@ -283,8 +323,8 @@ class Transaction(AbstractHashableModel):
             sender_address=data.get("sender_address"),
             sender_public_key=data.get("sender_public_key"),
             sender_signature=data.get("sender_signature"),
+            transaction_hash=data["hash"],
         )
-        transaction._hash = data["hash"]
         transaction.timestamp = data["timestamp"]
         transaction.is_invalid = data.get("is_invalid", False)
         return transaction
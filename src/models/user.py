@@ -43,6 +43,8 @@ class User:
     key_type: str
     recovery_phrase: Optional[str] = None
     created_at: str = field(default_factory=_now_iso)
+    # Parsed private key, cached by get_signing_key; not part of the stored user
+    _signing_key: Optional[Ed25519PrivateKey] = field(default=None, init=False, repr=False, compare=False)
 
     # ----------------------------
     # Creation & password handling
@@ -170,17 +172,32 @@ class User:
     # ----------
     # Signatures
     # ----------
+    def get_signing_key(self) -> Ed25519PrivateKey:
+        """Parsed private key, kept on the user after the first use (until forget_signing_key)."""
+        if self._signing_key is None:
+            self._signing_key = serialization.load_pem_private_key(
+                self.private_key.encode("ascii"), password=None
+            )
+        return self._signing_key
+
+    def forget_signing_key(self) -> None:
+        """Drop the parsed private key, e.g. when the user logs out."""
+        self._signing_key = None
+
     def sign(self, message: bytes) -> str:
         """Sign a message using the user's private Ed25519 key. Returns base64 signature."""
-        private_key_obj = serialization.load_pem_private_key(
-            self.private_key.encode("ascii"), password=None
-        )
-        signature = private_key_obj.sign(message)
+        signature = self.get_signing_key().sign(message)
         return base64.b64encode(signature).decode("ascii")
 
+    def sign_many(self, messages: list[bytes]) -> list[str]:
+        """Sign several messages with a single lookup of the private key. Returns base64 signatures."""
+        private_key_obj = self.get_signing_key()
+        return [base64.b64encode(private_key_obj.sign(message)).decode("ascii") for message in messages]
+
     def verify(self, message: bytes, signature_b64: str) -> bool:
         """Verify a signature against the user's public Ed25519 key."""
-        public_key_obj = serialization.load_pem_public_key(self.public_key.encode("ascii"))
+        from services import CryptographyService
+        public_key_obj = CryptographyService().load_public_key(self.public_key)
         try:
             signature = base64.b64decode(signature_b64.encode("ascii"))
             public_key_obj.verify(signature, message)
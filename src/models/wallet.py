@@ -42,45 +42,16 @@ class Wallet:
         """
         Get the balance of this wallet.
         """
-        from blockchain import Ledger, Pool
-        ledger = Ledger.get_instance()
-        balance = Decimal("0.0")
-
-        # Traverse all blocks and transactions to calculate balance
-        for block in ledger.get_all_blocks():
-            from models.block import BlockStatus
-            if block.status != BlockStatus.ACCEPTED:
-                continue
-            for transaction in block.transactions:
-                if transaction.receiver_address == self.address:
-                    balance += transaction.amount
-                if transaction.sender_address == self.address:
-                    balance -= (transaction.amount + transaction.fee)
-
-        return balance
+        from blockchain import Ledger
+        return Ledger.get_instance().get_balance(self.address)
 
     @property
     def reserved_balance(self) -> Decimal:
         """
         Get the reserved balance of this wallet (amount locked in pending transactions).
         """
-        balance = Decimal("0.0")
-
-        from blockchain import Ledger, Pool
-        ledger = Ledger.get_instance()
-        pending_block = ledger.get_pending_block()
-        if pending_block is not None:
-            for transaction in pending_block.transactions:
-                if transaction.sender_address == self.address:
-                    balance -= (transaction.amount + transaction.fee)
-
-
-        pool = Pool.get_instance()
-        for transaction in pool.get_transactions():
-            if transaction.sender_address == self.address:
-                balance -= (transaction.amount + transaction.fee)
-
-        return balance
+        from blockchain import Pool
+        return Pool.get_instance().get_reserved_balance(self.address)
 
     @property
     def spendable_balance(self) -> Decimal:
@@ -94,19 +65,5 @@ class Wallet:
         """
         Get the unconfirmed balance of this wallet from the transactions in the pool and unconfirmed blocks.
         """
-        balance = Decimal("0.0")
-
-        from blockchain import Ledger, Pool
-        ledger = Ledger.get_instance()
-        pending_block = ledger.get_pending_block()
-        if pending_block is not None:
-            for transaction in pending_block.transactions:
-                if transaction.receiver_address == self.address:
-                    balance += transaction.amount
-
-        pool = Pool.get_instance()
-        for transaction in pool.get_transactions():
-            if transaction.receiver_address == self.address:
-                balance += transaction.amount
-
-        return balance
+        from blockchain import Pool
+        return Pool.get_instance().get_incoming_balance(self.address)
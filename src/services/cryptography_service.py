@@ -1,9 +1,32 @@
 import base64
+import functools
 import hashlib
-from typing import Optional
+from typing import Any, Optional
 
 from cryptography.hazmat.primitives import serialization
 
+# Bounds of the caches below, shared by every CryptographyService instance and thread
+PUBLIC_KEY_CACHE_SIZE = 1024
+SIGNATURE_CACHE_SIZE = 16384
+
+
+@functools.lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def _load_public_key(public_key_pem: str):
+    return serialization.load_pem_public_key(public_key_pem.encode("ascii"))
+
+
+@functools.lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def _verify_signature(message: str, signature_b64: str, public_key_pem: str) -> bool:
+    # Keyed on the full message rather than a transaction hash, which peers could pair with other content
+    try:
+        # A malformed key makes the signature invalid rather than failing the caller
+        public_key_obj = _load_public_key(public_key_pem)
+        signature = base64.b64decode(signature_b64.encode("ascii"))
+        public_key_obj.verify(signature, message.encode("ascii"))
+        return True
+    except:
+        return False
+
 
 class CryptographyService:
 
@@ -12,14 +35,28 @@ class CryptographyService:
         return hashlib.sha256(data.encode('ascii')).hexdigest()
 
     def validate_signature(self, message: str, signature_b64: str, public_key_pem: str) -> bool:
-        public_key_obj = serialization.load_pem_public_key(public_key_pem.encode("ascii"))
+        """
+        Verify a signature. Outcomes are cached, as the same transaction is verified on pool admission,
+        mining, block validation and chain validation; parsed public keys are cached separately.
+        """
+        return _verify_signature(message, signature_b64, public_key_pem)
+
+    def load_public_key(self, public_key_pem: str):
+        """ Parse a PEM public key, reusing the parsed key object for PEMs seen recently. """
+        return _load_public_key(public_key_pem)
+
+    @staticmethod
+    def get_cache_stats() -> dict[str, dict[str, Any]]:
+        """ Hits, misses and sizes of the public key and signature caches. """
+        return {
+            "public_keys": _load_public_key.cache_info()._asdict(),
+            "signatures": _verify_signature.cache_info()._asdict(),
+        }
 
-        try:
-            signature = base64.b64decode(signature_b64.encode("ascii"))
-            public_key_obj.verify(signature, message.encode("ascii"))
-            return True
-        except:
-            return False
+    @staticmethod
+    def clear_caches() -> None:
+        _load_public_key.cache_clear()
+        _verify_signature.cache_clear()
 
     def find_merkle_root_for_list(self, data_items: list[str]) -> Optional[str]:
         """Builds a Merkle tree and returns the root hash."""
@@ -32,7 +69,7 @@ class CryptographyService:
 
         # Ensure even number of items by duplicating the last if odd number of items
         if len(data_items) % 2 != 0:
-            data_items.append(data_items[-1])
+            data_items = [*data_items, data_items[-1]]
 
         # Hash and pair up the data items recursively
         next_level = []
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Deque, Optional
+from typing import Deque, Optional, Sequence, TYPE_CHECKING
 from collections import deque
+from datetime import datetime
 import math
 
+if TYPE_CHECKING:
+    from models import Block, BlockHeader
+
 
 # Max target = 2^256 - 1 (easiest difficulty)
 MAX_TARGET = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
@@ -15,6 +19,7 @@ MAX_TARGET = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
 class DifficultyConfig:
     target_time: float = 15       # seconds (ideal time to mine a block)
     window_size: int = 10            # number of recent samples to average
+    block_spacing: float = 180      # seconds consecutive blocks must be apart (see Ledger.submit_block), not mining time
     # Starting difficulty (target). Max_Target = Easiest. Default is halfway.
     default_difficulty: int = 0xd3d3340d5bc9a0000000000000000000000000000000000000000000000
 
@@ -27,21 +32,91 @@ class DifficultyService:
     """
     Static utility that tracks recent mining times and computes a recommended
     difficulty (target) based on the current window average.
+
+    The state is derived from the accepted chain: the Ledger records every accepted block,
+    and after a reload or reorganisation the state is rebuilt from the last window_size + 1 blocks.
+    Mining times are taken from the hashed block timestamps (see block_time), never from
+    mined_duration, which is not part of the hash. The target for the next block is therefore
+    the same on every node with the same chain.
     """
 
     cfg = DifficultyConfig()
     state = DifficultyState(times=deque(maxlen=cfg.window_size))
     current_difficulty = cfg.default_difficulty
 
+    @classmethod
+    def reset(cls) -> None:
+        cls.state = DifficultyState(times=deque(maxlen=cls.cfg.window_size))
+        cls.current_difficulty = cls.cfg.default_difficulty
+
+    @classmethod
+    def record_block(cls, block: "Block", previous: Optional["Block"]) -> None:
+        """ Retarget after an accepted block, starting from the target the block was mined at. """
+        cls.record_block_time(block.difficulty, cls.block_time(previous, block))
+
+    @classmethod
+    def record_block_time(cls, difficulty: Optional[int], block_time: Optional[float]) -> None:
+        """ Retarget after a block mined at the given target in block_time seconds (None when not known). """
+        # Genesis (and legacy blocks) carry difficulty 0, meaning "no target"; start from the default then
+        cls.current_difficulty = difficulty if difficulty else cls.cfg.default_difficulty
+        if block_time is not None:
+            cls.update_time_to_mine(block_time)
+
+    @classmethod
+    def rebuild_from_blocks(cls, blocks: list["Block"]) -> None:
+        """ Derive the state from accepted blocks (oldest first); only the last window_size + 1 are needed. """
+        cls.reset()
+        recent = blocks[-(cls.cfg.window_size + 1):]
+        for previous, block in zip([None, *recent[:-1]], recent):
+            cls.record_block(block, previous)
+
     @classmethod
     def update_time_to_mine(cls, mining_time: float) -> None:
-        if not (math.isfinite(mining_time) and mining_time > 0):
+        if not cls._is_valid_time(mining_time):
             return
         cls.state.times.append(mining_time)
+        cls.current_difficulty = cls._retarget(cls.current_difficulty, cls.state.times)
 
-        avg_time = cls._avg_time()
-        if avg_time is None:
-            return
+    @classmethod
+    def next_difficulty(cls, blocks: Sequence["Block | BlockHeader"]) -> int:
+        """
+        Target for the block after the given accepted blocks or headers (oldest first), the same one
+        rebuild_from_blocks derives, without touching the tracked state. Used to check the difficulty
+        that new blocks and synced headers claim.
+        """
+        difficulty = cls.cfg.default_difficulty
+        times: Deque[float] = deque(maxlen=cls.cfg.window_size)
+        recent = blocks[-(cls.cfg.window_size + 1):]
+        for previous, block in zip([None, *recent[:-1]], recent):
+            difficulty = block.difficulty if block.difficulty else cls.cfg.default_difficulty
+            block_time = cls.block_time(previous, block)
+            if cls._is_valid_time(block_time):
+                times.append(block_time)
+                difficulty = cls._retarget(difficulty, times)
+        return difficulty
+
+    @classmethod
+    def block_time(cls, previous: Optional["Block | BlockHeader"], block: "Block | BlockHeader") -> Optional[float]:
+        """
+        Seconds the block took, from the hashed timestamps: the time since the previous block minus the
+        spacing blocks have to keep. None for the first block after genesis, which has no spacing rule,
+        and when a timestamp cannot be read.
+        """
+        if previous is None or block.number <= 1:
+            return None
+        try:
+            delta = datetime.fromisoformat(block.timestamp) - datetime.fromisoformat(previous.timestamp)
+        except (TypeError, ValueError):
+            return None
+        return delta.total_seconds() - cls.cfg.block_spacing
+
+    @staticmethod
+    def _is_valid_time(mining_time: Optional[float]) -> bool:
+        return isinstance(mining_time, (int, float)) and math.isfinite(mining_time) and mining_time > 0
+
+    @classmethod
+    def _retarget(cls, target: int, times: Deque[float]) -> int:
+        avg_time = sum(times) / len(times)
 
         # Granular adjustment by ratio
         # new_target = old_target * (actual_time / expected_time)
@@ -53,7 +128,7 @@ class DifficultyService:
         if ratio > 1.05:
             ratio = 1.05
 
-        new_target = int(cls.current_difficulty * ratio)
+        new_target = int(target * ratio)
 
         # Clamp to valid range
         if new_target > MAX_TARGET:
@@ -61,12 +136,14 @@ class DifficultyService:
         if new_target < 1:
             new_target = 1
 
-        logging.debug(f"Old Target: {cls.current_difficulty} | New target: {new_target} | Ratio: {ratio:.4f} | Avg Time: {avg_time:.2f}s")
-        cls.current_difficulty = new_target
+        logging.debug(f"Old Target: {target} | New target: {new_target} | Ratio: {ratio:.4f} | Avg Time: {avg_time:.2f}s")
+        return new_target
 
     @classmethod
-    def _avg_time(cls) -> Optional[float]:
-        if not cls.state.times:
-            return None
-        return sum(cls.state.times) / len(cls.state.times)
-
+    def expected_attempts(cls, difficulty: Optional[int] = None) -> float:
+        """ Expected number of hashes needed to meet the given target (defaults to the current one). """
+        target = cls.current_difficulty if difficulty is None else difficulty
+        # Target 0 passes every hash, see Block._meets_difficulty
+        if target <= 0 or target >= MAX_TARGET:
+            return 1.0
+        return (MAX_TARGET + 1) / (target + 1)
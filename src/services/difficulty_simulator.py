@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import random
+import statistics
+from dataclasses import dataclass, field
+from typing import Optional
+
+from services.difficulty_service import DifficultyService, DifficultyConfig, MAX_TARGET
+
+
+@dataclass
+class HashrateShock:
+    at_block: int       # first block mined at the new hashrate
+    factor: float       # multiplier applied to the hashrate from that block on
+
+
+@dataclass
+class SimulationResult:
+    cfg: DifficultyConfig
+    block_times: list[float]
+    difficulties: list[int]
+    # First block at which the rolling mean block time is within tolerance of target_time
+    convergence_block: Optional[int]
+    # Number of times the retarget direction flipped (easier <-> harder)
+    oscillations: int
+    mean_block_time: float
+    block_time_variance: float
+    # Blocks after each shock until the rolling mean is back within tolerance (None if it never was)
+    shock_recovery_blocks: list[Optional[int]] = field(default_factory=list)
+
+
+class DifficultySimulator:
+    """
+    Offline model of difficulty retargeting on a virtual clock.
+
+    Mining is modelled as a Poisson process: at a hashrate of H hashes per second and a target T,
+    each hash succeeds with probability (T + 1) / 2^256, so the time to the next block is
+    exponentially distributed with rate H * (T + 1) / 2^256. Every simulated block is fed through
+    DifficultyService.record_block_time, the same retarget path the Ledger uses for accepted blocks.
+    The service's live state is restored afterwards.
+    """
+
+    # Smallest number of blocks the rolling mean is taken over, single block times are very noisy
+    MIN_CONVERGENCE_WINDOW = 50
+
+    def __init__(self, hashrate: float, seed: Optional[int] = None, tolerance: float = 0.2):
+        self.hashrate = hashrate
+        self.tolerance = tolerance
+        self._random = random.Random(seed)
+
+    def run(self, cfg: DifficultyConfig, blocks: int, shocks: Optional[list[HashrateShock]] = None) -> SimulationResult:
+        shocks = sorted(shocks or [], key=lambda shock: shock.at_block)
+        saved = (DifficultyService.cfg, DifficultyService.state, DifficultyService.current_difficulty)
+        try:
+            DifficultyService.cfg = cfg
+            DifficultyService.reset()
+
+            block_times: list[float] = []
+            difficulties: list[int] = []
+            hashrate = self.hashrate
+            pending_shocks = list(shocks)
+            for number in range(blocks):
+                while pending_shocks and pending_shocks[0].at_block <= number:
+                    hashrate *= pending_shocks.pop(0).factor
+
+                difficulty = DifficultyService.current_difficulty
+                success_rate = hashrate * (difficulty + 1) / (MAX_TARGET + 1)
+                block_time = self._random.expovariate(success_rate)
+
+                block_times.append(block_time)
+                difficulties.append(difficulty)
+                DifficultyService.record_block_time(difficulty, block_time)
+        finally:
+            DifficultyService.cfg, DifficultyService.state, DifficultyService.current_difficulty = saved
+
+        return SimulationResult(
+            cfg=cfg,
+            block_times=block_times,
+            difficulties=difficulties,
+            convergence_block=self._find_convergence(block_times, cfg, 0),
+            oscillations=self._count_direction_changes(difficulties),
+            mean_block_time=statistics.fmean(block_times) if block_times else 0.0,
+            block_time_variance=statistics.pvariance(block_times) if block_times else 0.0,
+            shock_recovery_blocks=[self._blocks_to_recover(block_times, cfg, shock.at_block) for shock in shocks],
+        )
+
+    def _rolling_means(self, block_times: list[float], window: int) -> list[Optional[float]]:
+        """ Mean of the `window` block times ending at each block (None until the window is full). """
+        means: list[Optional[float]] = []
+        running = 0.0
+        for index, block_time in enumerate(block_times):
+            running += block_time
+            if index >= window:
+                running -= block_times[index - window]
+            means.append(running / window if index >= window - 1 else None)
+        return means
+
+    def _find_convergence(self, block_times: list[float], cfg: DifficultyConfig, start: int) -> Optional[int]:
+        """ First block whose rolling mean, over blocks from `start` on only, is within tolerance. """
+        window = max(cfg.window_size, self.MIN_CONVERGENCE_WINDOW)
+        means = self._rolling_means(block_times, window)
+        for index in range(start + window - 1, len(block_times)):
+            if abs(means[index] - cfg.target_time) <= self.tolerance * cfg.target_time:
+                return index
+        return None
+
+    def _blocks_to_recover(self, block_times: list[float], cfg: DifficultyConfig, shock_block: int) -> Optional[int]:
+        converged_at = self._find_convergence(block_times, cfg, shock_block)
+        return None if converged_at is None else converged_at - shock_block
+
+    @staticmethod
+    def _count_direction_changes(difficulties: list[int]) -> int:
+        changes = 0
+        last_direction = 0
+        for previous, current in zip(difficulties, difficulties[1:]):
+            direction = (current > previous) - (current < previous)
+            if direction == 0:
+                continue
+            if last_direction and direction != last_direction:
+                changes += 1
+            last_direction = direction
+        return changes
@@ -28,6 +28,10 @@ class FileSystemService:
         """ Return a name that can be used for user feedback """
         return "Shared files"
 
+    def get_file_targets(self) -> list[str]:
+        """ Returns the data file names whose integrity is tracked in the hash store. """
+        return list(self.__class__._file_targets)
+
     def initialize_data_files(self):
         for target in self.__class__._file_targets:
             self.get_data_file_path(target, create_if_missing=True)
@@ -226,7 +230,7 @@ class FileSystemService:
 
     def verify_all_data_files(self) -> Dict[str, Dict[str, Any]]:
         """Verify all canonical data files (ledger, pool, users db). Returns mapping filename -> result dict."""
-        targets = self.__class__._file_targets
+        targets = self.get_file_targets()
         results: Dict[str, Dict[str, Any]] = {}
         for fn in targets:
             try:
@@ -237,7 +241,7 @@ class FileSystemService:
 
     def initialize_hash_store(self) -> None:
         """Initialize the hash store by computing and storing hashes for all canonical data files."""
-        targets = self.__class__._file_targets
+        targets = self.get_file_targets()
         for fn in targets:
             try:
                 self.update_hash_for_file(fn)
@@ -246,7 +250,7 @@ class FileSystemService:
 
     def can_hash_store_be_initialized(self):
         """ Checks if the has store can be initialized (i.e., all data files exist, but are empty). """
-        targets = self.__class__._file_targets
+        targets = self.get_file_targets()
         for fn in targets:
             try:
                 file_path = self.get_data_file_path(fn, create_if_missing=False)
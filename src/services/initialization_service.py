@@ -1,10 +1,14 @@
 class InitializationService:
 
+    # Light nodes publish on their own ports, so a light node can run next to both full nodes
+    FULL_NODE_PORTS = {1: 5555, 2: 5556}
+    LIGHT_NODE_PORTS = {1: 5557, 2: 5558}
+
     @classmethod
-    def initialize_application(cls, node_number: int = 1):
+    def initialize_application(cls, node_number: int = 1, light: bool = False):
         from services import FileSystemService, NodeFileSystemService
         if NodeFileSystemService._node_data_directory is None:
-            NodeFileSystemService.set_node_data_directory_by_number(node_number)
+            NodeFileSystemService.set_node_data_directory_by_number(node_number, light=light)
         filesystem_service = FileSystemService()
         filesystem_service.initialize_data_files()
         node_filesystem_service = NodeFileSystemService()
@@ -30,16 +34,25 @@ class InitializationService:
 
         from services import NetworkingService
         NetworkingService.get_instance().configure(
-            port=5555 if node_number == 1 else 5556,
-            peer_addresses=[ "localhost:5556" if node_number == 1 else "localhost:5555" ],
+            port=cls.LIGHT_NODE_PORTS[node_number] if light else cls.FULL_NODE_PORTS[node_number],
+            peer_addresses=cls._get_peer_addresses(node_number, light),
         )
         NetworkingService.get_instance().start()
 
+        if light:
+            cls._initialize_light_client()
+            return
+
         NetworkingService.get_instance().register_handler(
             NetworkingService.TX_BROADCAST_TOPIC,
             lambda payload, _: Pool.get_instance().handle_network_transaction(payload)
         )
 
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.TX_BATCH_BROADCAST_TOPIC,
+            lambda payload, _: Pool.get_instance().handle_network_transactions(payload)
+        )
+
         NetworkingService.get_instance().register_handler(
             NetworkingService.BLOCK_BROADCAST_TOPIC,
             lambda payload, _: Ledger.get_instance().handle_network_block(payload)
@@ -66,12 +79,107 @@ class InitializationService:
             lambda payload, _: Ledger.get_instance().handle_validation_sync_request(payload)
         )
 
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.HEADER_SYNC_REQUEST_TOPIC,
+            lambda payload, _: Ledger.get_instance().handle_header_sync_request(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MERKLE_PROOF_REQUEST_TOPIC,
+            lambda payload, _: Ledger.get_instance().handle_merkle_proof_request(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MERKLE_PROOF_RESPONSE_TOPIC,
+            lambda payload, _: Ledger.get_instance().handle_merkle_proof_response(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.ADDRESS_PROOFS_REQUEST_TOPIC,
+            lambda payload, _: Ledger.get_instance().handle_address_proofs_request(payload)
+        )
+
+        from blockchain.cooperative_mining import CooperativeMiningWorker, MiningCoordinator
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MINING_TEMPLATE_TOPIC,
+            lambda payload, _: CooperativeMiningWorker.get_instance().handle_template(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MINING_RANGE_ASSIGN_TOPIC,
+            lambda payload, _: CooperativeMiningWorker.get_instance().handle_range_assign(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MINING_DONE_TOPIC,
+            lambda payload, _: CooperativeMiningWorker.get_instance().handle_done(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MINING_RANGE_REQUEST_TOPIC,
+            lambda payload, _: MiningCoordinator.route_range_request(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MINING_SOLUTION_TOPIC,
+            lambda payload, _: MiningCoordinator.route_solution(payload)
+        )
+
         from blockchain import Pool
         Pool.get_instance()
         from blockchain import Ledger
         Ledger.get_instance()
 
+        # Pool transactions of senders whose balance changed are revalidated right away
+        from events import AddressesTouchedByBlockEvent
+        AddressesTouchedByBlockEvent.subscribe(Pool.handle_addresses_touched_by_block)
+
+
+
+    @classmethod
+    def _get_peer_addresses(cls, node_number: int, light: bool) -> list[str]:
+        """ Light nodes listen to both full nodes; full nodes to the other full node and every light node. """
+        if light:
+            ports = list(cls.FULL_NODE_PORTS.values())
+        else:
+            ports = [port for number, port in cls.FULL_NODE_PORTS.items() if number != node_number]
+            ports += list(cls.LIGHT_NODE_PORTS.values())
+        return [f"localhost:{port}" for port in ports]
+
+    @classmethod
+    def _initialize_light_client(cls):
+        """ Light nodes keep only block headers: no ledger, pool or startup validation. """
+        from services import NetworkingService, NodeFileSystemService
+        from blockchain.header_chain import HeaderChain
+        from models.constants import FilesAndDirectories
+
+        node_filesystem_service = NodeFileSystemService()
+        if FilesAndDirectories.HEADER_CHAIN_FILE_NAME not in node_filesystem_service.get_file_targets():
+            node_filesystem_service.get_data_file_path(FilesAndDirectories.HEADER_CHAIN_FILE_NAME, create_if_missing=True)
+            node_filesystem_service.update_hash_for_file(FilesAndDirectories.HEADER_CHAIN_FILE_NAME)
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.HEADER_SYNC_RESPONSE_TOPIC,
+            lambda payload, _: HeaderChain.get_instance().handle_network_headers(payload)
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.MERKLE_PROOF_RESPONSE_TOPIC,
+            lambda payload, _: HeaderChain.get_instance().handle_merkle_proof_response(payload)
+        )
+
+        # New blocks are only accepted once validated; either message may mean new headers are available
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.BLOCK_BROADCAST_TOPIC,
+            lambda payload, _: HeaderChain.get_instance().request_sync()
+        )
+
+        NetworkingService.get_instance().register_handler(
+            NetworkingService.VALIDATION_BROADCAST_TOPIC,
+            lambda payload, _: HeaderChain.get_instance().request_sync()
+        )
 
+        HeaderChain.get_instance()
 
     @classmethod
     def exit_with_error_message(cls, message: str):
@@ -1,7 +1,7 @@
 import asyncio
 import json
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 import zmq
 import zmq.asyncio
 
@@ -14,6 +14,8 @@ class NetworkingService(Subscribable, AbstractSingleton):
     BLOCK_SYNC_REQUEST_TOPIC = "blocks.sync.request"
     BLOCK_SYNC_RESPONSE_TOPIC = "blocks.sync.response"
     BLOCK_BROADCAST_TOPIC = "blocks.broadcast"
+    HEADER_SYNC_REQUEST_TOPIC = "headers.sync.request"
+    HEADER_SYNC_RESPONSE_TOPIC = "headers.sync.response"
 
     # Block validation related topics
     VALIDATION_BROADCAST_TOPIC = "validations.broadcast"
@@ -23,6 +25,19 @@ class NetworkingService(Subscribable, AbstractSingleton):
     TX_POOL_REQUEST_TOPIC = "transactions.pool.request"
     TX_POOL_RESPONSE_TOPIC = "transactions.pool.response"
     TX_BROADCAST_TOPIC = "transactions.broadcast"
+    TX_BATCH_BROADCAST_TOPIC = "transactions.batch.broadcast"
+
+    # Cooperative mining related topics
+    MINING_TEMPLATE_TOPIC = "mining.template"
+    MINING_RANGE_REQUEST_TOPIC = "mining.range.request"
+    MINING_RANGE_ASSIGN_TOPIC = "mining.range.assign"
+    MINING_SOLUTION_TOPIC = "mining.solution"
+    MINING_DONE_TOPIC = "mining.done"
+
+    # Merkle proof related topics
+    MERKLE_PROOF_REQUEST_TOPIC = "proofs.merkle.request"
+    MERKLE_PROOF_RESPONSE_TOPIC = "proofs.merkle.response"
+    ADDRESS_PROOFS_REQUEST_TOPIC = "proofs.address.request"
 
     def __init__(self):
         super().__init__()
@@ -33,6 +48,8 @@ class NetworkingService(Subscribable, AbstractSingleton):
         self.publisher = self.context.socket(zmq.PUB)
         self.subscriber = self.context.socket(zmq.SUB)
         self.running = False
+        # Loop running listen(); broadcasts from other threads (workers, mining) are handed to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._handlers: dict[str, Callable[[dict[str, Any], str], None]] = {}
         logging.debug("NetworkingService initialized")
 
@@ -79,11 +96,33 @@ class NetworkingService(Subscribable, AbstractSingleton):
         logging.debug(f"Broadcasting on topic '{topic}': {message}")
         if topic:
             logging.debug(f"Broadcasting message on topic '{topic}': {message[:100]}{'...' if len(message) > 100 else ''}")
-            self.publisher.send_string(f"{topic} {message}")
+            self._send(f"{topic} {message}")
         else:
             logging.debug(f"Broadcasting message with no topic: {message[:100]}{'...' if len(message) > 100 else ''}")
+            self._send(message)
+
+    def _send(self, message: str) -> None:
+        loop = self._loop
+        if loop is not None and loop.is_running() and not self._is_loop_thread(loop):
+            loop.call_soon_threadsafe(self.publisher.send_string, message)
+        else:
             self.publisher.send_string(message)
 
+    def call_soon(self, callback: Callable[[], None]) -> None:
+        """ Run the callback on the listen loop, or right away when the loop is not running. """
+        loop = self._loop
+        if loop is not None and loop.is_running() and not self._is_loop_thread(loop):
+            loop.call_soon_threadsafe(callback)
+        else:
+            callback()
+
+    @staticmethod
+    def _is_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
     def _broadcast_json(self, topic: str, payload: dict[str, Any]) -> None:
         logging.debug("Broadcasting JSON payload on topic '%s': %s", topic, json.dumps(payload))
         self.broadcast(json.dumps(payload), topic=topic)
@@ -100,6 +139,14 @@ class NetworkingService(Subscribable, AbstractSingleton):
             "block_data": block_payload,
         })
 
+    def request_headers(self, after_number: int, max_count: int) -> None:
+        logging.debug(f"Requesting up to {max_count} headers after block number {after_number}")
+        self._broadcast_json(self.HEADER_SYNC_REQUEST_TOPIC, {"after_number": after_number, "max": max_count})
+
+    def send_headers(self, headers: list[dict[str, Any]]) -> None:
+        logging.debug(f"Sending {len(headers)} block headers")
+        self._broadcast_json(self.HEADER_SYNC_RESPONSE_TOPIC, {"headers": headers})
+
     def broadcast_new_block(self, block_number: int, block_payload: dict[str, Any]) -> None:
         logging.debug(f"Broadcasting new block {block_number}")
         self._broadcast_json(self.BLOCK_BROADCAST_TOPIC, {
@@ -131,9 +178,45 @@ class NetworkingService(Subscribable, AbstractSingleton):
         logging.debug("Broadcasting new transaction")
         self._broadcast_json(self.TX_BROADCAST_TOPIC, {"transaction": transaction_payload})
 
+    def broadcast_new_transactions(self, transaction_payloads: list[dict[str, Any]]) -> None:
+        logging.debug(f"Broadcasting batch of {len(transaction_payloads)} transactions")
+        self._broadcast_json(self.TX_BATCH_BROADCAST_TOPIC, {"transactions": transaction_payloads})
+
+    # -------- Cooperative mining helpers (messaging only) --------
+    def broadcast_mining_template(self, job_id: str, block_payload: dict[str, Any]) -> None:
+        logging.debug(f"Broadcasting mining template for job {job_id}")
+        self._broadcast_json(self.MINING_TEMPLATE_TOPIC, {"job_id": job_id, "block_data": block_payload})
+
+    def request_mining_range(self, job_id: str, node_id: str) -> None:
+        logging.debug(f"Requesting nonce range for mining job {job_id}")
+        self._broadcast_json(self.MINING_RANGE_REQUEST_TOPIC, {"job_id": job_id, "node_id": node_id})
+
+    def assign_mining_range(self, job_id: str, node_id: str, nonce_start: int, nonce_count: int) -> None:
+        logging.debug(f"Assigning nonces {nonce_start}+{nonce_count} of mining job {job_id} to {node_id}")
+        self._broadcast_json(self.MINING_RANGE_ASSIGN_TOPIC, {
+            "job_id": job_id,
+            "node_id": node_id,
+            "nonce_start": nonce_start,
+            "nonce_count": nonce_count,
+        })
+
+    def broadcast_mining_solution(self, job_id: str, node_id: str, nonce: int, block_hash: str) -> None:
+        logging.debug(f"Broadcasting solution for mining job {job_id}")
+        self._broadcast_json(self.MINING_SOLUTION_TOPIC, {
+            "job_id": job_id,
+            "node_id": node_id,
+            "nonce": nonce,
+            "block_hash": block_hash,
+        })
+
+    def broadcast_mining_done(self, job_id: str) -> None:
+        logging.debug(f"Broadcasting end of mining job {job_id}")
+        self._broadcast_json(self.MINING_DONE_TOPIC, {"job_id": job_id})
+
     async def listen(self):
         logging.debug("Starting NetworkingService listen loop")
         self.running = True
+        self._loop = asyncio.get_running_loop()
         while self.running:
             try:
                 message = await self.subscriber.recv_string()
@@ -179,3 +262,19 @@ class NetworkingService(Subscribable, AbstractSingleton):
                 logging.exception(f"Exception while handling message for topic '{topic}'")
         else:
             logging.debug(f"No handler registered for topic '{topic}'")
+
+    # -------- Merkle proof helpers (messaging only) --------
+    def request_merkle_proof(self, tx_hash: str) -> None:
+        logging.debug(f"Requesting Merkle proof for transaction {tx_hash}")
+        self._broadcast_json(self.MERKLE_PROOF_REQUEST_TOPIC, {"tx_hash": tx_hash})
+
+    def request_address_proofs(self, address: str, after_number: int) -> None:
+        logging.debug(f"Requesting Merkle proofs for the transactions of {address} after block #{after_number}")
+        self._broadcast_json(self.ADDRESS_PROOFS_REQUEST_TOPIC, {"address": address, "after_number": after_number})
+
+    def send_merkle_proof(self, proof_payload: dict[str, Any], transaction_payload: Optional[dict[str, Any]] = None) -> None:
+        logging.debug(f"Sending Merkle proof for transaction {proof_payload.get('tx_hash')}")
+        payload = {"proof": proof_payload}
+        if transaction_payload is not None:
+            payload["transaction"] = transaction_payload
+        self._broadcast_json(self.MERKLE_PROOF_RESPONSE_TOPIC, payload)
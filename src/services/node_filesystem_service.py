@@ -1,4 +1,5 @@
 import os
+import re
 
 from exceptions import RequestedDirectoryDoesNotExistException
 from models.constants import FilesAndDirectories
@@ -10,6 +11,8 @@ class NodeFileSystemService(FileSystemService):
 
     _node_data_directory: str = None
 
+    _block_segment_pattern = re.compile(r"^blocks_\d{5}\.seg$")
+
     _file_targets = [
         FilesAndDirectories.LEDGER_FILE_NAME,
         FilesAndDirectories.POOL_FILE_NAME,
@@ -20,10 +23,33 @@ class NodeFileSystemService(FileSystemService):
         return "Node files"
 
     @classmethod
-    def set_node_data_directory_by_number(cls, number: int) -> None:
+    def set_node_data_directory_by_number(cls, number: int, light: bool = False) -> None:
         if cls._node_data_directory is not None:
             raise Exception("Node data directory has already been set.")
-        cls._node_data_directory = f"data_node_{number}"
+        cls._node_data_directory = f"data_light_node_{number}" if light else f"data_node_{number}"
+
+    def get_file_targets(self) -> list[str]:
+        """
+        Static node files plus the block store index and segments, the ledger index snapshot and the light node headers
+        once they have been written.
+        Files recorded in the hash store stay targets when they disappear from disk, so their loss fails verification.
+        """
+        targets = super().get_file_targets()
+        try:
+            data_root = self.get_data_root()
+        except RequestedDirectoryDoesNotExistException:
+            return targets
+        written = set(fn for fn in os.listdir(data_root) if self._is_written_target(fn))
+        written.update(fn for fn in self.load_hash_store() if self._is_written_target(fn))
+        return targets + sorted(written)
+
+    @classmethod
+    def _is_written_target(cls, file_name: str) -> bool:
+        return (
+            file_name in (FilesAndDirectories.BLOCK_INDEX_FILE_NAME, FilesAndDirectories.HEADER_CHAIN_FILE_NAME,
+                          FilesAndDirectories.LEDGER_INDEX_SNAPSHOT_FILE_NAME)
+            or cls._block_segment_pattern.match(file_name) is not None
+        )
 
     def get_data_root(self, create_if_missing: bool = False) -> str:
         """ Returns the absolute path to the 'data' directory of the project specific to this node. """
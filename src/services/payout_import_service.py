@@ -0,0 +1,72 @@
+import csv
+import json
+import os
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from exceptions.transaction import InvalidTransactionException
+from models import Transaction, User
+from repositories.user import UserRepository
+
+
+class PayoutImportService:
+    """
+    Reads a batch of payouts from a CSV or JSON file and submits it to the pool in one go.
+
+    CSV files have a header row with the columns receiver_username or receiver_address, amount and
+    an optional fee. JSON files hold a list of objects with the same keys.
+    """
+
+    def read_payouts(self, path: str) -> list[tuple[str, Decimal, Decimal]]:
+        """ Parse the file into (receiver address, amount, fee) transfers, in file order. """
+        with open(path, newline="", encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() == ".json":
+                try:
+                    rows = json.load(f)
+                except json.JSONDecodeError as e:
+                    raise InvalidTransactionException(f"Payout file is not valid JSON: {e}")
+                if not isinstance(rows, list):
+                    raise InvalidTransactionException("Payout file must contain a list of payouts.")
+            else:
+                rows = list(csv.DictReader(f))
+
+        addresses_by_username: dict[str, str] = {}
+        return [self._parse_row(number, row, addresses_by_username) for number, row in enumerate(rows, start=1)]
+
+    def _parse_row(self, number: int, row: Any, addresses_by_username: dict[str, str]) -> tuple[str, Decimal, Decimal]:
+        if not isinstance(row, dict):
+            raise InvalidTransactionException(f"Payout {number} is not a record.")
+
+        receiver_address = row.get("receiver_address")
+        receiver_username = row.get("receiver_username")
+        if not receiver_address and receiver_username:
+            if receiver_username not in addresses_by_username:
+                receiver = UserRepository().find_by_username(receiver_username)
+                if receiver is None:
+                    raise InvalidTransactionException(f"Payout {number}: receiver with username '{receiver_username}' not found.")
+                addresses_by_username[receiver_username] = receiver.address
+            receiver_address = addresses_by_username[receiver_username]
+        if not receiver_address:
+            raise InvalidTransactionException(f"Payout {number}: receiver_username or receiver_address is required.")
+
+        try:
+            amount = Decimal(str(row.get("amount")))
+            fee = Decimal(str(row.get("fee") or "0"))
+        except InvalidOperation:
+            raise InvalidTransactionException(f"Payout {number}: amount and fee must be numbers.")
+        if not amount.is_finite() or amount <= 0:
+            raise InvalidTransactionException(f"Payout {number}: amount must be greater than zero.")
+        if not fee.is_finite() or fee < 0:
+            raise InvalidTransactionException(f"Payout {number}: fee cannot be negative.")
+
+        return receiver_address, amount, fee
+
+    def import_payouts(self, sender: User, path: str) -> list[Transaction]:
+        """
+        Create, sign and add every payout in the file. The batch is checked against the sender's running
+        balance and added with one save and one network message; nothing is added if any payout is invalid.
+        """
+        transfers = self.read_payouts(path)
+        transactions = Transaction.create_many(sender, transfers)
+        from blockchain import Pool
+        return Pool.get_instance().add_transactions(transactions)
@@ -42,21 +42,20 @@ class TransactionQueryService:
         ledger = Ledger.get_instance()
         views: List[TransactionView] = []
 
-        # Iterate accepted blocks and collect matching txs
-        for block in ledger.get_all_blocks():
+        # Look up accepted blocks through the ledger's address index
+        for block, tx in ledger.get_confirmed_transactions_for_address(address):
             if block.status != BlockStatus.ACCEPTED:
                 continue
-            for tx in block.transactions:
-                direction = cls._involves_address(tx, address)
-                if direction is None:
-                    continue
-                views.append(TransactionView(
-                    tx=tx,
-                    direction=direction,
-                    status="confirmed",
-                    block_number=block.number,
-                    block_hash=block.calculated_hash,
-                ))
+            direction = cls._involves_address(tx, address)
+            if direction is None:
+                continue
+            views.append(TransactionView(
+                tx=tx,
+                direction=direction,
+                status="confirmed",
+                block_number=block.number,
+                block_hash=block.calculated_hash,
+            ))
 
         # Sort by block_number then tx timestamp
         views.sort(key=lambda v: (v.block_number or -1, cls._parse_ts(v.tx.timestamp)))
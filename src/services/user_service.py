@@ -31,6 +31,8 @@ class UserService(Subscribable):
     def logout(self) -> None:
         from blockchain import Pool
         Pool.get_instance().unmark_all_transaction()
+        if self.__class__.logged_in_user is not None:
+            self.__class__.logged_in_user.forget_signing_key()
         self.__class__.logged_in_user = None
         self.__class__._call_subscribers(None)
 
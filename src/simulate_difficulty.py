@@ -0,0 +1,39 @@
+import argparse
+import itertools
+
+from services.difficulty_service import DifficultyConfig
+from services.difficulty_simulator import DifficultySimulator, HashrateShock
+
+
+def parse_shock(value: str) -> HashrateShock:
+    try:
+        block, factor = value.split(":")
+        return HashrateShock(at_block=int(block), factor=float(factor))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected BLOCK:FACTOR, got '{value}'")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Simulate difficulty retargeting on a virtual clock, without mining real blocks"
+    )
+    parser.add_argument("--blocks", type=int, default=5000, help="Number of blocks to simulate per configuration")
+    parser.add_argument("--hashrate", type=float, default=450_000, help="Network hashrate in hashes per second")
+    parser.add_argument("--target-time", type=float, nargs="+", default=[DifficultyConfig.target_time], help="Target block times (seconds) to compare")
+    parser.add_argument("--window-size", type=int, nargs="+", default=[DifficultyConfig.window_size], help="Retarget window sizes to compare")
+    parser.add_argument("--shock", type=parse_shock, action="append", default=[], help="Hashrate change as BLOCK:FACTOR, e.g. 2500:4 (repeatable)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed, the same seed gives the same run")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print(f"{'target':>8} {'window':>6} {'converged':>9} {'oscillations':>12} {'mean':>8} {'stdev':>8}  recovery per shock")
+    for target_time, window_size in itertools.product(args.target_time, args.window_size):
+        cfg = DifficultyConfig(target_time=target_time, window_size=window_size)
+        result = DifficultySimulator(args.hashrate, seed=args.seed).run(cfg, args.blocks, args.shock)
+        converged = "never" if result.convergence_block is None else str(result.convergence_block)
+        recoveries = ", ".join("never" if blocks is None else str(blocks) for blocks in result.shock_recovery_blocks) or "-"
+        print(f"{target_time:>7.1f}s {window_size:>6} {converged:>9} {result.oscillations:>12} "
+              f"{result.mean_block_time:>7.2f}s {result.block_time_variance ** 0.5:>7.2f}s  {recoveries}")
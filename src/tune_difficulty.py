@@ -21,6 +21,7 @@ try:
     from blockchain.ledger import Ledger
     from services import DifficultyService
     from blockchain.abstract_pickable_singleton import AbstractPickableSingleton
+    from blockchain.block_store import BlockStore
 except ImportError:
     # If run from src directly
     sys.path.append(os.getcwd())
@@ -30,6 +31,7 @@ except ImportError:
     from blockchain.ledger import Ledger
     from services import DifficultyService
     from blockchain.abstract_pickable_singleton import AbstractPickableSingleton
+    from blockchain.block_store import BlockStore
 
 # --- Mocking / Setup ---
 
@@ -39,6 +41,7 @@ def no_op_save():
 
 AbstractPickableSingleton._save = no_op_save
 AbstractPickableSingleton.load = lambda: None
+BlockStore.sync = lambda self, chain: None
 
 # Reset singleton state to ensure clean run
 Ledger._instance = None
@@ -102,8 +105,7 @@ for i in range(1, NUM_BLOCKS + 1):
     print(f"Block Hash: {new_block.calculated_hash}")
 
     # 3. Update Ledger Mock
-    ledger._blocks[new_block.calculated_hash] = new_block
-    ledger._latest_block = new_block
+    ledger._append_to_chain(new_block)
 
     # 4. Check Result
     new_diff = DifficultyService.current_difficulty
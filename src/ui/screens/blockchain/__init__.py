@@ -1,4 +1,5 @@
 from .blockchain_explorer_screen import BlockchainExplorerScreen
 from .transaction_detail_screen import TransactionDetailScreen
 from .transaction_create_screen import TransactionCreateScreen
+from .payout_import_screen import PayoutImportScreen
 from .block_mining_screen import BlockMiningScreen
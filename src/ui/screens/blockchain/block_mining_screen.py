@@ -1,5 +1,6 @@
 import asyncio
 from decimal import Decimal
+from typing import Optional
 
 from textual import events, log, work
 from textual.app import App, ComposeResult
@@ -11,16 +12,19 @@ from textual.widgets import Footer, Placeholder, Static, Input, Button, ListItem
 from textual.worker import Worker
 
 from blockchain import Ledger
+from blockchain.mining_job import MiningJob
 from exceptions.mining import InvalidBlockException
 from exceptions.transaction import InvalidTransactionException
 from models import Transaction, Block
 from models.dto import UIAlert
-from models.enum import AlertType
+from models.enum import AlertType, MiningJobState
 from ui.screens.utils.alert_screen import AlertScreen
 
 
 class BlockMiningScreen(Screen):
 
+    USER_CANCEL_REASON = "Cancelled by the user."
+
     DEFAULT_CSS = """
         Button {
             margin: 0 2;
@@ -44,10 +48,12 @@ class BlockMiningScreen(Screen):
     def __init__(self):
         super().__init__()
         self.timer = None
+        self.job: Optional[MiningJob] = None
 
     def compose(self) -> ComposeResult:
         yield Vertical(
             Label("Mining will take approximately 10 to 20 seconds."),
+            Label("Preparing block...", id="mining_progress"),
             Container(
                 LoadingIndicator(),
             ),
@@ -63,38 +69,69 @@ class BlockMiningScreen(Screen):
         self._mine_transactions_marked_for_block()
 
     def _mine_transactions_marked_for_block(self) -> None:
-        self._start_block_mine()
+        try:
+            self.job = Ledger.start_mining_job()
+        except InvalidTransactionException as e:
+            self.app.switch_screen(AlertScreen(UIAlert(
+                title="Mining failed",
+                message=f"Block mining failed due to invalid transaction: {e}",
+                alert_type=AlertType.DANGER
+            )))
+            return
+        except InvalidBlockException as e:
+            self.app.switch_screen(AlertScreen(UIAlert(
+                title="Mining failed",
+                message=f"Block mining failed due to invalid block: {e}",
+                alert_type=AlertType.DANGER
+            )))
+            return
+
+        self.timer = self.set_interval(0.5, self._refresh_progress)
+        self._wait_for_block_mine()
 
+    def _refresh_progress(self) -> None:
+        if self.job is None:
+            return
+        progress = self.job.get_progress()
+        expected = "unknown" if progress.expected_seconds_to_solution is None else f"~{progress.expected_seconds_to_solution:.0f}s"
+        self.query_one("#mining_progress", Label).update(
+            f"{progress.attempts:,} attempts in {progress.elapsed_seconds:.1f}s "
+            f"({progress.attempts_per_second:,.0f}/s), expected time to solution {expected}"
+        )
 
     @work(exclusive=True, thread=True)
-    def _start_block_mine(self):
-        log("Starting block mining...")
-        try:
-            block = Ledger.mine_new_block()
-        except InvalidTransactionException as e:
-            self.app.call_from_thread(
-                self.app.switch_screen,
-                AlertScreen(UIAlert(
-                    title="Mining failed",
-                    message=f"Block mining failed due to invalid transaction: {e}",
-                    alert_type=AlertType.DANGER
-                ))
-            )
+    def _wait_for_block_mine(self):
+        log("Waiting for block mining job...")
+        self.job.wait()
+        if self.timer is not None:
+            self.app.call_from_thread(self.timer.stop)
+
+        if self.job.state == MiningJobState.CANCELLED:
+            # User cancellations are already reported by the cancel button
+            if self.job.cancel_reason != self.USER_CANCEL_REASON:
+                self.app.call_from_thread(
+                    self.app.switch_screen,
+                    AlertScreen(UIAlert(
+                        title="Mining cancelled",
+                        message=f"Block mining was cancelled: {self.job.cancel_reason}",
+                        alert_type=AlertType.WARNING
+                    ))
+                )
             return
 
-        except InvalidBlockException as e:
+        if self.job.state == MiningJobState.FAILED:
             self.app.call_from_thread(
                 self.app.switch_screen,
                 AlertScreen(UIAlert(
                     title="Mining failed",
-                    message=f"Block mining failed due to invalid block: {e}",
+                    message=f"Block mining failed: {self.job.error}",
                     alert_type=AlertType.DANGER
                 ))
             )
             return
 
             # success case
-        self.app.call_from_thread(lambda: self.on_mining_success(block))
+        self.app.call_from_thread(lambda: self.on_mining_success(self.job.block))
 
     def on_mining_success(self, block: Block):
         log("Block mined successfully.")
@@ -112,8 +149,10 @@ class BlockMiningScreen(Screen):
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "close":
 
-            if hasattr(self, "_timer"):
+            if self.timer is not None:
                 self.timer.stop()
+            if self.job is not None:
+                self.job.cancel(self.USER_CANCEL_REASON)
 
             self.app.switch_screen(AlertScreen(UIAlert(
                 title="Mining cancelled",
@@ -0,0 +1,102 @@
+from textual import log
+from textual.app import ComposeResult
+from textual.containers import Vertical, Horizontal
+from textual.reactive import reactive
+from textual.screen import Screen
+from textual.widgets import Footer, Input, Button, Label
+
+from exceptions.transaction import InvalidTransactionException, InsufficientBalanceException
+from models.dto import UIAlert
+from models.enum import AlertType
+from services.payout_import_service import PayoutImportService
+from services.user_service import UserService
+from ui.screens.utils import AlertScreen
+
+
+class PayoutImportScreen(Screen):
+    DEFAULT_CSS = """
+        Button {
+            margin: 2;
+        }
+        PayoutImportScreen{
+            margin: 2;
+            padding: 1;
+        }
+        Input {
+            margin: 1 2;
+        }
+        Label {
+            margin: 0 2;
+        }
+        .tx_error{
+            color: red;
+            margin: 2 2;
+        }
+    """
+
+    tx_errors: list = reactive([], recompose=True)
+    path = reactive("")
+
+    def __init__(self):
+        super().__init__()
+        self.tx_errors = []  # reset per instance
+        self.path = ""
+
+    def compose(self) -> ComposeResult:
+        log("Composing PayoutImportScreen with errors: ", self.tx_errors)
+        error_labels = [Label(f"{error}", classes="tx_error") for error in self.tx_errors]
+
+        yield Vertical(
+            *error_labels,
+            Label("Import payouts from a CSV or JSON file"),
+            Label("Columns: receiver_username or receiver_address, amount and an optional fee"),
+            Input(placeholder="Path to the payout file", id="path"),
+            Horizontal(
+                Button("Import", id="import"),
+                Button("Cancel", id="close"),
+                classes="button-row",
+            ),
+        )
+        yield Footer()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "path":
+            self.path = event.value.strip()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "close":
+            self.tx_errors = []
+            self.mutate_reactive(PayoutImportScreen.tx_errors)
+            self.app.pop_screen()
+        if event.button.id == "import":
+            self._import_payouts()
+
+    def _import_payouts(self):
+        self.tx_errors = []
+
+        if not self.path:
+            self.tx_errors.append("Path to the payout file is required.")
+            self.mutate_reactive(PayoutImportScreen.tx_errors)
+            return
+
+        try:
+            transactions = PayoutImportService().import_payouts(UserService.logged_in_user, self.path)
+        except (InvalidTransactionException, InsufficientBalanceException) as e:
+            self.tx_errors.append(str(e))
+            self.mutate_reactive(PayoutImportScreen.tx_errors)
+            return
+        except OSError as e:
+            self.tx_errors.append(f"Payout file could not be read: {e}")
+            self.mutate_reactive(PayoutImportScreen.tx_errors)
+            return
+
+        self.path = ""
+        self.tx_errors = []
+
+        self.app.switch_screen(AlertScreen(UIAlert(
+            title="Payouts imported",
+            message=f"{len(transactions)} payouts have been created and added to the Pool.",
+            alert_type=AlertType.SUCCESS
+        )))
+
+        self.mutate_reactive(PayoutImportScreen.tx_errors)
@@ -117,6 +117,8 @@ class TransactionCreateScreen(Screen):
                 fee=self.fee,
             )
             transaction.validate(raise_exception=True, include_reserved_balance=True)
+            from blockchain import Pool
+            Pool.get_instance().add_transaction(transaction)
         except InvalidTransactionException as e:
             self.tx_errors.append(str(e))
             self.mutate_reactive(TransactionCreateScreen.tx_errors)
@@ -133,9 +135,6 @@ class TransactionCreateScreen(Screen):
 
         self.tx_errors = []
 
-        from blockchain import Pool
-        Pool.get_instance().add_transaction(transaction)
-
         self.app.switch_screen(AlertScreen(UIAlert(
             title="Transaction successful",
             message="The transaction has been created successfully and is added to the Pool.",
@@ -1,4 +1,5 @@
 import time
+from typing import Optional
 from textual import work
 from textual.app import ComposeResult
 from textual.containers import Vertical, Container
@@ -13,6 +14,9 @@ from ui.screens.utils.alert_screen import AlertScreen
 
 
 class LedgerValidationScreen(Screen):
+    # Set from the --full-validate flag; when False, startup only validates blocks after the checkpoint
+    full_validate: bool = False
+
     DEFAULT_CSS = """
         Button {
             margin: 0 2;
@@ -40,9 +44,11 @@ class LedgerValidationScreen(Screen):
         }
     """
 
-    def __init__(self, close_after: bool = False):
+    def __init__(self, close_after: bool = False, full_validate: Optional[bool] = None):
         super().__init__()
         self.close_after = close_after
+        if full_validate is not None:
+            self.full_validate = full_validate
 
     def compose(self) -> ComposeResult:
         yield Vertical(
@@ -60,7 +66,7 @@ class LedgerValidationScreen(Screen):
     def _validate_ledger(self):
         from blockchain import Ledger
         try:
-            (valid, errors) = Ledger.get_instance().validate_chain()
+            (valid, errors) = Ledger.get_instance().validate_chain(use_checkpoint=not self.full_validate)
         except InvalidTransactionException as e:
             valid = False
             errors = [str(e)]
@@ -47,7 +47,7 @@ class TransactionListingWidget(Widget):
     def __init__(self, transaction: Transaction, show_move_buttons: bool = True):
         super().__init__()
         self.transaction = transaction
-        self.set_reactive(TransactionListingWidget.is_marked_for_block, Pool.get_instance().get_transactions_marked_for_block().__contains__(self.transaction))
+        self.set_reactive(TransactionListingWidget.is_marked_for_block, Pool.get_instance().is_marked_for_block(self.transaction))
         self.set_reactive(TransactionListingWidget.can_be_moved, UserService.logged_in_user is not None)
         self.show_move_buttons = show_move_buttons and self.can_be_moved
 
@@ -68,7 +68,7 @@ class TransactionListingWidget(Widget):
             if self.transaction.sender_address != logged_in_user.address:
                 can_be_canceled = False
 
-        if self.transaction not in Pool.get_instance().get_transactions() or self.transaction in Pool.get_instance().get_transactions_marked_for_block():
+        if not Pool.get_instance().has_transaction(self.transaction) or Pool.get_instance().is_marked_for_block(self.transaction):
             can_be_canceled = False
 
         if self.transaction.kind == TransactionType.MINING_REWARD or self.transaction.kind == TransactionType.SIGNUP_REWARD:
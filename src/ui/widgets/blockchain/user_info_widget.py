@@ -149,6 +149,10 @@ class UserInfoWidget(Widget):
                     Button("Create transaction", classes="button", id="create_transaction"),
                     classes="col"
                 ),
+                Horizontal(
+                    Button("Import payouts", classes="button button--full-width", id="import_payouts"),
+                    classes="col"
+                ),
                 Horizontal(
                     Button("Validate chain", classes="button button--full-width", id="validate_chain"),
                     classes="col"
@@ -166,6 +170,9 @@ class UserInfoWidget(Widget):
         if event.button.id == "create_transaction":
             from ui.screens.blockchain import TransactionCreateScreen
             self.app.push_screen(TransactionCreateScreen())
+        if event.button.id == "import_payouts":
+            from ui.screens.blockchain import PayoutImportScreen
+            self.app.push_screen(PayoutImportScreen())
         if event.button.label == "Logout":
             user_service = UserService()
             user_service.logout()
@@ -189,4 +196,4 @@ class UserInfoWidget(Widget):
                 )))
         if event.button.id == "validate_chain":
             from ui.screens.startup import LedgerValidationScreen
-            self.app.push_screen(LedgerValidationScreen(close_after=True))
+            self.app.push_screen(LedgerValidationScreen(close_after=True, full_validate=True))
@@ -0,0 +1,121 @@
+import asyncio
+import socket
+import threading
+import time
+import unittest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from blockchain.cooperative_mining import CooperativeMiningWorker, MiningCoordinator
+from models import Block, Transaction
+from models.enum import TransactionType
+from services import NetworkingService
+
+
+class TestCooperativeMining(unittest.TestCase):
+    """ One coordinator and two helper nodes talking over ZeroMQ on localhost ports. """
+
+    def setUp(self):
+        self.previous_networking = NetworkingService._instance
+        self.addCleanup(setattr, NetworkingService, "_instance", self.previous_networking)
+        self.addCleanup(setattr, CooperativeMiningWorker, "_instance", None)
+
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+        self.addCleanup(self._stop_loop)
+
+        ports = [self._free_port() for _ in range(3)]
+        self.nodes = [NetworkingService() for _ in ports]
+        self.coordinator_node, *self.helper_nodes = self.nodes
+        self.coordinator_node.configure(ports[0], [f"localhost:{port}" for port in ports[1:]])
+        for node, port in zip(self.helper_nodes, ports[1:]):
+            node.configure(port, [f"localhost:{ports[0]}"])
+        for node in self.nodes:
+            node.start()
+            asyncio.run_coroutine_threadsafe(node.listen(), self.loop)
+
+        self.helpers = []
+        for node in self.helper_nodes:
+            helper = CooperativeMiningWorker(networking=node, workers=1)
+            helper.enabled = True
+            node.register_handler(NetworkingService.MINING_TEMPLATE_TOPIC, lambda payload, _, h=helper: h.handle_template(payload))
+            node.register_handler(NetworkingService.MINING_RANGE_ASSIGN_TOPIC, lambda payload, _, h=helper: h.handle_range_assign(payload))
+            node.register_handler(NetworkingService.MINING_DONE_TOPIC, lambda payload, _, h=helper: h.handle_done(payload))
+            self.helpers.append(helper)
+
+    def _stop_loop(self):
+        async def shutdown():
+            listeners = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in listeners:
+                task.cancel()
+            await asyncio.gather(*listeners, return_exceptions=True)
+            for node in self.nodes:
+                node.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=5)
+        self.loop.close()
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as s:
+            s.bind(("localhost", 0))
+            return s.getsockname()[1]
+
+    def _template(self, difficulty: int) -> Block:
+        reward = Transaction(
+            receiver_address="miner",
+            amount=Decimal("50"),
+            fee=Decimal("0"),
+            kind=TransactionType.MINING_REWARD,
+        )
+        return Block(
+            number=1,
+            previous_hash="0" * 64,
+            nonce=0,
+            miner_address="miner",
+            version=1,
+            difficulty=difficulty,
+            transactions=[reward],
+        )
+
+    @pytest.mark.integration
+    def test_helpers_mine_disjoint_ranges_and_report_solution(self):
+        block = self._template(2 ** 256 // 20000)
+        coordinator = MiningCoordinator(block, networking=self.coordinator_node)
+        self.coordinator_node.register_handler(NetworkingService.MINING_RANGE_REQUEST_TOPIC, lambda payload, _: coordinator.handle_range_request(payload))
+        self.coordinator_node.register_handler(NetworkingService.MINING_SOLUTION_TOPIC, lambda payload, _: coordinator.handle_solution(payload))
+        # Give the subscribers time to connect before publishing
+        time.sleep(0.5)
+
+        with patch.object(MiningCoordinator, "RANGE_SIZE", 2000):
+            coordinator.start()
+            self.assertTrue(coordinator.stop_event.wait(timeout=60))
+        coordinator.stop()
+
+        nonce, block_hash = coordinator.solution
+        self.assertIn(coordinator.solved_by, [helper.node_id for helper in self.helpers])
+        block.nonce = nonce
+        self.assertEqual(block.compute_hash(), block_hash)
+        self.assertTrue(Block._meets_difficulty(block_hash, block.difficulty))
+
+        starts = sorted(start for _, start, _ in coordinator.assigned_ranges)
+        self.assertEqual(starts, [index * 2000 for index in range(len(starts))])
+        self.assertTrue(any(start <= nonce < start + count for _, start, count in coordinator.assigned_ranges))
+
+    @pytest.mark.integration
+    def test_invalid_solutions_are_rejected(self):
+        coordinator = MiningCoordinator(self._template(2 ** 256 // 20000), networking=MagicMock())
+
+        self.assertFalse(coordinator.submit_solution(3, "f" * 64, "peer"))
+        self.assertFalse(coordinator.submit_solution(-1, "0" * 64, "peer"))
+        self.assertIsNone(coordinator.solution)
+        self.assertFalse(coordinator.stop_event.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
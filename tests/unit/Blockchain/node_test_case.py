@@ -0,0 +1,70 @@
+import os
+import unittest
+from decimal import Decimal
+from typing import Optional
+from unittest.mock import patch, MagicMock
+
+from blockchain import Pool
+from blockchain.ledger import Ledger
+from models import Transaction, User
+from services import FileSystemService, InitializationService, NodeFileSystemService
+
+
+class NodeTestCase(unittest.TestCase):
+    """
+    Base for tests against a freshly initialized node: the data roots point at an emptied temporary
+    directory, networking is mocked and the Ledger and Pool singletons start over.
+    """
+
+    def setUp(self):
+        self.start_patch(patch("services.filesystem_service.FileSystemService.get_data_root", side_effect=FileSystemService.get_temp_data_root))
+        self.start_patch(patch("services.node_filesystem_service.NodeFileSystemService.get_data_root", side_effect=self._get_node_temp_root))
+        self.start_patch(patch("services.networking_service.NetworkingService.get_instance")).return_value = MagicMock()
+
+        Ledger.destroy_instance()
+        Pool.destroy_instance()
+        FileSystemService.clear_temp_data_root()
+        NodeFileSystemService._node_data_directory = None
+
+        InitializationService.initialize_application()
+
+    @staticmethod
+    def _get_node_temp_root(self_instance=None, create_if_missing=False):
+        root = os.path.join(FileSystemService.get_temp_data_root(), "node_data")
+        if create_if_missing and not os.path.exists(root):
+            os.makedirs(root)
+        return root
+
+    def start_patch(self, patcher):
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
+
+    def skip_transaction_validation(self):
+        """ Accept any transaction, for tests of bookkeeping on unsigned transactions from made-up addresses. """
+        return self.start_patch(patch("models.transaction.Transaction.validate", return_value=True))
+
+    @staticmethod
+    def create_funded_user(username: str, balance: str = "0") -> User:
+        """ A registered user with a real key pair and the given confirmed balance, for real signing and validation. """
+        from repositories.user import UserRepository
+        user = User.create(username, "password")
+        UserRepository().persist(user)
+        Ledger.get_instance()._balances[user.address] = Decimal(balance)
+        return user
+
+    @staticmethod
+    def signed_transfer(sender: User, receiver_address: str, amount: str, fee: str = "0", timestamp: Optional[str] = None) -> Transaction:
+        """ A transfer signed by the sender, optionally with a fixed timestamp so the age order is deterministic. """
+        transaction = Transaction(
+            receiver_address=receiver_address,
+            amount=Decimal(amount),
+            fee=Decimal(fee),
+            sender_address=sender.address,
+            sender_public_key=sender.public_key,
+        )
+        if timestamp is not None:
+            transaction.timestamp = timestamp
+            transaction._hash = transaction.cryptography_service.sha256_hash(transaction.canonicalize())
+        transaction.sender_signature = sender.sign(transaction.canonicalize().encode())
+        return transaction
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from blockchain import Pool
+from blockchain.admission_pipeline import AdmissionPipeline
+from events import TransactionAddedFromNetworkEvent
+from models import Transaction
+from services import NetworkingService
+
+from node_test_case import NodeTestCase
+
+
+class TestAdmissionPipeline(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        NetworkingService.get_instance().call_soon.side_effect = lambda callback: callback()
+        AdmissionPipeline.destroy_instance()
+        self.addCleanup(AdmissionPipeline.destroy_instance)
+
+        self.sender = self.create_funded_user("sender", "100")
+        self.receiver = self.create_funded_user("receiver")
+
+    def _transfers(self, *amounts: str) -> list[Transaction]:
+        return Transaction.create_many(self.sender, [(self.receiver.address, Decimal(amount), Decimal("0")) for amount in amounts])
+
+    def _wait_for_pipeline(self) -> None:
+        # Signature callbacks run on the worker threads before they exit
+        AdmissionPipeline.get_instance()._executor.shutdown(wait=True)
+
+    def _pool_hashes(self) -> set[str]:
+        return {tx.hash for tx in Pool.get_instance().get_transactions()}
+
+    @pytest.mark.unit
+    def test_network_batch_is_added_once(self):
+        events = []
+        callback = lambda _: events.append(None)
+        TransactionAddedFromNetworkEvent.subscribe(callback)
+        self.addCleanup(TransactionAddedFromNetworkEvent._subscribers.discard, callback)
+        transactions = self._transfers("1", "2", "3")
+
+        Pool.get_instance().handle_network_transactions({"transactions": [tx.to_dict() for tx in transactions]})
+        self._wait_for_pipeline()
+
+        self.assertEqual({tx.hash for tx in transactions}, self._pool_hashes())
+        self.assertEqual(1, len(events))
+        self.assertEqual(0, AdmissionPipeline.get_instance().pending_count)
+        NetworkingService.get_instance().broadcast_new_transactions.assert_not_called()
+
+    @pytest.mark.unit
+    def test_junk_is_rejected_before_signature_verification(self):
+        tampered, unsigned, foreign, valid = (tx.to_dict() for tx in self._transfers("1", "2", "3", "4"))
+        tampered["amount"] = "99"
+        unsigned["sender_signature"] = None
+        foreign["sender_address"] = self.receiver.address
+        duplicate = dict(valid)
+
+        with patch("models.transaction.Transaction.has_valid_signature", return_value=True) as has_valid_signature:
+            Pool.get_instance().handle_network_transactions({"transactions": [tampered, unsigned, foreign, {"hash": "x"}, "junk", valid, duplicate]})
+            self._wait_for_pipeline()
+
+        self.assertEqual(1, has_valid_signature.call_count)
+        self.assertEqual({valid["hash"]}, self._pool_hashes())
+
+    @pytest.mark.unit
+    def test_invalid_signatures_are_rejected(self):
+        forged, valid = (tx.to_dict() for tx in self._transfers("1", "2"))
+        forged["sender_signature"] = valid["sender_signature"]
+
+        Pool.get_instance().handle_network_transactions({"transactions": [forged, valid]})
+        self._wait_for_pipeline()
+
+        self.assertEqual({valid["hash"]}, self._pool_hashes())
+
+    @pytest.mark.unit
+    def test_malformed_key_only_rejects_its_own_transaction(self):
+        valid = [tx.to_dict() for tx in self._transfers("1", "2", "3")]
+        malformed = self._transfers("4")[0]
+        malformed.sender_public_key = "-----BEGIN PUBLIC KEY-----\nnot a key\n-----END PUBLIC KEY-----\n"
+        # Consistent address and hash, so only parsing the key can reject it
+        malformed.sender_address = hashlib.sha256(malformed.sender_public_key.encode("utf-8")).hexdigest()
+        malformed._hash = malformed.cryptography_service.sha256_hash(malformed.canonicalize())
+
+        Pool.get_instance().handle_network_transactions({"transactions": [valid[0], malformed.to_dict(), *valid[1:]]})
+        self._wait_for_pipeline()
+
+        self.assertEqual({tx["hash"] for tx in valid}, self._pool_hashes())
+
+    @pytest.mark.unit
+    def test_batches_are_admitted_in_arrival_order(self):
+        first, second = self._transfers("60", "60")
+        release_first = threading.Event()
+        verify_signatures = AdmissionPipeline._verify_signatures
+
+        def slow_for_first(transactions):
+            if transactions[0].hash == first.hash:
+                release_first.wait(5)
+            return verify_signatures(transactions)
+
+        with patch.object(AdmissionPipeline, "_verify_signatures", side_effect=slow_for_first):
+            Pool.get_instance().handle_network_transaction({"transaction": first.to_dict()})
+            Pool.get_instance().handle_network_transaction({"transaction": second.to_dict()})
+            # The second batch is verified but waits for the first one
+            self.assertEqual(set(), self._pool_hashes())
+            release_first.set()
+            self._wait_for_pipeline()
+
+        # Only one of the two fits the balance, and it is the one that arrived first
+        self.assertEqual({first.hash}, self._pool_hashes())
@@ -0,0 +1,170 @@
+import os
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from blockchain.ledger import Ledger
+from models import Block
+from models.constants import FilesAndDirectories
+from services import InitializationService, NodeFileSystemService
+
+from node_test_case import NodeTestCase
+
+
+class _UncomparedBlock:
+    """ Stands in for a block the store must not look at. """
+
+    @property
+    def calculated_hash(self):
+        raise AssertionError("A block below the stored tail was compared.")
+
+
+class TestBlockStore(NodeTestCase):
+
+    def _add_empty_blocks(self, count: int) -> list[Block]:
+        ledger = Ledger.get_instance()
+        blocks = []
+        for _ in range(count):
+            previous = ledger.get_latest_block()
+            block = Block(
+                number=previous.number + 1,
+                previous_hash=previous.calculated_hash,
+                nonce=0,
+                miner_address="miner",
+                version=1,
+                difficulty=0,
+                transactions=[],
+            )
+            block.calculated_hash = block.compute_hash()
+            ledger.add_block(block)
+            blocks.append(block)
+        return blocks
+
+    @pytest.mark.unit
+    def test_accepted_blocks_are_appended_to_the_store(self):
+        blocks = self._add_empty_blocks(3)
+
+        self.assertEqual(Ledger._block_store.count(), 4)
+        stored = Ledger._block_store.read_all()
+        self.assertEqual([b.calculated_hash for b in stored[1:]], [b.calculated_hash for b in blocks])
+
+        Ledger.destroy_instance()
+        ledger = Ledger.get_instance()
+        self.assertEqual(ledger.get_latest_block().calculated_hash, blocks[-1].calculated_hash)
+        self.assertEqual(ledger.block_count, 4)
+
+    @pytest.mark.unit
+    def test_pickled_ledger_does_not_contain_accepted_blocks(self):
+        self._add_empty_blocks(2)
+        ledger_path = NodeFileSystemService().get_data_file_path(FilesAndDirectories.LEDGER_FILE_NAME)
+        size_with_two_blocks = os.path.getsize(ledger_path)
+
+        self._add_empty_blocks(5)
+
+        self.assertEqual(os.path.getsize(ledger_path), size_with_two_blocks)
+
+    @pytest.mark.unit
+    def test_segments_roll_over_and_pass_integrity_check(self):
+        with patch.object(Ledger._block_store, "SEGMENT_SIZE", 1):
+            self._add_empty_blocks(3)
+
+        fs = NodeFileSystemService()
+        self.assertIn(Ledger._block_store.get_segment_file_name(3), fs.get_file_targets())
+        results = fs.verify_all_data_files()
+        self.assertTrue(all(result["ok"] for result in results.values()), results)
+
+        Ledger.destroy_instance()
+        self.assertEqual(Ledger.get_instance().block_count, 4)
+
+    @pytest.mark.unit
+    def test_store_is_truncated_when_genesis_is_replaced(self):
+        self._add_empty_blocks(2)
+        ledger = Ledger.get_instance()
+        genesis = Block.create_genesis_block()
+        genesis.timestamp = "2025-01-01T00:00:00+00:00"
+        genesis.calculated_hash = genesis.compute_hash()
+
+        ledger._reset_chain()
+        ledger._append_to_chain(genesis)
+        ledger._save()
+
+        self.assertEqual(Ledger._block_store.count(), 1)
+        self.assertEqual(Ledger._block_store.read_all()[0].calculated_hash, genesis.calculated_hash)
+
+    @pytest.mark.unit
+    def test_only_the_tail_is_compared_on_sync(self):
+        self._add_empty_blocks(5)
+        chain = list(Ledger.get_instance()._chain)
+        store = Ledger._block_store
+
+        store.sync([_UncomparedBlock() for _ in chain[:-1]] + chain[-1:])
+
+        self.assertEqual(6, store.count())
+
+    @pytest.mark.unit
+    def test_store_is_truncated_from_a_replaced_block(self):
+        blocks = self._add_empty_blocks(3)
+        ledger = Ledger.get_instance()
+        replacement = Block(number=2, previous_hash=blocks[0].calculated_hash, nonce=0,
+                            miner_address="other miner", version=1, difficulty=0, transactions=[])
+        replacement.calculated_hash = replacement.compute_hash()
+
+        ledger._append_to_chain(replacement)
+        ledger._save()
+
+        stored = Ledger._block_store.read_all()
+        self.assertEqual([b.calculated_hash for b in ledger._chain], [b.calculated_hash for b in stored])
+        self.assertEqual(replacement.calculated_hash, stored[-1].calculated_hash)
+
+    @pytest.mark.unit
+    def test_partial_writes_are_overwritten_by_the_next_append(self):
+        self._add_empty_blocks(1)
+        fs = NodeFileSystemService()
+        # A record and an index entry cut short by a crash
+        with open(fs.get_data_file_path(Ledger._block_store.get_segment_file_name(0)), "ab") as f:
+            f.write(b"partial record")
+        with open(fs.get_data_file_path(FilesAndDirectories.BLOCK_INDEX_FILE_NAME), "ab") as f:
+            f.write(b"partial")
+
+        blocks = self._add_empty_blocks(2)
+
+        Ledger.destroy_instance()
+        stored = Ledger._block_store.read_all()
+        self.assertEqual([b.calculated_hash for b in stored[2:]], [b.calculated_hash for b in blocks])
+        self.assertEqual(Ledger.get_instance().get_latest_block().calculated_hash, blocks[-1].calculated_hash)
+
+    @pytest.mark.unit
+    def test_index_rewritten_with_the_same_size_is_reloaded(self):
+        self._add_empty_blocks(2)
+        store = Ledger._block_store
+        index_path = NodeFileSystemService().get_data_file_path(FilesAndDirectories.BLOCK_INDEX_FILE_NAME)
+        with open(index_path, "rb") as f:
+            data = f.read()
+        entries = [data[i:i + store._INDEX_ENTRY.size] for i in range(0, len(data), store._INDEX_ENTRY.size)]
+        entries[1], entries[2] = entries[2], entries[1]
+        with open(index_path, "wb") as f:
+            f.write(b"".join(entries))
+        os.utime(index_path, ns=(0, 0))
+
+        self.assertEqual(Ledger.get_instance()._chain[2].calculated_hash, store.read_all()[1].calculated_hash)
+
+    @pytest.mark.unit
+    def test_missing_store_files_fail_integrity_check(self):
+        with patch.object(Ledger._block_store, "SEGMENT_SIZE", 1):
+            self._add_empty_blocks(2)
+        fs = NodeFileSystemService()
+        os.remove(fs.get_data_file_path(FilesAndDirectories.BLOCK_INDEX_FILE_NAME))
+        os.remove(fs.get_data_file_path(Ledger._block_store.get_segment_file_name(2)))
+
+        results = fs.verify_all_data_files()
+
+        self.assertEqual("file_missing", results[FilesAndDirectories.BLOCK_INDEX_FILE_NAME]["reason"])
+        self.assertEqual("file_missing", results[Ledger._block_store.get_segment_file_name(2)]["reason"])
+        Ledger.destroy_instance()
+        with self.assertRaises(RuntimeError):
+            InitializationService.initialize_application()
+
+
+if __name__ == '__main__':
+    unittest.main()
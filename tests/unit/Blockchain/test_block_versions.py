@@ -0,0 +1,106 @@
+import hashlib
+import unittest
+from datetime import datetime, timedelta
+
+import pytest
+
+from blockchain.ledger import Ledger
+from blockchain.parallel_chain_validator import _check_block_range
+from models import Block, Transaction
+from models.block import HEADER_HASH_VERSION
+
+from node_test_case import NodeTestCase
+
+
+class TestBlockVersions(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sender = self.create_funded_user("sender", "100")
+        self.receiver = self.create_funded_user("receiver")
+
+    def _block(self, version: int) -> Block:
+        """ A valid block on top of genesis with five signed transfers and the mining reward. """
+        sender, receiver = self.sender, self.receiver
+        transfers = [self.signed_transfer(sender, receiver.address, str(amount)) for amount in range(1, 6)]
+        genesis = Ledger.get_instance().get_latest_block()
+        block = Block(number=1, previous_hash=genesis.calculated_hash, nonce=0, miner_address=receiver.address,
+                      version=version, difficulty=0, transactions=[*transfers, Transaction.create_mining_reward(receiver.address, transfers)])
+        block.merkle_root = block.compute_merkle_root()
+        block.timestamp = (datetime.fromisoformat(genesis.timestamp) + timedelta(minutes=4)).isoformat()
+        block.calculated_hash = block.compute_hash()
+        return block
+
+    @staticmethod
+    def _baseline_hash(block: Block) -> str:
+        """ The block hash as the original implementation computed it, over the header and every transaction. """
+        transactions = ":".join(tx.canonicalize_with_signature_and_hash() for tx in block.transactions)
+        canonical = (f"{block.number}|{block.previous_hash}|{block.timestamp}|{block.nonce}|{block.miner_address}|"
+                     f"{block.version}|{block.merkle_root}|{block.difficulty}|TRANSACTIONS|{transactions}")
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @pytest.mark.unit
+    def test_chains_in_the_baseline_format_still_validate(self):
+        ledger = Ledger.get_instance()
+        genesis = ledger.get_latest_block()
+        self.assertEqual(self._baseline_hash(genesis), genesis.calculated_hash)
+
+        block = self._block(version=1)
+        self.assertEqual(self._baseline_hash(block), block.calculated_hash)
+        ledger.add_block(block)
+
+        Ledger.destroy_instance()
+        ledger = Ledger.get_instance()
+        self.assertEqual(block.calculated_hash, ledger.get_latest_block().calculated_hash)
+        # The funds were made up outside the chain; the structure, Merkle root and hash are still checked
+        self.skip_transaction_validation()
+        self.assertEqual((True, []), ledger.validate_chain())
+
+    @pytest.mark.unit
+    def test_new_blocks_are_hashed_over_their_header(self):
+        block = self._block(version=HEADER_HASH_VERSION)
+        self.assertNotEqual(self._baseline_hash(block), block.calculated_hash)
+        self.assertEqual(block.calculated_hash, block.get_header().compute_hash())
+        self.assertTrue(block.validate(Ledger.get_instance().get_latest_block()).valid)
+
+        # A version 1 header commits to transactions it does not carry, so it cannot be rehashed
+        legacy_block = self._block(version=1)
+        self.assertIsNone(legacy_block.get_header().compute_hash())
+        genesis = Ledger.get_instance().get_latest_block()
+        self.assertEqual(genesis.calculated_hash, genesis.get_header().compute_hash())
+
+    @pytest.mark.unit
+    def test_versions_cannot_go_down(self):
+        block = self._block(version=HEADER_HASH_VERSION)
+        Ledger.get_instance().add_block(block)
+
+        legacy_block = Block(number=2, previous_hash=block.calculated_hash, nonce=0, miner_address=block.miner_address,
+                             version=1, difficulty=0, transactions=list(block.transactions))
+        legacy_block.calculated_hash = legacy_block.compute_hash()
+
+        self.assertIn("Block version cannot be lower than the previous block version.", legacy_block.validate(block).reasons)
+        valid, reasons = legacy_block.get_header().validate(block.get_header())
+        self.assertFalse(valid)
+        self.assertIn("Version cannot be lower than the previous header's.", reasons)
+
+    @pytest.mark.unit
+    def test_relayed_block_with_a_tampered_transaction_is_rejected(self):
+        block = self._block(version=HEADER_HASH_VERSION)
+        genesis = Ledger.get_instance().get_latest_block()
+        data = block.to_dict()
+        # Still affordable, only the transaction hash gives the change away
+        data["transactions"][0]["amount"] = "50"
+
+        relayed = Block.from_dict(data)
+
+        self.assertEqual(block.calculated_hash, relayed.compute_hash())
+        result = relayed.validate(genesis)
+        self.assertFalse(result.valid)
+        self.assertIn("Transaction hash does not match its content.", result.reasons)
+        self.assertIn(relayed.transactions[0], result.invalid_transactions)
+        [(reasons, _)] = _check_block_range([relayed], genesis)
+        self.assertIn("Transaction hash does not match its content.", reasons)
+
+
+if __name__ == '__main__':
+    unittest.main()
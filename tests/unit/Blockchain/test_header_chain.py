@@ -0,0 +1,190 @@
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from blockchain.header_chain import HeaderChain
+from blockchain.ledger import Ledger
+from exceptions.mining import InvalidBlockException
+from models import Block, BlockHeader, Transaction
+from models.block import HEADER_HASH_VERSION
+from models.enum import TransactionType
+from services import InitializationService, NetworkingService
+from services.difficulty_service import DifficultyService, MAX_TARGET
+
+from node_test_case import NodeTestCase
+
+
+class TestHeaderChain(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # An easy target, about four attempts a block
+        self.start_patch(patch.object(DifficultyService.cfg, "default_difficulty", MAX_TARGET // 4))
+
+        # The same process plays the full node (Ledger) and the light node (HeaderChain)
+        HeaderChain.destroy_instance()
+        self.addCleanup(HeaderChain.destroy_instance)
+        InitializationService._initialize_light_client()
+
+    @staticmethod
+    def _mine(block: Block) -> Block:
+        block.calculated_hash = block.compute_hash()
+        while not Block._meets_difficulty(block.calculated_hash, block.difficulty):
+            block.nonce += 1
+            block.calculated_hash = block.compute_hash()
+        return block
+
+    def _add_block(self, transactions: list[Transaction]) -> Block:
+        ledger = Ledger.get_instance()
+        previous = ledger.get_latest_block()
+        block = self._mine(Block(
+            number=previous.number + 1,
+            previous_hash=previous.calculated_hash,
+            nonce=0,
+            miner_address="miner",
+            version=HEADER_HASH_VERSION,
+            difficulty=DifficultyService.next_difficulty(ledger._get_chain_ordered()),
+            transactions=transactions,
+        ))
+        ledger.add_block(block)
+        return block
+
+    @staticmethod
+    def _header(previous_hash: str, difficulty: int, calculated_hash: str = None) -> BlockHeader:
+        header = BlockHeader(number=2, previous_hash=previous_hash, timestamp="t", nonce=0, miner_address="miner",
+                             version=HEADER_HASH_VERSION, merkle_root=None, difficulty=difficulty, calculated_hash=None)
+        header.calculated_hash = calculated_hash or header.compute_hash()
+        while calculated_hash is None and difficulty and not Block._meets_difficulty(header.calculated_hash, difficulty):
+            header.nonce += 1
+            header.calculated_hash = header.compute_hash()
+        return header
+
+    def _transfer(self, sender: str, receiver: str) -> Transaction:
+        transaction = Transaction(
+            receiver_address=receiver,
+            amount=Decimal(1),
+            fee=Decimal(0),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+        transaction.sender_signature = "signature"
+        return transaction
+
+    def _sync_headers(self, after_number: int = -1) -> dict:
+        """ Let the full node answer a header request and hand the answer to the light node. """
+        networking = NetworkingService.get_instance()
+        networking.send_headers.reset_mock()
+        Ledger.get_instance().handle_header_sync_request({"after_number": after_number, "max": HeaderChain.SYNC_BATCH_SIZE})
+        payload = {"headers": networking.send_headers.call_args.args[0]}
+        HeaderChain.get_instance().handle_network_headers(payload)
+        return payload
+
+    @pytest.mark.unit
+    def test_syncs_headers_of_the_accepted_chain(self):
+        blocks = [self._add_block([self._transfer(f"sender{i}", "receiver")]) for i in range(3)]
+        self._sync_headers()
+        header_chain = HeaderChain.get_instance()
+
+        ledger_chain = Ledger.get_instance()._get_chain_ordered()
+        self.assertEqual([block.calculated_hash for block in ledger_chain],
+                         [header_chain.get_header_by_number(n).calculated_hash for n in range(header_chain.height + 1)])
+        self.assertEqual(blocks[-1].get_header(), header_chain.get_latest_header())
+        self.assertEqual(blocks[1].merkle_root, header_chain.get_header(blocks[1].calculated_hash).merkle_root)
+
+        # Headers survive a restart without any block data
+        HeaderChain.destroy_instance()
+        self.assertEqual(3, HeaderChain.get_instance().height)
+
+    @pytest.mark.unit
+    def test_rejects_headers_with_bad_linkage_or_proof_of_work(self):
+        self._add_block([])
+        self._sync_headers()
+        header_chain = HeaderChain.get_instance()
+        latest = header_chain.get_latest_header()
+
+        expected = DifficultyService.next_difficulty(
+            [header_chain.get_header_by_number(n) for n in range(header_chain.height + 1)])
+
+        invalid_headers = [
+            self._header("0" * 64, expected),                                     # unlinked
+            self._header(latest.calculated_hash, 0),                              # no target at all
+            self._header(latest.calculated_hash, expected // 2),                  # mined, but not at the chain's target
+            self._header(latest.calculated_hash, expected, calculated_hash="0" * 64),  # hash not of the header fields
+        ]
+        for header in invalid_headers:
+            with self.assertRaises(InvalidBlockException):
+                header_chain.add_header(header)
+        header_chain.handle_network_headers({"headers": [header.to_dict() for header in invalid_headers]})
+        self.assertEqual(latest, header_chain.get_latest_header())
+
+        header = self._header(latest.calculated_hash, expected)
+        header_chain.add_header(header)
+        self.assertEqual(header, header_chain.get_latest_header())
+
+    @pytest.mark.unit
+    def test_confirms_watched_transactions_with_merkle_proofs(self):
+        transactions = [self._transfer(f"sender{i}", "receiver") for i in range(5)]
+        block = self._add_block(transactions)
+        self._sync_headers()
+        header_chain = HeaderChain.get_instance()
+        networking = NetworkingService.get_instance()
+
+        header_chain.watch_transaction(transactions[2].hash)
+        networking.request_merkle_proof.assert_called_with(transactions[2].hash)
+        proof = Ledger.get_instance().get_merkle_proof(transactions[2].hash)
+
+        forged = proof.to_dict()
+        forged["tx_hash"] = transactions[3].hash
+        header_chain.handle_merkle_proof_response({"proof": forged})
+        self.assertEqual(0, header_chain.get_confirmations(transactions[2].hash))
+
+        header_chain.handle_merkle_proof_response({"proof": proof.to_dict()})
+        self.assertEqual(1, header_chain.get_confirmations(transactions[2].hash))
+        self._add_block([])
+        self._sync_headers(after_number=block.number)
+        self.assertEqual(2, header_chain.get_confirmations(transactions[2].hash))
+
+        # A header for a lower height cannot replace the block holding the transaction
+        replacement = self._mine(Block(number=block.number, previous_hash=block.previous_hash, nonce=0,
+                                       miner_address="other miner", version=HEADER_HASH_VERSION, difficulty=block.difficulty, transactions=[]))
+        with self.assertRaises(InvalidBlockException):
+            header_chain.add_header(replacement.get_header())
+        header_chain.handle_network_headers({"headers": [replacement.get_header().to_dict()]})
+        self.assertEqual(block.calculated_hash, header_chain.get_header_by_number(block.number).calculated_hash)
+        self.assertEqual(2, header_chain.get_confirmations(transactions[2].hash))
+
+    @pytest.mark.unit
+    def test_confirms_transactions_of_watched_addresses(self):
+        transactions = [self._transfer(f"sender{i}", "receiver" if i % 2 == 0 else "other") for i in range(5)]
+        self._add_block(transactions)
+        self._sync_headers()
+        header_chain = HeaderChain.get_instance()
+        networking = NetworkingService.get_instance()
+
+        header_chain.watch_address("receiver")
+        networking.request_address_proofs.assert_called_with("receiver", after_number=-1)
+
+        # The full node answers with a proof and the transaction for each transaction of the address
+        networking.send_merkle_proof.reset_mock()
+        Ledger.get_instance().handle_address_proofs_request({"address": "receiver", "after_number": -1})
+        responses = [{"proof": call.args[0], "transaction": call.args[1]} for call in networking.send_merkle_proof.call_args_list]
+        self.assertEqual(3, len(responses))
+
+        # A transaction of another address, relabelled or passed off with the proof of a watched one, is not confirmed
+        other_proof = Ledger.get_instance().get_merkle_proof(transactions[1].hash).to_dict()
+        relabelled = transactions[1].to_dict() | {"receiver_address": "receiver"}
+        header_chain.handle_merkle_proof_response({"proof": other_proof, "transaction": relabelled})
+        header_chain.handle_merkle_proof_response({"proof": other_proof, "transaction": transactions[0].to_dict()})
+        self.assertEqual(0, header_chain.get_confirmations(transactions[1].hash))
+
+        for response in responses:
+            header_chain.handle_merkle_proof_response(response)
+        self.assertEqual([1, 0, 1, 0, 1], [header_chain.get_confirmations(tx.hash) for tx in transactions])
+
+        # Only blocks after the previous headers are asked about once new headers arrive
+        latest_number = header_chain.height
+        self._add_block([])
+        self._sync_headers(after_number=latest_number)
+        networking.request_address_proofs.assert_called_with("receiver", after_number=latest_number)
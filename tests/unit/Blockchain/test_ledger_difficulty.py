@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime, timedelta
+
+import pytest
+
+from blockchain.ledger import Ledger
+from models import Block
+from services import DifficultyService
+
+from node_test_case import NodeTestCase
+
+
+class TestLedgerDifficulty(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        DifficultyService.reset()
+        self.addCleanup(DifficultyService.reset)
+
+    def _add_blocks(self, durations: list[float]) -> list[Block]:
+        """ Add blocks timestamped the required spacing plus the given duration after the previous one. """
+        ledger = Ledger.get_instance()
+        blocks = []
+        for duration in durations:
+            previous = ledger.get_latest_block()
+            block = Block(
+                number=previous.number + 1,
+                previous_hash=previous.calculated_hash,
+                nonce=0,
+                miner_address="miner",
+                version=1,
+                difficulty=DifficultyService.current_difficulty,
+                transactions=[],
+            )
+            previous_time = datetime.fromisoformat(previous.timestamp)
+            block.timestamp = (previous_time + timedelta(seconds=DifficultyService.cfg.block_spacing + duration)).isoformat()
+            block.calculated_hash = block.compute_hash()
+            ledger.add_block(block)
+            blocks.append(block)
+        return blocks
+
+    @pytest.mark.unit
+    def test_accepted_blocks_retarget_difficulty(self):
+        start = DifficultyService.current_difficulty
+        blocks = self._add_blocks([1.0, 1.0])
+
+        # The first block after genesis has no spacing rule and does not count; then one very fast
+        # block: the target shrinks by the clamped 5%
+        self.assertEqual(blocks[1].difficulty, start)
+        self.assertEqual(DifficultyService.current_difficulty, int(start * 0.95))
+
+    @pytest.mark.unit
+    def test_difficulty_survives_restart(self):
+        window = DifficultyService.cfg.window_size
+        self._add_blocks([1.0, 30.0, 2.0] * window)
+        expected = DifficultyService.current_difficulty
+        self.assertNotEqual(expected, DifficultyService.cfg.default_difficulty)
+
+        Ledger.destroy_instance()
+        DifficultyService.reset()
+        Ledger.get_instance()
+
+        self.assertEqual(DifficultyService.current_difficulty, expected)
+        self.assertEqual(list(DifficultyService.state.times), ([1.0, 30.0, 2.0] * window)[-window:])
+
+    @pytest.mark.unit
+    def test_rebuild_matches_incremental_updates(self):
+        blocks = self._add_blocks([3.0, 40.0, 12.0, 5.0, 15.0, 1.0, 22.0, 9.0, 14.0, 16.0, 2.0, 30.0])
+        incremental = DifficultyService.current_difficulty
+
+        DifficultyService.rebuild_from_blocks([Ledger.get_instance().get_block_by_number(0)] + blocks)
+
+        self.assertEqual(DifficultyService.current_difficulty, incremental)
+
+    @pytest.mark.unit
+    def test_mined_duration_does_not_affect_the_difficulty(self):
+        blocks = self._add_blocks([3.0, 40.0, 12.0, 5.0, 15.0])
+        chain = Ledger.get_instance()._get_chain_ordered()
+
+        # Another node gets the same blocks with mined_duration rewritten on the way
+        relayed = [Block.from_dict(block.to_dict()) for block in chain]
+        for block in relayed:
+            block.mined_duration = 0.001
+        self.assertEqual([block.calculated_hash for block in chain], [block.compute_hash() for block in relayed])
+
+        self.assertEqual(DifficultyService.next_difficulty(chain), DifficultyService.next_difficulty(relayed))
+        self.assertEqual(DifficultyService.next_difficulty([block.get_header() for block in chain]),
+                         DifficultyService.next_difficulty([block.get_header() for block in relayed]))
+        self.assertEqual(DifficultyService.current_difficulty, DifficultyService.next_difficulty(relayed))
+        self.assertNotEqual(blocks[-1].difficulty, DifficultyService.current_difficulty)
+
+    @pytest.mark.unit
+    def test_replacing_genesis_resets_difficulty(self):
+        self._add_blocks([1.0, 1.0])
+        ledger = Ledger.get_instance()
+        genesis = Block.create_genesis_block()
+        genesis.timestamp = "2025-01-01T00:00:00+00:00"
+        genesis.calculated_hash = genesis.compute_hash()
+
+        ledger._reset_chain()
+        ledger._append_to_chain(genesis)
+
+        self.assertEqual(DifficultyService.current_difficulty, DifficultyService.cfg.default_difficulty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from blockchain.ledger import Ledger
+from models import Block, Transaction
+from models.enum import TransactionType
+
+from node_test_case import NodeTestCase
+
+
+class TestLedgerIndexes(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+    def _add_block(self, transactions: list[Transaction]) -> Block:
+        ledger = Ledger.get_instance()
+        previous = ledger.get_latest_block()
+        block = Block(
+            number=previous.number + 1,
+            previous_hash=previous.calculated_hash,
+            nonce=0,
+            miner_address="miner",
+            version=1,
+            difficulty=0,
+            transactions=transactions,
+        )
+        block.calculated_hash = block.compute_hash()
+        ledger.add_block(block)
+        return block
+
+    def _add_empty_blocks(self, count: int) -> list[Block]:
+        return [self._add_block([]) for _ in range(count)]
+
+    def _transfer(self, sender: str, receiver: str) -> Transaction:
+        transaction = Transaction(
+            receiver_address=receiver,
+            amount=Decimal(1),
+            fee=Decimal(0),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+        transaction.sender_signature = "signature"
+        return transaction
+
+    @pytest.mark.unit
+    def test_get_block_by_number_uses_height_index(self):
+        blocks = self._add_empty_blocks(3)
+        ledger = Ledger.get_instance()
+
+        self.assertEqual(ledger.get_block_by_number(0).number, 0)
+        for block in blocks:
+            self.assertIs(ledger.get_block_by_number(block.number), block)
+            self.assertEqual(ledger.get_block_hash_by_number(block.number), block.calculated_hash)
+        self.assertIsNone(ledger.get_block_by_number(4))
+
+    @pytest.mark.unit
+    def test_chain_ordered_and_latest_n_blocks(self):
+        blocks = self._add_empty_blocks(3)
+        ledger = Ledger.get_instance()
+
+        self.assertEqual([b.number for b in ledger._get_chain_ordered()], [0, 1, 2, 3])
+        self.assertEqual([b.number for b in ledger.get_n_blocks(2)], [3, 2])
+        self.assertIs(ledger.get_latest_block(), blocks[-1])
+
+    @pytest.mark.unit
+    def test_indexes_are_rebuilt_on_load(self):
+        blocks = self._add_empty_blocks(2)
+
+        Ledger.destroy_instance()
+        ledger = Ledger.get_instance()
+
+        self.assertEqual([b.number for b in ledger._get_chain_ordered()], [0, 1, 2])
+        self.assertEqual(ledger.get_block_by_number(2).calculated_hash, blocks[-1].calculated_hash)
+
+    @pytest.mark.unit
+    def test_transactions_for_address_use_address_index(self):
+        tx_in = self._transfer("bob", "alice")
+        tx_other = self._transfer("bob", "carol")
+        first = self._add_block([tx_in, tx_other])
+        tx_out = self._transfer("alice", "carol")
+        second = self._add_block([tx_out])
+        ledger = Ledger.get_instance()
+
+        pairs = ledger.get_confirmed_transactions_for_address("alice")
+        self.assertEqual([(b.number, tx.hash) for b, tx in pairs], [(first.number, tx_in.hash), (second.number, tx_out.hash)])
+        self.assertEqual([tx.hash for tx in ledger.get_transactions_for_address("bob")], [tx_in.hash, tx_other.hash])
+        self.assertEqual(ledger.get_transactions_for_address("nobody"), [])
+
+        Ledger.destroy_instance()
+        reloaded = Ledger.get_instance()
+        self.assertEqual(len(reloaded.get_confirmed_transactions_for_address("carol")), 2)
+
+    @pytest.mark.unit
+    def test_balances_follow_accepted_blocks(self):
+        reward = Transaction.create_signup_reward("alice")
+        self._add_block([reward])
+        transfer = self._transfer("alice", "bob")
+        transfer.fee = Decimal("0.5")
+        self._add_block([transfer])
+        ledger = Ledger.get_instance()
+
+        self.assertEqual(ledger.get_balance("alice"), Decimal("48.5"))
+        self.assertEqual(ledger.get_balance("bob"), Decimal("1"))
+        self.assertEqual(ledger.get_balance("nobody"), Decimal("0"))
+
+        Ledger.destroy_instance()
+        self.assertEqual(Ledger.get_instance().get_balance("alice"), Decimal("48.5"))
+
+    @pytest.mark.unit
+    def test_load_indexes_only_the_blocks_after_the_index_snapshot(self):
+        with patch.object(Ledger, "INDEX_SNAPSHOT_INTERVAL", 3), patch.object(Ledger, "_index_snapshot_height", -1):
+            blocks = [self._add_block([self._transfer("bob", "alice")]) for _ in range(4)]
+            # Genesis and the first two blocks make up the first snapshot
+            self.assertEqual(2, Ledger._index_snapshot_height)
+
+            Ledger.destroy_instance()
+            with patch.object(Ledger, "_index_transactions", autospec=True, side_effect=Ledger._index_transactions) as index_mock:
+                ledger = Ledger.get_instance()
+
+        self.assertEqual([3, 4], [call.args[1].number for call in index_mock.call_args_list])
+        self.assertEqual([block.number for block in blocks],
+                         [block.number for block, _ in ledger.get_confirmed_transactions_for_address("alice")])
+        self.assertEqual(Decimal("4"), ledger.get_balance("alice"))
+        self.assertEqual((blocks[0].number, 0), ledger._tx_location_by_hash[blocks[0].transactions[0].hash])
+
+    @pytest.mark.unit
+    def test_replaced_blocks_are_dropped(self):
+        blocks = self._add_empty_blocks(3)
+        ledger = Ledger.get_instance()
+        replacement = Block(number=2, previous_hash=blocks[0].calculated_hash, nonce=0,
+                            miner_address="other miner", version=1, difficulty=0, transactions=[])
+        replacement.calculated_hash = replacement.compute_hash()
+
+        stale_blocks = ledger._append_to_chain(replacement)
+
+        self.assertEqual([blocks[1], blocks[2]], stale_blocks)
+        self.assertEqual(len(ledger._get_chain_ordered()), ledger.block_count)
+        self.assertEqual({b.calculated_hash for b in ledger._get_chain_ordered()},
+                         {b.calculated_hash for b in ledger.get_all_blocks()})
+        self.assertIsNone(ledger.get_block(blocks[2].calculated_hash))
+
+    @pytest.mark.unit
+    def test_index_snapshot_of_a_replaced_chain_is_ignored(self):
+        with patch.object(Ledger, "INDEX_SNAPSHOT_INTERVAL", 1), patch.object(Ledger, "_index_snapshot_height", -1):
+            self._add_block([self._transfer("bob", "alice")])
+        ledger = Ledger.get_instance()
+        genesis = Block.create_genesis_block()
+        genesis.timestamp = "2025-01-01T00:00:00+00:00"
+        genesis.calculated_hash = genesis.compute_hash()
+        ledger._reset_chain()
+        ledger._append_to_chain(genesis)
+        ledger._save()
+
+        Ledger.destroy_instance()
+
+        self.assertEqual([], Ledger.get_instance().get_confirmed_transactions_for_address("alice"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+
+from decimal import Decimal
+
+import pytest
+
+from blockchain.ledger import Ledger
+from events import MerkleProofReceivedFromNetworkEvent
+from models import Block, Transaction
+from models.dto import MerkleProof
+from models.enum import TransactionType
+from services import NetworkingService
+
+from node_test_case import NodeTestCase
+
+
+class TestMerkleProofs(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+    def _add_block(self, transactions: list[Transaction]) -> Block:
+        ledger = Ledger.get_instance()
+        previous = ledger.get_latest_block()
+        block = Block(
+            number=previous.number + 1,
+            previous_hash=previous.calculated_hash,
+            nonce=0,
+            miner_address="miner",
+            version=1,
+            difficulty=0,
+            transactions=transactions,
+        )
+        block.calculated_hash = block.compute_hash()
+        ledger.add_block(block)
+        return block
+
+    def _transfer(self, sender: str, receiver: str) -> Transaction:
+        transaction = Transaction(
+            receiver_address=receiver,
+            amount=Decimal(1),
+            fee=Decimal(0),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+        transaction.sender_signature = "signature"
+        return transaction
+
+    @pytest.mark.unit
+    def test_proofs_verify_for_every_transaction_in_a_block(self):
+        for count in (1, 2, 5, 7):
+            transactions = [self._transfer(f"sender{count}-{i}", "receiver") for i in range(count)]
+            block = self._add_block(transactions)
+            for tx in transactions:
+                proof = block.get_merkle_proof(tx.hash)
+                self.assertTrue(proof.verify(block.merkle_root), f"{count} transactions")
+                self.assertTrue(block.verify_merkle_proof(proof))
+            self.assertIsNone(block.get_merkle_proof("0" * 64))
+
+    @pytest.mark.unit
+    def test_tampered_proofs_are_rejected(self):
+        transactions = [self._transfer(f"sender{i}", "receiver") for i in range(5)]
+        block = self._add_block(transactions)
+        proof = block.get_merkle_proof(transactions[2].hash)
+
+        other_tx = self._transfer("someone else", "receiver")
+        self.assertFalse(MerkleProof(other_tx.hash, proof.block_number, proof.block_hash, proof.branch).verify(block.merkle_root))
+        flipped = [(sibling, "left" if side == "right" else "right") for sibling, side in proof.branch]
+        self.assertFalse(MerkleProof(proof.tx_hash, proof.block_number, proof.block_hash, flipped).verify(block.merkle_root))
+        self.assertFalse(MerkleProof(proof.tx_hash, proof.block_number, proof.block_hash, [("zz", "left")]).verify(block.merkle_root))
+        self.assertFalse(proof.verify(None))
+
+    @pytest.mark.unit
+    def test_ledger_proofs_follow_the_accepted_chain(self):
+        transactions = [self._transfer(f"sender{i}", "receiver") for i in range(3)]
+        block = self._add_block(transactions)
+        ledger = Ledger.get_instance()
+
+        proof = ledger.get_merkle_proof(transactions[1].hash)
+        self.assertEqual((block.number, block.calculated_hash), (proof.block_number, proof.block_hash))
+        self.assertTrue(MerkleProof.from_dict(proof.to_dict()).verify(block.merkle_root))
+        self.assertIsNone(ledger.get_merkle_proof("0" * 64))
+
+        # Replacing the block drops its transactions from the index
+        ledger._append_to_chain(Block(number=block.number, previous_hash=block.previous_hash, nonce=1,
+                                      miner_address="miner", version=1, difficulty=0, transactions=[]))
+        self.assertIsNone(ledger.get_merkle_proof(transactions[1].hash))
+
+    @pytest.mark.unit
+    def test_network_proof_request_and_response(self):
+        transactions = [self._transfer(f"sender{i}", "receiver") for i in range(4)]
+        block = self._add_block(transactions)
+        ledger = Ledger.get_instance()
+        networking = NetworkingService.get_instance()
+
+        ledger.handle_merkle_proof_request({"tx_hash": transactions[3].hash})
+        proof_payload = networking.send_merkle_proof.call_args.args[0]
+
+        received = []
+        MerkleProofReceivedFromNetworkEvent.subscribe(received.append)
+        self.addCleanup(MerkleProofReceivedFromNetworkEvent._subscribers.discard, received.append)
+        ledger.handle_merkle_proof_response({"proof": proof_payload})
+        self.assertEqual([transactions[3].hash], [proof.tx_hash for proof in received])
+
+        proof_payload["tx_hash"] = transactions[0].hash
+        ledger.handle_merkle_proof_response({"proof": proof_payload})
+        ledger.handle_merkle_proof_response({"proof": {"tx_hash": "x"}})
+        self.assertEqual(1, len(received))
@@ -0,0 +1,185 @@
+import hashlib
+import itertools
+import time
+import unittest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from blockchain import Pool
+from blockchain.cooperative_mining import MiningCoordinator
+from blockchain.ledger import Ledger
+from blockchain.mining_job import MiningJob
+from exceptions.mining import InvalidBlockException
+from models import Block, Transaction
+from models.enum import TransactionType, MiningJobState
+from services import NetworkingService
+
+from node_test_case import NodeTestCase
+
+
+class TestMiningJob(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.skip_transaction_validation()
+        # No listen loop runs in tests, hand solved blocks straight to the ledger like call_soon does then
+        NetworkingService.get_instance().call_soon.side_effect = lambda callback: callback()
+
+    def _create_job(self, difficulty: int) -> MiningJob:
+        reward = Transaction(
+            receiver_address="miner",
+            amount=Decimal("50"),
+            fee=Decimal("0"),
+            kind=TransactionType.MINING_REWARD,
+        )
+        template = Block(
+            number=1,
+            previous_hash="0" * 64,
+            nonce=0,
+            miner_address="miner",
+            version=1,
+            difficulty=difficulty,
+            transactions=[reward],
+        )
+        with patch("models.block.Block.create_block_template", return_value=template):
+            job = MiningJob(MagicMock(), [], workers=1)
+        self.addCleanup(MiningJob.cancel_active, "Test finished.")
+        return job
+
+    def _start_job(self, difficulty: int) -> MiningJob:
+        return self._create_job(difficulty).start()
+
+    @staticmethod
+    def _wait_until_scheduled(scheduled: list, timeout: float = 30) -> None:
+        deadline = time.monotonic() + timeout
+        while not scheduled and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    @pytest.mark.unit
+    def test_solved_block_is_submitted(self):
+        with patch.object(Ledger, "submit_block") as submit_block:
+            job = self._start_job(2 ** 256 // 100)
+            self.assertTrue(job.wait(timeout=30))
+
+        self.assertEqual(job.state, MiningJobState.SOLVED)
+        submit_block.assert_called_once_with(job.block)
+        self.assertTrue(Block._meets_difficulty(job.block.calculated_hash, job.block.difficulty))
+        self.assertIsNotNone(job.block.mined_duration)
+        self.assertIsNone(MiningJob.get_active())
+
+        progress = job.get_progress()
+        self.assertGreater(progress.attempts, 0)
+        self.assertGreater(progress.attempts_per_second, 0)
+        self.assertIsNotNone(progress.expected_seconds_to_solution)
+
+    @pytest.mark.unit
+    def test_solved_block_is_submitted_on_the_listen_loop(self):
+        scheduled = []
+        NetworkingService.get_instance().call_soon.side_effect = scheduled.append
+
+        with patch.object(Ledger, "submit_block") as submit_block:
+            job = self._start_job(2 ** 256 // 100)
+            self._wait_until_scheduled(scheduled)
+            # Solved, but the listen loop did not run the submission yet
+            self.assertEqual(1, len(scheduled))
+            self.assertFalse(job.is_finished)
+            submit_block.assert_not_called()
+
+            scheduled[0]()
+
+        self.assertTrue(job.wait(timeout=0))
+        self.assertEqual(job.state, MiningJobState.SOLVED)
+        submit_block.assert_called_once_with(job.block)
+
+    @pytest.mark.unit
+    def test_job_cancelled_before_submission_is_not_submitted(self):
+        scheduled = []
+        NetworkingService.get_instance().call_soon.side_effect = scheduled.append
+
+        with patch.object(Ledger, "submit_block") as submit_block:
+            job = self._start_job(2 ** 256 // 100)
+            self._wait_until_scheduled(scheduled)
+            job.cancel("A competing block arrived from the network.")
+            scheduled[0]()
+
+        self.assertEqual(job.state, MiningJobState.CANCELLED)
+        submit_block.assert_not_called()
+
+    @pytest.mark.unit
+    def test_block_solved_by_a_peer_is_submitted(self):
+        job = self._create_job(2 ** 256 // 100)
+        job.cooperative = True
+
+        # The local search finds nothing, it only stops once the peer's solution is in
+        def mine_nothing(block, stop_event, nonce_count=None):
+            stop_event.wait(30)
+            return False
+        job._miner.mine = mine_nothing
+
+        with patch.object(Ledger, "submit_block") as submit_block:
+            job.start()
+            deadline = time.monotonic() + 30
+            while MiningCoordinator._active is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            coordinator = MiningCoordinator._active
+            nonce, block_hash = next(
+                (n, h) for n in itertools.count()
+                for h in [hashlib.sha256(coordinator._prefix + b"%d" % n + coordinator._suffix).hexdigest()]
+                if Block._meets_difficulty(h, job.block.difficulty)
+            )
+            MiningCoordinator.route_solution({"job_id": coordinator.job_id, "nonce": nonce, "block_hash": block_hash, "node_id": "peer"})
+            self.assertTrue(job.wait(timeout=30))
+
+        self.assertEqual(job.state, MiningJobState.SOLVED)
+        self.assertIsNone(job.cancel_reason)
+        self.assertEqual((nonce, block_hash), (job.block.nonce, job.block.calculated_hash))
+        submit_block.assert_called_once_with(job.block)
+
+    @pytest.mark.unit
+    def test_marked_transaction_change_cancels_active_job(self):
+        # Practically unsolvable target, so the job keeps running until cancelled
+        job = self._start_job(1)
+        self.assertIs(MiningJob.get_active(), job)
+
+        Pool.get_instance().unmark_all_transaction()
+
+        self.assertTrue(job.wait(timeout=10))
+        self.assertEqual(job.state, MiningJobState.CANCELLED)
+        self.assertEqual(job.cancel_reason, "The transactions marked for the block changed.")
+        self.assertEqual(job.block.calculated_hash, "")
+
+    @pytest.mark.unit
+    def test_only_accepted_network_blocks_cancel_active_job(self):
+        job = self._start_job(1)
+        network_block = {"block_data": Block.create_genesis_block().to_dict()}
+        network_block["block_data"]["number"] = 1
+        network_block["block_data"]["calculated_hash"] = "f" * 64
+
+        with patch.object(Ledger, "submit_block", side_effect=InvalidBlockException("Invalid")):
+            Ledger.get_instance().handle_network_block(network_block)
+        self.assertFalse(job.wait(timeout=0.5))
+        self.assertEqual(job.state, MiningJobState.RUNNING)
+
+        with patch.object(Ledger, "submit_block"):
+            Ledger.get_instance().handle_network_block(network_block)
+        self.assertTrue(job.wait(timeout=10))
+        self.assertEqual(job.cancel_reason, "A competing block arrived from the network.")
+
+    @pytest.mark.unit
+    def test_starting_a_new_job_supersedes_the_old_one(self):
+        first = self._start_job(1)
+        second = self._start_job(1)
+
+        self.assertTrue(first.wait(timeout=10))
+        self.assertEqual(first.state, MiningJobState.CANCELLED)
+        self.assertIs(MiningJob.get_active(), second)
+
+        second.cancel()
+        self.assertTrue(second.wait(timeout=10))
+        self.assertEqual(second.cancel_reason, "Cancelled by the user.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import base64
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from blockchain.parallel_chain_validator import ParallelChainValidator, _check_block_range
+from models import Block, Transaction
+from models.enum import TransactionType
+
+
+class TestParallelChainValidator(unittest.TestCase):
+
+    def _build_chain(self, length: int) -> list[Block]:
+        genesis = Block.create_genesis_block()
+        genesis.calculated_hash = genesis.compute_hash()
+        chain = [genesis]
+        for number in range(1, length):
+            reward = Transaction(
+                receiver_address="miner",
+                amount=Decimal("50"),
+                fee=Decimal("0"),
+                kind=TransactionType.MINING_REWARD,
+            )
+            block = Block(
+                number=number,
+                previous_hash=chain[-1].calculated_hash,
+                nonce=0,
+                miner_address="miner",
+                version=1,
+                difficulty=2 ** 256,
+                transactions=[reward],
+            )
+            block.calculated_hash = block.compute_hash()
+            chain.append(block)
+        return chain
+
+    def _signed_transfer(self, tamper: bool = False) -> Transaction:
+        private_key = Ed25519PrivateKey.generate()
+        public_key_pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode("ascii")
+        transaction = Transaction(
+            receiver_address="bob",
+            amount=Decimal("1"),
+            fee=Decimal("0"),
+            kind=TransactionType.TRANSFER,
+            sender_address="alice",
+            sender_public_key=public_key_pem,
+        )
+        message = transaction.canonicalize() + ("tampered" if tamper else "")
+        transaction.sender_signature = base64.b64encode(private_key.sign(message.encode("ascii"))).decode("ascii")
+        return transaction
+
+    @pytest.mark.unit
+    def test_results_match_serial_validation(self):
+        chain = self._build_chain(9)
+        # Break the hash of one block, which also breaks the link of the next one
+        chain[4].calculated_hash = "0" * 64
+
+        expected = [block.validate(chain[i - 1] if i else None) for i, block in enumerate(chain)]
+        with patch.object(ParallelChainValidator, "MIN_BLOCKS_PER_TASK", 2):
+            results = ParallelChainValidator(max_workers=2).validate(chain, None)
+
+        self.assertEqual([r.valid for r in results], [r.valid for r in expected])
+        self.assertEqual([r.reasons for r in results], [r.reasons for r in expected])
+        self.assertIn("Block hash mismatch.", results[4].reasons)
+        self.assertIn("previous_hash does not match previous block hash.", results[5].reasons)
+
+    @pytest.mark.unit
+    def test_ranges_carry_the_block_before_them(self):
+        chain = self._build_chain(7)
+        validator = ParallelChainValidator(max_workers=1)
+
+        with patch.object(ParallelChainValidator, "MIN_BLOCKS_PER_TASK", 3):
+            ranges = validator._split_ranges(chain[1:], chain[0])
+
+        self.assertEqual([[b.number for b in blocks] for blocks, _ in ranges], [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual([previous.number for _, previous in ranges], [0, 3])
+
+    @pytest.mark.unit
+    def test_worker_reports_invalid_signatures(self):
+        valid = self._signed_transfer()
+        forged = self._signed_transfer(tamper=True)
+        block = Block(number=0, previous_hash=None, nonce=0, miner_address="miner", version=1, difficulty=0, transactions=[valid, forged])
+
+        [(_, invalid_signatures)] = _check_block_range([block], None)
+
+        self.assertEqual(invalid_signatures, {forged.hash})
+
+
+if __name__ == '__main__':
+    unittest.main()
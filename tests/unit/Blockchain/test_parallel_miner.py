@@ -0,0 +1,117 @@
+import unittest
+from decimal import Decimal
+
+import pytest
+
+from blockchain.parallel_miner import ParallelMiner, _search_nonces
+from models import Block, Transaction
+from models.enum import TransactionType
+
+
+class TestParallelMiner(unittest.TestCase):
+
+    def _template(self, difficulty: int) -> Block:
+        reward = Transaction(
+            receiver_address="miner",
+            amount=Decimal("50"),
+            fee=Decimal("0"),
+            kind=TransactionType.MINING_REWARD,
+        )
+        return Block(
+            number=1,
+            previous_hash="0" * 64,
+            nonce=0,
+            miner_address="miner",
+            version=1,
+            difficulty=difficulty,
+            transactions=[reward],
+        )
+
+    @pytest.mark.unit
+    def test_single_worker_finds_the_first_solution(self):
+        block = self._template(2 ** 256 // 200)
+        ParallelMiner(workers=1).mine(block)
+
+        self.assertTrue(Block._meets_difficulty(block.calculated_hash, block.difficulty))
+        self.assertEqual(block.calculated_hash, block.compute_hash())
+        for nonce in range(block.nonce):
+            block.nonce = nonce
+            self.assertFalse(Block._meets_difficulty(block.compute_hash(), block.difficulty))
+
+    @pytest.mark.unit
+    def test_workers_report_a_valid_nonce(self):
+        block = self._template(2 ** 256 // 5000)
+        ParallelMiner(workers=3).mine(block)
+
+        self.assertTrue(Block._meets_difficulty(block.calculated_hash, block.difficulty))
+        self.assertEqual(block.calculated_hash, block.compute_hash())
+
+    @pytest.mark.unit
+    def test_worker_processes_are_kept_across_ranges(self):
+        miner = ParallelMiner(workers=2)
+        self.addCleanup(miner.close)
+        block = self._template(2 ** 256 // 10 ** 12)
+
+        # Ranges far too small to hold a solution, as handed out in cooperative mining
+        for first_nonce in range(0, 40, 10):
+            block.nonce = first_nonce
+            self.assertFalse(miner.mine(block, nonce_count=10))
+            if first_nonce == 0:
+                processes = list(miner._processes)
+        self.assertEqual(processes, miner._processes)
+        self.assertEqual(40, miner.attempts)
+
+        block.nonce = 0
+        block.difficulty = 2 ** 256 // 5000
+        self.assertTrue(miner.mine(block))
+        self.assertEqual(block.calculated_hash, block.compute_hash())
+
+        miner.close()
+        self.assertFalse(any(process.is_alive() for process in processes))
+
+    @pytest.mark.unit
+    def test_shared_miner_is_reused_with_started_workers(self):
+        self.addCleanup(setattr, ParallelMiner, "workers", ParallelMiner.workers)
+        self.addCleanup(ParallelMiner.close_shared)
+        ParallelMiner.workers = 2
+
+        miner = ParallelMiner.get_shared()
+        miner.start()
+        processes = list(miner._processes)
+        self.assertEqual(2, len(processes))
+        self.assertTrue(all(process.is_alive() for process in processes))
+
+        block = self._template(2 ** 256 // 5000)
+        self.assertTrue(ParallelMiner.get_shared().mine(block))
+        self.assertIs(miner, ParallelMiner.get_shared())
+        self.assertEqual(processes, miner._processes)
+
+        # A different worker count replaces the shared miner
+        ParallelMiner.workers = 1
+        self.assertIsNot(miner, ParallelMiner.get_shared())
+        self.assertFalse(any(process.is_alive() for process in processes))
+        self.assertLessEqual(ParallelMiner.DEFAULT_WORKERS, 4)
+
+    @pytest.mark.unit
+    def test_split_canonical_form_matches_compute_hash(self):
+        block = self._template(0)
+        block.nonce = 1234
+        prefix, suffix = block.split_canonical_around_nonce()
+
+        self.assertEqual(prefix + b"1234" + suffix, block.canonicalize().encode("ascii"))
+
+    @pytest.mark.unit
+    def test_fast_path_compares_against_the_same_target(self):
+        for difficulty in (0, 2 ** 256, 2 ** 256 - 1):
+            block = self._template(difficulty)
+            self.assertEqual(_search_nonces(block, 0, 1), (0, block.compute_hash()))
+
+        block = self._template(2 ** 256 // 1000)
+        nonce, block_hash = _search_nonces(block, 0, 1)
+        block.nonce = nonce
+        self.assertEqual(block_hash, block.compute_hash())
+        self.assertTrue(Block._meets_difficulty(block_hash, block.difficulty))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from decimal import Decimal
+
+import pytest
+
+from blockchain import Pool
+from exceptions.transaction import InvalidTransactionException
+from models import Transaction, Wallet
+from models.enum import TransactionType
+
+from node_test_case import NodeTestCase
+
+
+class TestPoolAggregates(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.skip_transaction_validation()
+
+    def _transfer(self, sender: str, receiver: str, amount: str, fee: str = "0") -> Transaction:
+        return Transaction(
+            receiver_address=receiver,
+            amount=Decimal(amount),
+            fee=Decimal(fee),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+
+    @pytest.mark.unit
+    def test_aggregates_follow_add_and_remove(self):
+        pool = Pool.get_instance()
+        first = self._transfer("alice", "bob", "10", "1")
+        second = self._transfer("alice", "carol", "5")
+        pool.add_transaction(first)
+        pool.add_transaction(second)
+
+        self.assertEqual(pool.get_reserved_balance("alice"), Decimal("-16"))
+        self.assertEqual(pool.get_incoming_balance("bob"), Decimal("10"))
+        self.assertEqual(Wallet(address="carol").unconfirmed_balance, Decimal("5"))
+
+        pool.remove_transaction(first)
+        self.assertEqual(Wallet(address="alice").reserved_balance, Decimal("-5"))
+        self.assertEqual(pool.get_incoming_balance("bob"), Decimal("0"))
+
+    @pytest.mark.unit
+    def test_invalid_transactions_do_not_reserve_balance(self):
+        pool = Pool.get_instance()
+        transaction = self._transfer("alice", "bob", "10")
+        pool.add_transaction(transaction)
+
+        pool.mark_transaction_as_invalid(transaction)
+
+        self.assertEqual(pool.get_reserved_balance("alice"), Decimal("0"))
+        self.assertEqual(pool.get_incoming_balance("bob"), Decimal("0"))
+        pool.remove_transaction(transaction)
+        self.assertEqual(pool.get_reserved_balance("alice"), Decimal("0"))
+
+    @pytest.mark.unit
+    def test_aggregates_are_rebuilt_on_load(self):
+        Pool.get_instance().add_transaction(self._transfer("alice", "bob", "3"))
+
+        Pool.destroy_instance()
+
+        self.assertEqual(Pool.get_instance().get_reserved_balance("alice"), Decimal("-3"))
+
+
+
+class TestPoolAggregatesWithSignedTransactions(NodeTestCase):
+
+    @pytest.mark.unit
+    def test_signed_transfers_reserve_balance(self):
+        alice = self.create_funded_user("alice", "100")
+        bob = self.create_funded_user("bob")
+        pool = Pool.get_instance()
+
+        pool.add_transaction(self.signed_transfer(alice, bob.address, "10", "1"))
+
+        self.assertEqual(Decimal("-11"), pool.get_reserved_balance(alice.address))
+        self.assertEqual(Decimal("10"), pool.get_incoming_balance(bob.address))
+        self.assertEqual(Decimal("89"), Wallet(address=alice.address).spendable_balance)
+
+        forged = self.signed_transfer(alice, bob.address, "5")
+        forged.amount = Decimal("50")
+        with self.assertRaises(InvalidTransactionException):
+            pool.add_transaction(forged)
+        self.assertEqual(Decimal("-11"), pool.get_reserved_balance(alice.address))
+
+
+if __name__ == '__main__':
+    unittest.main()
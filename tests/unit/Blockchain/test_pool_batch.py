@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+import pytest
+
+from blockchain import Pool
+from blockchain.ledger import Ledger
+from exceptions.transaction import InsufficientBalanceException, InvalidTransactionException
+from models import Transaction
+from models.enum import TransactionType
+from services import NetworkingService
+
+from node_test_case import NodeTestCase
+
+
+class TestPoolBatch(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.skip_transaction_validation()
+
+    def _transfer(self, sender: str, receiver: str, amount: str, fee: str = "0") -> Transaction:
+        return Transaction(
+            receiver_address=receiver,
+            amount=Decimal(amount),
+            fee=Decimal(fee),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+
+    def _count_saves(self) -> list:
+        saves = []
+        callback = lambda _: saves.append(None)
+        Pool.subscribe(callback)
+        self.addCleanup(Pool._subscribers.discard, callback)
+        return saves
+
+    @pytest.mark.unit
+    def test_batch_is_saved_and_broadcast_once(self):
+        Ledger.get_instance()._balances["alice"] = Decimal("1000")
+        pool = Pool.get_instance()
+        saves = self._count_saves()
+        transactions = [self._transfer("alice", f"receiver{i}", "1") for i in range(50)]
+
+        added = pool.add_transactions(transactions)
+
+        self.assertEqual(transactions, added)
+        self.assertEqual(1, len(saves))
+        networking = NetworkingService.get_instance()
+        networking.broadcast_new_transaction.assert_not_called()
+        networking.broadcast_new_transactions.assert_called_once()
+        self.assertEqual(50, len(networking.broadcast_new_transactions.call_args.kwargs["transaction_payloads"]))
+        self.assertEqual(Decimal("-50"), pool.get_reserved_balance("alice"))
+
+        # Transactions already in the pool are not added again
+        self.assertEqual([], pool.add_transactions(transactions[:5]))
+
+    @pytest.mark.unit
+    def test_batch_is_checked_against_a_running_balance(self):
+        Ledger.get_instance()._balances["alice"] = Decimal("100")
+        pool = Pool.get_instance()
+        pool.add_transaction(self._transfer("alice", "bob", "10"))
+        batch = [self._transfer("alice", f"receiver{i}", "40", "1") for i in range(3)]
+
+        with self.assertRaises(InsufficientBalanceException):
+            pool.add_transactions(batch)
+        self.assertEqual(1, len(pool.get_transactions()))
+
+        # 10 is reserved already, so only the first two payouts of 41 fit in the remaining 90
+        self.assertEqual(batch[:2], pool.add_transactions(batch, raise_exception=False))
+        self.assertEqual(Decimal("-92"), pool.get_reserved_balance("alice"))
+
+
+
+class TestPoolBatchWithSignedTransactions(NodeTestCase):
+
+    @pytest.mark.unit
+    def test_signed_batch_is_validated(self):
+        alice = self.create_funded_user("alice", "100")
+        bob = self.create_funded_user("bob")
+        pool = Pool.get_instance()
+        batch = Transaction.create_many(alice, [(bob.address, Decimal("40"), Decimal("1")) for _ in range(3)])
+        forged = self.signed_transfer(alice, bob.address, "1")
+        forged.sender_signature = batch[0].sender_signature
+
+        with self.assertRaises(InvalidTransactionException):
+            pool.add_transactions([*batch[:2], forged])
+        self.assertEqual([], pool.get_transactions())
+
+        # The third payout overspends and the forged one is skipped
+        self.assertEqual(batch[:2], pool.add_transactions([*batch, forged], raise_exception=False))
+        self.assertEqual(Decimal("-82"), pool.get_reserved_balance(alice.address))
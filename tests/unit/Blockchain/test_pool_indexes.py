@@ -0,0 +1,167 @@
+import unittest
+from decimal import Decimal
+
+import pytest
+
+from blockchain import Pool
+from blockchain.ledger import Ledger
+from models import Transaction
+from models.enum import TransactionType
+
+from node_test_case import NodeTestCase
+
+
+class TestPoolIndexes(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.skip_transaction_validation()
+
+    def _transfer(self, timestamp: str, fee: str) -> Transaction:
+        transaction = Transaction(
+            receiver_address="bob",
+            amount=Decimal(1),
+            fee=Decimal(fee),
+            kind=TransactionType.TRANSFER,
+            sender_address="alice",
+        )
+        transaction.timestamp = timestamp
+        transaction._hash = transaction.cryptography_service.sha256_hash(transaction.canonicalize())
+        return transaction
+
+    def _fill_pool(self) -> list[Transaction]:
+        transactions = [
+            self._transfer("2025-01-01T00:00:05+00:00", "0.5"),
+            self._transfer("2025-01-01T00:00:01+00:00", "0.4"),
+            self._transfer("2025-01-01T00:00:03+00:00", "0.1"),
+            self._transfer("2025-01-01T00:00:02+00:00", "0.3"),
+            self._transfer("2025-01-01T00:00:04+00:00", "0.2"),
+        ]
+        for tx in transactions:
+            Pool.get_instance().add_transaction(tx)
+        return transactions
+
+    @pytest.mark.unit
+    def test_required_transactions_are_oldest_then_lowest_fee(self):
+        transactions = self._fill_pool()
+
+        required = Pool.get_instance().get_required_transactions()
+
+        self.assertEqual([tx.hash for tx in required], [transactions[i].hash for i in (1, 3, 2, 4)])
+
+    @pytest.mark.unit
+    def test_required_transactions_respect_max_timestamp(self):
+        transactions = self._fill_pool()
+        pool = Pool.get_instance()
+
+        required = pool.get_required_transactions(max_timestamp="2025-01-01T00:00:05+00:00")
+        self.assertEqual([tx.hash for tx in required], [transactions[i].hash for i in (1, 3, 2, 4)])
+        self.assertIsNone(pool.get_required_transactions(max_timestamp="2025-01-01T00:00:04+00:00"))
+
+    @pytest.mark.unit
+    def test_indexes_follow_removal_and_duplicates(self):
+        transactions = self._fill_pool()
+        pool = Pool.get_instance()
+
+        pool.add_transaction(transactions[0])
+        self.assertEqual(len(pool.get_transactions()), 5)
+
+        pool.mark_transaction_for_block(transactions[1])
+        pool.remove_transactions([transactions[1], transactions[2]], include_marked_for_block=True)
+
+        self.assertFalse(pool.has_transaction(transactions[1]))
+        self.assertFalse(pool.is_marked_for_block(transactions[1]))
+        self.assertEqual(len(pool._age_index), 3)
+        self.assertEqual(len(pool._fee_index), 3)
+        self.assertIsNone(pool.get_required_transactions())
+
+    @pytest.mark.unit
+    def test_indexes_are_rebuilt_on_load(self):
+        transactions = self._fill_pool()
+
+        Pool.destroy_instance()
+        pool = Pool.get_instance()
+
+        self.assertTrue(all(pool.has_transaction(tx) for tx in transactions))
+        self.assertEqual([key[1] for key in pool._age_index], [transactions[i].hash for i in (1, 3, 2, 4, 0)])
+
+    @pytest.mark.unit
+    def test_required_transactions_are_cached_per_generation(self):
+        self._fill_pool()
+        pool = Pool.get_instance()
+        validate_mock = Transaction.validate
+
+        first = pool.get_required_transactions()
+        calls_after_first = validate_mock.call_count
+        second = pool.get_required_transactions()
+
+        self.assertEqual([tx.hash for tx in first], [tx.hash for tx in second])
+        self.assertEqual(validate_mock.call_count, calls_after_first)
+
+        # A pool change recomputes the selection but reuses per-transaction validity
+        pool.add_transaction(self._transfer("2025-01-01T00:00:00+00:00", "0.0"))
+        calls_after_add = validate_mock.call_count
+        third = pool.get_required_transactions()
+        self.assertEqual(third[0].timestamp, "2025-01-01T00:00:00+00:00")
+        self.assertEqual(validate_mock.call_count, calls_after_add + 1)
+
+
+
+class TestPoolIndexesWithSignedTransactions(NodeTestCase):
+
+    @pytest.mark.unit
+    def test_required_transactions_skip_transactions_that_became_invalid(self):
+        alice = self.create_funded_user("alice", "100")
+        carol = self.create_funded_user("carol", "100")
+        bob = self.create_funded_user("bob")
+        pool = Pool.get_instance()
+        oldest = self.signed_transfer(carol, bob.address, "50", "0.3", "2025-01-01T00:00:01+00:00")
+        transactions = [
+            self.signed_transfer(alice, bob.address, "1", "0.5", "2025-01-01T00:00:02+00:00"),
+            self.signed_transfer(alice, bob.address, "1", "0.4", "2025-01-01T00:00:03+00:00"),
+            self.signed_transfer(alice, bob.address, "1", "0.1", "2025-01-01T00:00:04+00:00"),
+            self.signed_transfer(alice, bob.address, "1", "0.2", "2025-01-01T00:00:05+00:00"),
+        ]
+        for tx in [oldest, *transactions]:
+            pool.add_transaction(tx, broadcast_to_network=False)
+
+        self.assertEqual([oldest.hash, transactions[0].hash, transactions[2].hash, transactions[3].hash],
+                         [tx.hash for tx in pool.get_required_transactions()])
+
+        # Carol spends her balance elsewhere, so her transaction is no longer valid
+        ledger = Ledger.get_instance()
+        ledger._balances[carol.address] = Decimal("10")
+        ledger._generation += 1
+
+        self.assertEqual([transactions[0].hash, transactions[1].hash, transactions[2].hash, transactions[3].hash],
+                         [tx.hash for tx in pool.get_required_transactions()])
+
+    @pytest.mark.unit
+    def test_transactions_of_senders_registered_later_become_required(self):
+        from models import User
+        from repositories.user import UserRepository
+        alice = self.create_funded_user("alice", "100")
+        bob = self.create_funded_user("bob")
+        dave = User.create("dave", "password")
+        Ledger.get_instance()._balances[dave.address] = Decimal("100")
+        pool = Pool.get_instance()
+        # Dave is not registered on this node yet, e.g. the user was synced from a peer afterwards
+        oldest = self.signed_transfer(dave, bob.address, "1", "0.3", "2025-01-01T00:00:01+00:00")
+        pool._insert_transaction(oldest)
+        transactions = [
+            self.signed_transfer(alice, bob.address, "1", "0.5", "2025-01-01T00:00:02+00:00"),
+            self.signed_transfer(alice, bob.address, "1", "0.4", "2025-01-01T00:00:03+00:00"),
+            self.signed_transfer(alice, bob.address, "1", "0.1", "2025-01-01T00:00:04+00:00"),
+            self.signed_transfer(alice, bob.address, "1", "0.2", "2025-01-01T00:00:05+00:00"),
+        ]
+        pool.add_transactions(transactions, broadcast_to_network=False)
+
+        self.assertNotIn(oldest.hash, [tx.hash for tx in pool.get_required_transactions()])
+
+        UserRepository().persist(dave)
+
+        self.assertEqual(oldest.hash, pool.get_required_transactions()[0].hash)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from blockchain import Pool
+from blockchain.ledger import Ledger
+from exceptions.transaction import PoolLimitExceededException
+from models import Transaction
+from models.enum import TransactionType
+
+from node_test_case import NodeTestCase
+
+
+class TestPoolLimits(NodeTestCase):
+
+    default_max_transactions_per_sender = Pool.max_transactions_per_sender
+
+    def setUp(self):
+        super().setUp()
+        self.skip_transaction_validation()
+
+        for limit in ("max_transactions", "max_bytes", "max_transactions_per_sender"):
+            limit_patcher = patch.object(Pool, limit, 0)
+            limit_patcher.start()
+            self.addCleanup(limit_patcher.stop)
+
+        self.pool = Pool.get_instance()
+        self._minute = 0
+
+    def _transfer(self, sender: str, fee: str) -> Transaction:
+        transaction = Transaction(
+            receiver_address="receiver",
+            amount=Decimal("1"),
+            fee=Decimal(fee),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+        # Strictly increasing, so the age order is deterministic
+        transaction.timestamp = (datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=self._minute)).isoformat()
+        self._minute += 1
+        return transaction
+
+    def _fill(self, fees: list[str]) -> list[Transaction]:
+        transactions = [self._transfer(f"sender{i}", fee) for i, fee in enumerate(fees)]
+        for transaction in transactions:
+            self.pool.add_transaction(transaction)
+        return transactions
+
+    def _hashes(self) -> set[str]:
+        return {tx.hash for tx in self.pool.get_transactions()}
+
+    @pytest.mark.unit
+    def test_lowest_fee_youngest_is_evicted_but_fairness_is_kept(self):
+        Pool.max_transactions = 6
+        oldest, second_oldest, cheap, cheaper_young, cheap_youngest, medium = self._fill(["5", "5", "1", "1", "1", "2"])
+
+        newcomer = self._transfer("sender6", "3")
+        self.pool.add_transaction(newcomer)
+
+        # The two oldest and the two lowest-fee transactions are required by fairness
+        self.assertEqual({oldest.hash, second_oldest.hash, cheap.hash, cheaper_young.hash, medium.hash, newcomer.hash}, self._hashes())
+        self.assertNotIn(cheap_youngest.hash, self._hashes())
+
+        # A newcomer that would be the first one evicted is refused
+        with self.assertRaises(PoolLimitExceededException):
+            self.pool.add_transaction(self._transfer("sender7", "1"))
+        self.assertEqual(6, len(self.pool.get_transactions()))
+
+    @pytest.mark.unit
+    def test_marked_transactions_are_never_evicted(self):
+        Pool.max_transactions = 3
+        cheapest, _, _ = self._fill(["1", "2", "3"])
+        self.pool.mark_transaction_for_block(cheapest)
+
+        self.pool.add_transaction(self._transfer("sender3", "4"))
+
+        self.assertIn(cheapest.hash, self._hashes())
+        self.assertEqual(3, len(self.pool.get_transactions()))
+
+    @pytest.mark.unit
+    def test_reward_transactions_are_never_evicted(self):
+        Pool.max_transactions = 3
+        cheapest, _, _ = self._fill(["1", "2", "3"])
+        signup_reward = Transaction.create_signup_reward("newcomer")
+
+        # The reward has no fee, yet a transfer makes room for it
+        self.pool.add_transaction(signup_reward)
+
+        self.assertIn(signup_reward.hash, self._hashes())
+        self.assertNotIn(cheapest.hash, self._hashes())
+        self.assertEqual(3, len(self.pool.get_transactions()))
+
+    @pytest.mark.unit
+    def test_byte_budget(self):
+        first, second, third = self._fill(["3", "2", "1"])
+        size = Pool._size_of(first)
+        self.assertEqual(3 * size, self.pool._total_bytes)
+
+        Pool.max_bytes = 3 * size
+        self.pool.add_transaction(self._transfer("sender3", "4"))
+
+        self.assertNotIn(third.hash, self._hashes())
+        self.assertEqual(3 * size, self.pool._total_bytes)
+        self.pool.remove_transaction(first)
+        self.assertEqual(2 * size, self.pool._total_bytes)
+
+    @pytest.mark.unit
+    def test_per_sender_limit(self):
+        Pool.max_transactions_per_sender = 2
+        Ledger.get_instance()._balances["alice"] = Decimal("100")
+        self.pool.add_transaction(self._transfer("alice", "1"))
+
+        batch = [self._transfer("alice", "1"), self._transfer("alice", "1"), self._transfer("bob", "1")]
+        with self.assertRaises(PoolLimitExceededException):
+            self.pool.add_transactions(batch)
+
+        Ledger.get_instance()._balances["bob"] = Decimal("100")
+        self.assertEqual([batch[0], batch[2]], self.pool.add_transactions(batch, raise_exception=False))
+        with self.assertRaises(PoolLimitExceededException):
+            self.pool.add_transaction(self._transfer("alice", "1"))
+        self.assertEqual(2, len(self.pool._hashes_by_sender["alice"]))
+
+
+    @pytest.mark.unit
+    def test_batch_over_the_per_sender_limit(self):
+        Pool.max_transactions_per_sender = 3
+        Ledger.get_instance()._balances["alice"] = Decimal("100")
+        batch = [self._transfer("alice", "1") for _ in range(5)]
+
+        with self.assertRaises(PoolLimitExceededException):
+            self.pool.add_transactions(batch)
+        self.assertEqual([], self.pool.get_transactions())
+
+        self.assertEqual(batch[:3], self.pool.add_transactions(batch, raise_exception=False))
+
+    @pytest.mark.unit
+    def test_default_per_sender_limit_fits_a_payout_batch(self):
+        Pool.max_transactions_per_sender = type(self).default_max_transactions_per_sender
+        Ledger.get_instance()._balances["alice"] = Decimal("1000")
+        batch = [self._transfer("alice", "0") for _ in range(500)]
+
+        self.assertEqual(500, len(self.pool.add_transactions(batch)))
+
+
+class TestPoolLimitsWithSignedTransactions(NodeTestCase):
+
+    @pytest.mark.unit
+    def test_signed_transactions_are_evicted_by_fee(self):
+        self.start_patch(patch.object(Pool, "max_transactions", 5))
+        receiver = self.create_funded_user("receiver")
+        pool = Pool.get_instance()
+        transactions = [
+            self.signed_transfer(self.create_funded_user(f"sender{i}", "10"), receiver.address, "1", fee, f"2025-01-01T00:0{i}:00+00:00")
+            for i, fee in enumerate(["5", "5", "1", "1", "2", "3"])
+        ]
+        for transaction in transactions[:5]:
+            pool.add_transaction(transaction)
+
+        pool.add_transaction(transactions[5])
+
+        # The two oldest and the two lowest-fee transactions are required by fairness, so the fee 2 one goes
+        self.assertEqual({transactions[i].hash for i in (0, 1, 2, 3, 5)}, {tx.hash for tx in pool.get_transactions()})
+
+
+if __name__ == '__main__':
+    unittest.main()
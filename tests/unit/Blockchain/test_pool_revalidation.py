@@ -0,0 +1,156 @@
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from blockchain import Pool
+from blockchain.ledger import Ledger
+from models import Transaction
+from models.enum import TransactionType
+
+from node_test_case import NodeTestCase
+
+
+def _validate_against_ledger(transaction, raise_exception=True, **kwargs):
+    return Ledger.get_instance().get_balance(transaction.sender_address) >= transaction.amount + transaction.fee
+
+
+class TestPoolRevalidation(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.validate_patcher = patch.object(Transaction, "validate", autospec=True, side_effect=_validate_against_ledger)
+        self.validate = self.validate_patcher.start()
+        self.addCleanup(self.validate_patcher.stop)
+
+        ledger = Ledger.get_instance()
+        ledger._balances["alice"] = Decimal("100")
+        ledger._balances["bob"] = Decimal("100")
+        self.pool = Pool.get_instance()
+        self.alice_tx = self._transfer("alice", "carol", "60")
+        self.bob_tx = self._transfer("bob", "carol", "60")
+        self.pool.add_transactions([self.alice_tx, self.bob_tx], broadcast_to_network=False)
+
+    def _transfer(self, sender: str, receiver: str, amount: str) -> Transaction:
+        return Transaction(
+            receiver_address=receiver,
+            amount=Decimal(amount),
+            fee=Decimal("0"),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+
+    def _spend(self, address: str, amount: str) -> None:
+        ledger = Ledger.get_instance()
+        ledger._balances[address] -= Decimal(amount)
+        ledger._generation += 1
+
+    @pytest.mark.unit
+    def test_only_touched_senders_are_revalidated(self):
+        self._spend("alice", "50")
+        self._spend("bob", "50")
+        self.validate.reset_mock()
+
+        invalidated = self.pool.revalidate_senders({"alice", "carol"})
+
+        self.assertEqual([self.alice_tx], invalidated)
+        self.assertTrue(self.alice_tx.is_invalid)
+        self.assertFalse(self.bob_tx.is_invalid)
+        self.assertEqual([self.alice_tx], [call.args[0] for call in self.validate.call_args_list])
+        # Invalid transactions no longer reserve balance
+        self.assertEqual(Decimal("0"), self.pool.get_reserved_balance("alice"))
+        self.assertEqual([self.alice_tx], self.pool.get_invalid_transactions_for_sender_address("alice"))
+
+    @pytest.mark.unit
+    def test_valid_transactions_are_left_alone(self):
+        self._spend("alice", "10")
+
+        self.assertEqual([], self.pool.revalidate_senders({"alice"}))
+        self.assertFalse(self.alice_tx.is_invalid)
+        self.assertEqual(Decimal("-60"), self.pool.get_reserved_balance("alice"))
+
+    @pytest.mark.unit
+    def test_invalid_transactions_are_restored_once_valid_again(self):
+        self._spend("alice", "50")
+        self.pool.revalidate_senders({"alice"})
+
+        # The block that spent the balance is rejected
+        self._spend("alice", "-50")
+        self.assertEqual([], self.pool.revalidate_senders({"alice"}))
+
+        self.assertFalse(self.alice_tx.is_invalid)
+        self.assertEqual(Decimal("-60"), self.pool.get_reserved_balance("alice"))
+        self.assertEqual([], self.pool.get_invalid_transactions_for_sender_address("alice"))
+
+    @pytest.mark.unit
+    def test_invalid_transactions_are_not_required_for_fairness(self):
+        for amount in ("1", "2", "3"):
+            self.pool.add_transactions([self._transfer("bob", "carol", amount)], broadcast_to_network=False)
+        self._spend("alice", "50")
+        self.pool.revalidate_senders({"alice"})
+
+        # Validation passes again, but until the pool revalidates alice the flag keeps the transaction out
+        self.validate.side_effect = lambda *args, **kwargs: True
+        Ledger.get_instance()._generation += 1
+        required = self.pool.get_required_transactions()
+
+        self.assertEqual(4, len(required))
+        self.assertNotIn(self.alice_tx, required)
+
+    @pytest.mark.unit
+    def test_transactions_marked_invalid_leave_the_cached_selection(self):
+        for amount in ("1", "2", "3"):
+            self.pool.add_transactions([self._transfer("bob", "carol", amount)], broadcast_to_network=False)
+        self.assertIn(self.alice_tx, self.pool.get_required_transactions())
+
+        self.pool.mark_transaction_as_invalid(self.alice_tx)
+
+        self.assertNotIn(self.alice_tx, self.pool.get_required_transactions())
+
+    @pytest.mark.unit
+    def test_finalized_blocks_trigger_revalidation(self):
+        self._spend("alice", "50")
+        block = SimpleNamespace(transactions=[SimpleNamespace(sender_address="alice", receiver_address="dave")])
+
+        Ledger._publish_touched_addresses([block])
+
+        self.assertTrue(self.alice_tx.is_invalid)
+        self.assertFalse(self.bob_tx.is_invalid)
+
+    @pytest.mark.unit
+    def test_sender_index_follows_pool(self):
+        self.pool.remove_transaction(self.alice_tx)
+
+        self.assertNotIn("alice", self.pool._hashes_by_sender)
+        Pool.destroy_instance()
+        self.assertEqual({"bob": {self.bob_tx.hash}}, Pool.get_instance()._hashes_by_sender)
+
+
+
+class TestPoolRevalidationWithSignedTransactions(NodeTestCase):
+
+    @pytest.mark.unit
+    def test_signed_transaction_is_invalidated_once_the_balance_is_spent(self):
+        alice = self.create_funded_user("alice", "100")
+        bob = self.create_funded_user("bob", "100")
+        pool = Pool.get_instance()
+        alice_tx = self.signed_transfer(alice, bob.address, "60")
+        bob_tx = self.signed_transfer(bob, alice.address, "60")
+        pool.add_transactions([alice_tx, bob_tx], broadcast_to_network=False)
+
+        ledger = Ledger.get_instance()
+        ledger._balances[alice.address] = Decimal("50")
+        ledger._generation += 1
+        block = SimpleNamespace(transactions=[SimpleNamespace(sender_address=alice.address, receiver_address="dave")])
+        Ledger._publish_touched_addresses([block])
+
+        self.assertTrue(alice_tx.is_invalid)
+        self.assertFalse(bob_tx.is_invalid)
+        self.assertEqual(Decimal("0"), pool.get_reserved_balance(alice.address))
+
+
+if __name__ == '__main__':
+    unittest.main()
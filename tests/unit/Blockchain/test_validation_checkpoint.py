@@ -0,0 +1,130 @@
+import os
+from datetime import datetime, timedelta
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from blockchain.ledger import Ledger
+from models import Block
+from models.block import BlockValidationResult
+from services import NodeFileSystemService
+
+from node_test_case import NodeTestCase
+
+
+class TestValidationCheckpoint(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        validate_patcher = patch("models.block.Block.validate", autospec=True, return_value=BlockValidationResult(valid=True, reasons=[], invalid_transactions=[]))
+        self.validate_mock = validate_patcher.start()
+        self.addCleanup(validate_patcher.stop)
+
+    def _add_empty_blocks(self, count: int) -> list[Block]:
+        ledger = Ledger.get_instance()
+        blocks = []
+        for _ in range(count):
+            previous = ledger.get_latest_block()
+            block = Block(
+                number=previous.number + 1,
+                previous_hash=previous.calculated_hash,
+                nonce=0,
+                miner_address="miner",
+                version=1,
+                difficulty=0,
+                transactions=[],
+            )
+            # Keep the 3-minute spacing rule satisfied
+            block.timestamp = (datetime.fromisoformat(previous.timestamp) + timedelta(minutes=4)).isoformat()
+            block.calculated_hash = block.compute_hash()
+            ledger.add_block(block)
+            blocks.append(block)
+        return blocks
+
+    def _validated_numbers(self) -> list[int]:
+        return [call.args[0].number for call in self.validate_mock.call_args_list]
+
+    @pytest.mark.unit
+    def test_only_blocks_after_checkpoint_are_validated(self):
+        self._add_empty_blocks(3)
+        ledger = Ledger.get_instance()
+        self.assertEqual(ledger.validate_chain(use_checkpoint=True), (True, []))
+        self.assertEqual(self._validated_numbers(), [0, 1, 2, 3])
+        self.assertEqual(ledger.get_validation_checkpoint_height(), 3)
+
+        self._add_empty_blocks(2)
+        Ledger.destroy_instance()
+        self.validate_mock.reset_mock()
+
+        self.assertEqual(Ledger.get_instance().validate_chain(use_checkpoint=True), (True, []))
+        self.assertEqual(self._validated_numbers(), [4, 5])
+
+    @pytest.mark.unit
+    def test_full_validation_ignores_checkpoint(self):
+        self._add_empty_blocks(2)
+        ledger = Ledger.get_instance()
+        ledger.validate_chain()
+        self.validate_mock.reset_mock()
+
+        ledger.validate_chain()
+
+        self.assertEqual(self._validated_numbers(), [0, 1, 2])
+
+    @pytest.mark.unit
+    def test_checkpoint_is_discarded_when_stored_blocks_change(self):
+        self._add_empty_blocks(2)
+        ledger = Ledger.get_instance()
+        ledger.validate_chain()
+
+        segment_path = Ledger._block_store._get_segment_path(0)
+        with open(segment_path, "r+b") as f:
+            f.seek(os.path.getsize(segment_path) - 1)
+            last_byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([last_byte[0] ^ 0xFF]))
+
+        self.assertIsNone(ledger.get_validation_checkpoint_height())
+
+    @pytest.mark.unit
+    def test_only_the_tail_segment_is_read_to_check_the_checkpoint(self):
+        with patch.object(Ledger._block_store, "SEGMENT_SIZE", 1):
+            self._add_empty_blocks(3)
+        ledger = Ledger.get_instance()
+        ledger.validate_chain()
+
+        store = Ledger._block_store
+        tail_path = store._get_segment_path(3)
+        with patch("builtins.open", wraps=open) as open_mock:
+            self.assertEqual(ledger.get_validation_checkpoint_height(), 3)
+        read_segments = [call.args[0] for call in open_mock.call_args_list if str(call.args[0]).endswith(".seg")]
+        self.assertEqual([tail_path], read_segments)
+
+        # An earlier segment that changed (and was re-hashed) still invalidates the checkpoint
+        with open(store._get_segment_path(1), "ab") as f:
+            f.write(b"changed")
+        NodeFileSystemService().update_hash_for_file(store.get_segment_file_name(1))
+        self.assertIsNone(ledger.get_validation_checkpoint_height())
+
+    @pytest.mark.unit
+    def test_checkpoint_is_discarded_when_chain_is_replaced(self):
+        self._add_empty_blocks(2)
+        ledger = Ledger.get_instance()
+        ledger.validate_chain()
+
+        genesis = Block.create_genesis_block()
+        genesis.timestamp = "2025-01-01T00:00:00+00:00"
+        genesis.calculated_hash = genesis.compute_hash()
+        ledger._reset_chain()
+        ledger._append_to_chain(genesis)
+        ledger._save()
+
+        self.assertIsNone(ledger.get_validation_checkpoint_height())
+        self.validate_mock.reset_mock()
+        ledger.validate_chain(use_checkpoint=True)
+        self.assertEqual(self._validated_numbers(), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
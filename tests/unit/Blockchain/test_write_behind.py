@@ -0,0 +1,127 @@
+import os
+import pickle
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from blockchain import Pool
+from models import Transaction
+from models.enum import TransactionType
+from services import NetworkingService
+
+from node_test_case import NodeTestCase
+
+
+class TestWriteBehind(NodeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.skip_transaction_validation()
+        # No listen loop runs in tests, snapshots are taken right away like call_soon does then
+        self.call_soon = NetworkingService.get_instance().call_soon
+        self.call_soon.side_effect = lambda callback: callback()
+
+        # Long interval so nothing is flushed by the timer during the test
+        self.atexit_patcher = patch("blockchain.abstract_pickable_singleton.atexit.register")
+        self.atexit_patcher.start()
+        self.addCleanup(self.atexit_patcher.stop)
+        Pool.enable_write_behind(60_000)
+        self.addCleanup(self._disable_write_behind)
+
+    def _disable_write_behind(self):
+        if Pool._flush_timer is not None:
+            Pool._flush_timer.cancel()
+            Pool._flush_timer = None
+        Pool._dirty = False
+        Pool._write_behind_interval = None
+
+    def _transfer(self, sender: str, receiver: str, amount: str) -> Transaction:
+        return Transaction(
+            receiver_address=receiver,
+            amount=Decimal(amount),
+            fee=Decimal("0"),
+            kind=TransactionType.TRANSFER,
+            sender_address=sender,
+        )
+
+    def _read_pool_file(self) -> bytes:
+        with open(Pool._fs_service.get_data_file_path("pool.pkl"), "rb") as f:
+            return f.read()
+
+    @pytest.mark.unit
+    def test_saves_are_coalesced_until_flush(self):
+        pool = Pool.get_instance()
+        on_disk = self._read_pool_file()
+        notifications = []
+        Pool.subscribe(notifications.append)
+        self.addCleanup(Pool._subscribers.discard, notifications.append)
+
+        pool.add_transaction(self._transfer("alice", "bob", "1"))
+        pool.add_transaction(self._transfer("alice", "carol", "2"))
+
+        # Subscribers are still told right away, but nothing has been written yet
+        self.assertEqual(len(notifications), 2)
+        self.assertTrue(Pool._dirty)
+        self.assertIsNotNone(Pool._flush_timer)
+        self.assertEqual(self._read_pool_file(), on_disk)
+
+        Pool.flush()
+
+        self.assertFalse(Pool._dirty)
+        self.assertNotEqual(self._read_pool_file(), on_disk)
+        self.assertTrue(Pool._fs_service.verify_file_hash("pool.pkl")["ok"])
+
+    @pytest.mark.unit
+    def test_destroy_instance_persists_pending_changes(self):
+        Pool.get_instance().add_transaction(self._transfer("alice", "bob", "3"))
+
+        Pool.destroy_instance()
+
+        self.assertIsNone(Pool._flush_timer)
+        self.assertEqual(len(Pool.get_instance().get_transactions()), 1)
+        data_dir = os.path.dirname(Pool._fs_service.get_data_file_path("pool.pkl"))
+        self.assertFalse([name for name in os.listdir(data_dir) if name.startswith(".tmp_")])
+
+    @pytest.mark.unit
+    def test_timer_flushes_in_the_background(self):
+        Pool._write_behind_interval = 0.01
+        Pool.get_instance().add_transaction(self._transfer("alice", "bob", "4"))
+        timer = Pool._flush_timer
+
+        timer.join(timeout=5)
+
+        self.assertFalse(Pool._dirty)
+        self.assertIsNone(Pool._flush_timer)
+
+    @pytest.mark.unit
+    def test_timer_takes_the_snapshot_on_the_listen_loop(self):
+        Pool._write_behind_interval = 0.01
+        self.call_soon.side_effect = lambda callback: threading.Thread(target=callback, name="listen-loop").start()
+        snapshot_threads = []
+        take_snapshot = Pool._take_snapshot.__func__
+
+        def record_thread(cls):
+            snapshot_threads.append(threading.current_thread().name)
+            return take_snapshot(cls)
+
+        with patch.object(Pool, "_take_snapshot", classmethod(record_thread)):
+            Pool.get_instance().add_transaction(self._transfer("alice", "bob", "5"))
+            Pool._flush_timer.join(timeout=5)
+
+        self.assertEqual(["listen-loop"], snapshot_threads)
+        self.assertFalse(Pool._dirty)
+        self.assertEqual(1, len(pickle.loads(self._read_pool_file()).get_transactions()))
+
+    @pytest.mark.unit
+    def test_older_snapshot_does_not_overwrite_a_newer_one(self):
+        pool = Pool.get_instance()
+        pool.add_transaction(self._transfer("alice", "bob", "6"))
+        older = Pool._take_numbered_snapshot()
+        pool.add_transaction(self._transfer("alice", "carol", "7"))
+        Pool.flush()
+
+        Pool._write_numbered_snapshot(older)
+
+        self.assertEqual(2, len(pickle.loads(self._read_pool_file()).get_transactions()))
@@ -0,0 +1,88 @@
+import hashlib
+import unittest
+from types import SimpleNamespace
+
+import pytest
+
+from models import Block, MerkleTree
+from services import CryptographyService
+
+
+def _leaf(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class TestMerkleTree(unittest.TestCase):
+
+    def setUp(self):
+        self.crypto_service = CryptographyService()
+
+    def _legacy_root(self, leaves: list[str]):
+        return self.crypto_service.find_merkle_root_for_list(list(leaves))
+
+    @pytest.mark.unit
+    def test_root_matches_legacy_implementation(self):
+        self.assertIsNone(MerkleTree().root)
+        for count in range(1, 34):
+            leaves = [_leaf(f"tx{i}") for i in range(count)]
+            self.assertEqual(self._legacy_root(leaves), MerkleTree(leaves).root, f"{count} leaves")
+
+    @pytest.mark.unit
+    def test_append_matches_full_rebuild(self):
+        tree = MerkleTree()
+        leaves = []
+        for i in range(20):
+            leaves.append(_leaf(f"tx{i}"))
+            tree.append(leaves[-1])
+            self.assertEqual(self._legacy_root(leaves), tree.root, f"after {i + 1} appends")
+            self.assertEqual(MerkleTree(leaves).levels, tree.levels)
+
+    @pytest.mark.unit
+    def test_update_matches_full_rebuild(self):
+        leaves = [_leaf(f"tx{i}") for i in range(11)]
+        tree = MerkleTree(leaves)
+        for index in (0, 5, 10):
+            leaves[index] = _leaf(f"changed{index}")
+            tree.update(index, leaves[index])
+            self.assertEqual(self._legacy_root(leaves), tree.root)
+        with self.assertRaises(IndexError):
+            tree.update(11, leaves[0])
+
+    @pytest.mark.unit
+    def test_sync_handles_appends_updates_and_shrinking(self):
+        leaves = [_leaf(f"tx{i}") for i in range(6)]
+        tree = MerkleTree(leaves)
+        for changed in (leaves + [_leaf("reward")], [_leaf("first")] + leaves[1:], leaves[:3]):
+            tree.sync(changed)
+            self.assertEqual(self._legacy_root(changed), tree.root)
+            self.assertEqual(changed, tree.leaf_hashes)
+
+    @pytest.mark.unit
+    def test_rejects_leaves_that_are_not_hex_digests(self):
+        with self.assertRaises(ValueError):
+            MerkleTree(["not a hash"])
+
+    @pytest.mark.unit
+    def test_legacy_function_does_not_modify_its_argument(self):
+        leaves = [_leaf(f"tx{i}") for i in range(3)]
+        self.crypto_service.find_merkle_root_for_list(leaves)
+        self.assertEqual(3, len(leaves))
+
+    @pytest.mark.unit
+    def test_block_keeps_tree_out_of_its_serialized_forms(self):
+        transactions = [SimpleNamespace(to_hash=lambda i=i: _leaf(f"tx{i}"), to_dict=lambda: {}) for i in range(5)]
+        block = Block(number=1, previous_hash="0" * 64, nonce=0, miner_address="miner", version=1, difficulty=0, transactions=transactions)
+        self.assertEqual(self._legacy_root([tx.to_hash() for tx in transactions]), block.merkle_root)
+
+        block.transactions = transactions + [SimpleNamespace(to_hash=lambda: _leaf("reward"), to_dict=lambda: {})]
+        self.assertEqual(self._legacy_root([tx.to_hash() for tx in block.transactions]), block.compute_merkle_root())
+
+        self.assertNotIn("_merkle_tree", block.to_dict())
+        self.assertNotIn("_merkle_tree", block.__getstate__())
+        self.assertNotIn("_merkle_tree", repr(block))
+
+    @pytest.mark.unit
+    def test_block_falls_back_for_non_hex_transaction_hashes(self):
+        transactions = [SimpleNamespace(to_hash=lambda: "malformed")]
+        block = Block(number=1, previous_hash="0" * 64, nonce=0, miner_address="miner", version=1, difficulty=0, transactions=transactions)
+        self.assertEqual(self._legacy_root(["malformed"]), block.merkle_root)
@@ -1,6 +1,6 @@
 import unittest
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 
 from models import User, Transaction
 from models.enum import TransactionType
@@ -13,6 +13,10 @@ class TestTransactionModel(unittest.TestCase):
            side_effect=FileSystemService.get_temp_data_root)
     def setUp(self, mock_get_data_root):
         FileSystemService.clear_temp_data_root()
+        # Every test initializes the application again, which must not reconfigure the real networking
+        ns_patcher = patch("services.networking_service.NetworkingService.get_instance")
+        ns_patcher.start().return_value = MagicMock()
+        self.addCleanup(ns_patcher.stop)
         InitializationService.initialize_application()
 
     @patch("services.filesystem_service.FileSystemService.get_data_root",
@@ -65,3 +69,18 @@ class TestTransactionModel(unittest.TestCase):
         assert reward_tx.amount == Decimal('51.5')
         assert reward_tx.fee == Decimal('0')
         assert reward_tx.kind == TransactionType.MINING_REWARD
+
+    @patch("services.filesystem_service.FileSystemService.get_data_root",
+           side_effect=FileSystemService.get_temp_data_root)
+    def test_create_many_signs_every_transfer(self, mock_get_data_root):
+        sender = User.create("payer", "password")
+        receivers = [User.create(f"payee{i}", "password") for i in range(3)]
+
+        transactions = Transaction.create_many(
+            sender,
+            [(receiver.address, Decimal(i + 1), Decimal('0.1')) for i, receiver in enumerate(receivers)]
+        )
+
+        assert [tx.receiver_address for tx in transactions] == [receiver.address for receiver in receivers]
+        assert [tx.amount for tx in transactions] == [Decimal(1), Decimal(2), Decimal(3)]
+        assert all(tx.sender_address == sender.address and tx.has_valid_signature() for tx in transactions)
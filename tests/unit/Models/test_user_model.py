@@ -1,9 +1,12 @@
+import dataclasses
 import os
 import re
 import logging
 import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
+
+from cryptography.hazmat.primitives import serialization
 
 from models import User
 from models.constants import FilesAndDirectories
@@ -17,6 +20,10 @@ class TestUserModel(unittest.TestCase):
            side_effect=FileSystemService.get_temp_data_root)
     def setUp(self, mock_get_data_root):
         FileSystemService.clear_temp_data_root()
+        # Every test initializes the application again, which must not reconfigure the real networking
+        ns_patcher = patch("services.networking_service.NetworkingService.get_instance")
+        ns_patcher.start().return_value = MagicMock()
+        self.addCleanup(ns_patcher.stop)
         InitializationService.initialize_application()
         
     @patch("services.filesystem_service.FileSystemService.get_data_root",
@@ -59,6 +66,22 @@ class TestUserModel(unittest.TestCase):
         assert u.verify(msg, sig) is True
         assert u.verify(b"tampered", sig) is False
 
+    @patch("services.filesystem_service.FileSystemService.get_data_root",
+           side_effect=FileSystemService.get_temp_data_root)
+    def test_signing_key_is_parsed_once_until_forgotten(self, mock_get_data_root):
+        u = User.create("frank", "pw")
+        with patch("models.user.serialization.load_pem_private_key", wraps=serialization.load_pem_private_key) as load:
+            signatures = [u.sign(b"one"), *u.sign_many([b"two", b"three"])]
+            assert load.call_count == 1
+            # The cached key does not take part in comparison or repr
+            assert u == dataclasses.replace(u)
+            assert "_signing_key" not in repr(u)
+            u.forget_signing_key()
+            u.sign(b"four")
+            assert load.call_count == 2
+        assert [u.verify(m, sig) for m, sig in zip([b"one", b"two", b"three"], signatures)] == [True, True, True]
+        assert "_signing_key" not in u.to_dict()
+
     @patch("services.filesystem_service.FileSystemService.get_data_root",
            side_effect=FileSystemService.get_temp_data_root)
     def test_to_from_dict_roundtrip(self, mock_get_data_root):
@@ -1,8 +1,12 @@
+import base64
 import hashlib
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 from services import CryptographyService
 
@@ -30,6 +34,48 @@ class TestCryptographyService(unittest.TestCase):
 
         assert merkle_root == '9093ce34957e2125a1156dca393ab6ed07ed7f4522c8fc2f35c4ccb1378dc3ba'
 
+    @pytest.mark.unit
+    def test_signature_verification_is_cached(self):
+        service = CryptographyService()
+        service.clear_caches()
+        public_key_pem, sign = self._key_pair()
+        signature = sign("message")
+
+        self.assertTrue(service.validate_signature("message", signature, public_key_pem))
+        self.assertTrue(service.validate_signature("message", signature, public_key_pem))
+        # Another message under the same key reuses the parsed key, but is verified on its own
+        self.assertFalse(service.validate_signature("other message", signature, public_key_pem))
+        self.assertFalse(service.validate_signature("other message", signature, public_key_pem))
+
+        stats = service.get_cache_stats()
+        self.assertEqual((2, 2), (stats["signatures"]["hits"], stats["signatures"]["misses"]))
+        self.assertEqual((1, 1), (stats["public_keys"]["hits"], stats["public_keys"]["misses"]))
+
+        service.clear_caches()
+        self.assertEqual(0, service.get_cache_stats()["signatures"]["currsize"])
+
+    @pytest.mark.unit
+    def test_signature_cache_is_safe_across_threads(self):
+        service = CryptographyService()
+        service.clear_caches()
+        public_key_pem, sign = self._key_pair()
+        messages = [f"message {i}" for i in range(50)]
+        signatures = [sign(message) for message in messages]
+
+        def verify_all(_):
+            return all(service.validate_signature(m, s, public_key_pem) for m, s in zip(messages, signatures))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertTrue(all(executor.map(verify_all, range(16))))
+        self.assertEqual(len(messages), service.get_cache_stats()["signatures"]["currsize"])
+
+    def _key_pair(self):
+        private_key = Ed25519PrivateKey.generate()
+        public_key_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode("ascii")
+        return public_key_pem, lambda message: base64.b64encode(private_key.sign(message.encode("ascii"))).decode("ascii")
+
 
     def _hash_string(self, data: str) -> str:
         return hashlib.sha256(data.encode('ascii')).hexdigest()
@@ -0,0 +1,65 @@
+import statistics
+import time
+import unittest
+
+import pytest
+
+from services.difficulty_service import DifficultyService, DifficultyConfig
+from services.difficulty_simulator import DifficultySimulator, HashrateShock
+
+
+class TestDifficultySimulator(unittest.TestCase):
+
+    def tearDown(self):
+        DifficultyService.reset()
+
+    @pytest.mark.unit
+    def test_simulation_is_fast_and_reproducible(self):
+        cfg = DifficultyConfig(target_time=15, window_size=10)
+
+        started = time.perf_counter()
+        first = DifficultySimulator(hashrate=450_000, seed=7).run(cfg, blocks=3000)
+        elapsed = time.perf_counter() - started
+        second = DifficultySimulator(hashrate=450_000, seed=7).run(cfg, blocks=3000)
+
+        self.assertLess(elapsed, 5)
+        self.assertEqual(3000, len(first.block_times))
+        self.assertEqual(first.block_times, second.block_times)
+        self.assertEqual(first.difficulties, second.difficulties)
+
+    @pytest.mark.unit
+    def test_block_times_converge_to_target(self):
+        cfg = DifficultyConfig(target_time=15, window_size=10)
+        result = DifficultySimulator(hashrate=450_000, seed=3).run(cfg, blocks=4000)
+
+        self.assertIsNotNone(result.convergence_block)
+        steady_state = result.block_times[result.convergence_block:]
+        self.assertLess(abs(statistics.fmean(steady_state) - 15), 1.5)
+
+    @pytest.mark.unit
+    def test_hashrate_shock_is_recovered_from(self):
+        cfg = DifficultyConfig(target_time=15, window_size=10)
+        shock = HashrateShock(at_block=2000, factor=4.0)
+        result = DifficultySimulator(hashrate=450_000, seed=5).run(cfg, blocks=4000, shocks=[shock])
+
+        [recovery] = result.shock_recovery_blocks
+        self.assertIsNotNone(recovery)
+        self.assertLess(recovery, 500)
+        # More hashrate means the target has to shrink (harder)
+        self.assertLess(statistics.fmean(result.difficulties[-500:]), statistics.fmean(result.difficulties[1500:2000]))
+
+    @pytest.mark.unit
+    def test_live_difficulty_state_is_restored(self):
+        DifficultyService.reset()
+        DifficultyService.current_difficulty = 12345
+        cfg_before, state_before = DifficultyService.cfg, DifficultyService.state
+
+        DifficultySimulator(hashrate=450_000, seed=1).run(DifficultyConfig(window_size=3), blocks=100)
+
+        self.assertEqual(12345, DifficultyService.current_difficulty)
+        self.assertIs(cfg_before, DifficultyService.cfg)
+        self.assertIs(state_before, DifficultyService.state)
+
+    @pytest.mark.unit
+    def test_direction_changes_are_counted(self):
+        self.assertEqual(2, DifficultySimulator._count_direction_changes([5, 4, 3, 3, 4, 5, 2]))
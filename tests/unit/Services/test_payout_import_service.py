@@ -0,0 +1,83 @@
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from exceptions.transaction import InvalidTransactionException
+from services.payout_import_service import PayoutImportService
+
+ALICE = "a" * 64
+BOB = "b" * 64
+
+
+def _find_by_username(username):
+    return SimpleNamespace(address=BOB) if username == "bob" else None
+
+
+@pytest.fixture
+def mock_repository():
+    with patch("services.payout_import_service.UserRepository") as mock_repository:
+        mock_repository.return_value.find_by_username.side_effect = _find_by_username
+        yield mock_repository
+
+
+def test_reads_csv_and_json_payouts(mock_repository, tmp_path):
+    csv_path = tmp_path / "payouts.csv"
+    csv_path.write_text(f"receiver_address,receiver_username,amount,fee\n{ALICE},,10,0.5\n,bob,2.25,\n,bob,1,0\n")
+    json_path = tmp_path / "payouts.json"
+    json_path.write_text(json.dumps([{"receiver_address": ALICE, "amount": "10", "fee": "0.5"}, {"receiver_username": "bob", "amount": 2.25}]))
+
+    service = PayoutImportService()
+    expected = [(ALICE, Decimal("10"), Decimal("0.5")), (BOB, Decimal("2.25"), Decimal("0"))]
+    assert service.read_payouts(str(csv_path)) == expected + [(BOB, Decimal("1"), Decimal("0"))]
+    assert service.read_payouts(str(json_path)) == expected
+    # Usernames are looked up once per file
+    assert mock_repository.return_value.find_by_username.call_count == 2
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"receiver_username": "nobody", "amount": "1"}, "not found"),
+    ({"amount": "1"}, "required"),
+    ({"receiver_address": ALICE, "amount": "-1"}, "greater than zero"),
+    ({"receiver_address": ALICE, "amount": "ten"}, "must be numbers"),
+    ({"receiver_address": ALICE, "amount": "1", "fee": "-0.1"}, "cannot be negative"),
+])
+def test_rejects_invalid_payouts(row, message, mock_repository, tmp_path):
+    path = tmp_path / "payouts.json"
+    path.write_text(json.dumps([row]))
+
+    with pytest.raises(InvalidTransactionException, match=message):
+        PayoutImportService().read_payouts(str(path))
+
+
+@patch("blockchain.Pool.get_instance")
+def test_identical_payouts_are_separate_transactions(mock_get_pool, mock_repository, tmp_path):
+    path = tmp_path / "payouts.csv"
+    path.write_text(f"receiver_address,receiver_username,amount,fee\n{BOB},,1,0\n{ALICE},,1,0\n,bob,1.0,\n")
+    sender = MagicMock(address="c" * 64, public_key="key")
+    sender.sign_many.side_effect = lambda messages: [f"signature-{i}" for i in range(len(messages))]
+
+    PayoutImportService().import_payouts(sender, str(path))
+
+    [transactions] = mock_get_pool.return_value.add_transactions.call_args.args
+    assert [tx.receiver_address for tx in transactions] == [BOB, ALICE, BOB]
+    assert len({tx.hash for tx in transactions}) == 3
+
+
+@patch("blockchain.Pool.get_instance")
+def test_import_submits_one_signed_batch(mock_get_pool, tmp_path):
+    path = tmp_path / "payouts.csv"
+    path.write_text(f"receiver_address,amount,fee\n{ALICE},1,0\n{BOB},2,0.1\n")
+    sender = MagicMock(address="c" * 64, public_key="key")
+    sender.sign_many.side_effect = lambda messages: [f"signature-{i}" for i in range(len(messages))]
+
+    PayoutImportService().import_payouts(sender, str(path))
+
+    sender.sign_many.assert_called_once()
+    [transactions] = mock_get_pool.return_value.add_transactions.call_args.args
+    assert [(tx.receiver_address, tx.amount, tx.sender_signature) for tx in transactions] == [
+        (ALICE, Decimal("1"), "signature-0"),
+        (BOB, Decimal("2"), "signature-1"),
+    ]